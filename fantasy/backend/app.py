@@ -7,7 +7,9 @@ from flask import Flask
 from flask_cors import CORS
 from config import config
 from models import db
+from database import init_engine
 from routes import api
+from cache import expected_points_cache
 
 # Configure logging
 logging.basicConfig(
@@ -44,9 +46,14 @@ def create_app(config_name=None):
     
     # Create database tables
     with app.app_context():
-        db.create_all()
+        init_engine(app)
+        # Replicas get their tables from the primary
+        db.create_all(bind_key=None)
         logger.info("Database tables created successfully")
     
+    # Start from an empty result cache sized for this configuration
+    expected_points_cache.reset(app.config['RESULT_CACHE_SIZE'])
+    
     # Add health check route
     @app.route('/')
     def index():
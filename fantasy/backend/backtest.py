@@ -0,0 +1,317 @@
+"""
+Backtesting harness for the Fantasy Baseball application.
+
+Replays a season day by day from the team_split_stats snapshots. Each day's
+matchup ranking is compared with the actual game lines pitchers allowed.
+Lines are read from a CSV or Parquet file with one row per start:
+
+    date,team,handedness,innings,runs,hits,walks,strikeouts,home_runs
+    2025-06-02,LAD,Righty,6.0,2,5,1,7,1
+
+`team` is the opponent and `handedness` the pitcher's split, as in
+/api/calculate-expected. Each line is scored per batter over nine innings
+with the engine's scoring weights, so it is in the same units as the
+expected points being ranked.
+
+Usage:
+    python backtest.py lines.csv --start 2025-04-01 --end 2025-09-28 --profiles ESPN,CBS,Yahoo
+"""
+import argparse
+import bisect
+import csv
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine import ExpectedPointsEngine
+from models import db, TeamSplitStat
+
+logger = logging.getLogger(__name__)
+
+# Game line counts in ExpectedPointsEngine.STAT_COLUMNS order; whip has no count
+LINE_COLUMNS = ('runs', None, 'strikeouts', 'walks', 'home_runs', 'hits')
+
+
+def load_game_lines(path: str) -> Dict[date, Dict[str, np.ndarray]]:
+    """
+    Read actual game lines and group them by day.
+
+    Args:
+        path: CSV or Parquet file of game lines
+
+    Returns:
+        Dictionary of day to 'team', 'handedness' and 'stats' arrays, where
+        stats has shape (lines, len(STAT_COLUMNS)) and is per nine innings
+    """
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet game lines requires pyarrow (pip install pyarrow)")
+        rows = pq.read_table(path).to_pylist()
+    else:
+        with open(path, newline='') as lines_file:
+            rows = list(csv.DictReader(lines_file))
+
+    days = defaultdict(list)
+    for row in rows:
+        day = row['date'] if isinstance(row['date'], date) else date.fromisoformat(str(row['date'])[:10])
+        days[day].append(row)
+
+    grouped = {}
+    for day, day_rows in sorted(days.items()):
+        innings = np.array([float(row['innings']) for row in day_rows])
+        counts = np.array([
+            [float(row[column]) if column else 0.0 for column in LINE_COLUMNS]
+            for row in day_rows
+        ])
+        grouped[day] = {
+            'team': np.array([row['team'] for row in day_rows]),
+            'handedness': np.array([str(row['handedness']).capitalize() for row in day_rows]),
+            # Starts without an out recorded carry no rate information
+            'stats': counts * 9.0 / np.maximum(innings, 1.0 / 3.0)[:, None],
+        }
+    return grouped
+
+
+def rankdata(values: np.ndarray) -> np.ndarray:
+    """Ranks starting at 1, with ties given their average rank."""
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    ranks = np.empty(len(values))
+    start = 0
+    for end in range(1, len(values) + 1):
+        if end == len(values) or sorted_values[end] != sorted_values[start]:
+            ranks[order[start:end]] = (start + end + 1) / 2.0
+            start = end
+    return ranks
+
+
+def spearman(predicted: np.ndarray, actual: np.ndarray) -> Optional[float]:
+    """Spearman rank correlation, or None when either side is constant."""
+    if len(predicted) < 3:
+        return None
+    x, y = rankdata(predicted), rankdata(actual)
+    x, y = x - x.mean(), y - y.mean()
+    denominator = np.sqrt((x * x).sum() * (y * y).sum())
+    return float((x * y).sum() / denominator) if denominator else None
+
+
+def score_day(
+    abbreviations: Sequence[str],
+    rates: np.ndarray,
+    lines: Dict[str, np.ndarray],
+    weights: np.ndarray,
+    top_k: int
+) -> Dict:
+    """
+    Compare one day's rankings with that day's game lines.
+
+    Args:
+        abbreviations: Teams in rates row order
+        rates: Snapshot rates, shape (teams, len(STAT_COLUMNS), len(HANDEDNESS))
+        lines: One day of load_game_lines output
+        weights: Scoring weights, shape (len(STAT_COLUMNS), profiles)
+        top_k: Number of top ranked matchups that count as picked
+
+    Returns:
+        Per handedness lists of each profile's rank correlation, captured
+        points and best possible points
+    """
+    row = {abbr: i for i, abbr in enumerate(abbreviations)}
+    # Per batter over nine innings, like expected_stats(handedness, 9)
+    predicted_points = np.einsum('tsh,sp->thp', rates, weights) / 9.0
+    actual_points = lines['stats'] @ weights / 9.0
+
+    day = {}
+    for h, handedness in enumerate(ExpectedPointsEngine.HANDEDNESS):
+        mask = np.array([
+            hand.lower() == handedness and team in row
+            for hand, team in zip(lines['handedness'], lines['team'])
+        ], dtype=bool)
+        if not mask.any():
+            continue
+        teams, inverse = np.unique(lines['team'][mask], return_inverse=True)
+        # Average when a team faced several starters of the same hand
+        actual = np.zeros((len(teams), weights.shape[1]))
+        np.add.at(actual, inverse, actual_points[mask])
+        actual /= np.bincount(inverse)[:, None]
+        predicted = predicted_points[[row[team] for team in teams], h, :]
+
+        k = min(top_k, len(teams))
+        results = {'correlation': [], 'captured': [], 'possible': []}
+        for p in range(weights.shape[1]):
+            picked = np.argsort(-predicted[:, p], kind='mergesort')[:k]
+            results['correlation'].append(spearman(predicted[:, p], actual[:, p]))
+            results['captured'].append(float(actual[picked, p].sum()))
+            results['possible'].append(float(np.sort(actual[:, p])[::-1][:k].sum()))
+        day[handedness] = results
+    return day
+
+
+_worker_state = {}
+
+
+def _init_worker(weights: np.ndarray, top_k: int) -> None:
+    _worker_state.update(weights=weights, top_k=top_k)
+
+
+def _score_task(task: Tuple) -> Tuple:
+    day, abbreviations, rates, lines = task
+    return day, score_day(abbreviations, rates, lines, _worker_state['weights'], _worker_state['top_k'])
+
+
+class Backtester:
+    """Replays stored split snapshots against actual game lines."""
+
+    # Days queued per worker process, enough to keep every worker busy
+    IN_FLIGHT_PER_WORKER = 2
+
+    def __init__(self, scoring_profiles: Dict[str, Dict], top_k: int = 5, lag_days: int = 1):
+        """
+        Create a backtester.
+
+        Args:
+            scoring_profiles: Profile name to scoring settings
+            top_k: Number of top ranked matchups that count as picked each day
+            lag_days: Rank each day from the snapshot this many days earlier,
+                so a day's own games never leak into its ranking
+        """
+        self.profile_names = list(scoring_profiles)
+        self.weights = np.stack([
+            ExpectedPointsEngine.scoring_weights(profile) for profile in scoring_profiles.values()
+        ], axis=1)
+        self.top_k = top_k
+        self.lag_days = lag_days
+
+    @staticmethod
+    def snapshot_dates() -> List[date]:
+        """Every date with both handedness splits, oldest first."""
+        dates = None
+        for side in ExpectedPointsEngine.HANDEDNESS:
+            rows = db.session.query(TeamSplitStat.as_of_date).filter(
+                TeamSplitStat.split_type == f'vs_{side}'
+            ).distinct().all()
+            side_dates = {row[0] for row in rows}
+            dates = side_dates if dates is None else dates & side_dates
+        return sorted(dates or [])
+
+    def day_tasks(self, lines: Dict[date, Dict[str, np.ndarray]]) -> Iterator[Tuple]:
+        """
+        Yield (day, abbreviations, rates, lines) for each day with a snapshot.
+
+        Snapshots are read one at a time, and only when the day's snapshot
+        differs from the previous day's.
+        """
+        dates = self.snapshot_dates()
+        loaded_date, loaded = None, None
+        for day in sorted(lines):
+            i = bisect.bisect_right(dates, day - timedelta(days=self.lag_days))
+            if not i:
+                logger.debug(f"No snapshot before {day}, skipping")
+                continue
+            if dates[i - 1] != loaded_date:
+                loaded_date = dates[i - 1]
+                engine = ExpectedPointsEngine.from_database(loaded_date)
+                loaded = (engine.abbreviations, engine.rates)
+            yield (day,) + loaded + (lines[day],)
+
+    def run(self, lines: Dict[date, Dict[str, np.ndarray]], processes: Optional[int] = 1) -> Dict:
+        """
+        Replay every day with game lines.
+
+        Only IN_FLIGHT_PER_WORKER days per worker are submitted at a time,
+        so day_tasks keeps streaming snapshots instead of the whole season's
+        matrices sitting in the pool's queue.
+
+        Args:
+            lines: load_game_lines output
+            processes: Worker processes, None for the CPU count. 1 runs in process.
+
+        Returns:
+            Summary per profile and handedness
+        """
+        tasks = self.day_tasks(lines)
+        if processes == 1:
+            _init_worker(self.weights, self.top_k)
+            days = [_score_task(task) for task in tasks]
+        else:
+            days = []
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(self.weights, self.top_k)
+            ) as pool:
+                window = (processes or os.cpu_count() or 1) * self.IN_FLIGHT_PER_WORKER
+                pending = {pool.submit(_score_task, task) for task in islice(tasks, window)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    days.extend(future.result() for future in done)
+                    pending |= {pool.submit(_score_task, task) for task in islice(tasks, len(done))}
+            days.sort(key=lambda day: day[0])
+        return self.summarize(days)
+
+    def summarize(self, days: List[Tuple]) -> Dict:
+        """Average correlations and total captured points over the season."""
+        summary = {}
+        for p, name in enumerate(self.profile_names):
+            summary[name] = {}
+            for handedness in ExpectedPointsEngine.HANDEDNESS:
+                results = [day_results[handedness] for _, day_results in days if handedness in day_results]
+                correlations = [r['correlation'][p] for r in results if r['correlation'][p] is not None]
+                captured = sum(r['captured'][p] for r in results)
+                possible = sum(r['possible'][p] for r in results)
+                summary[name][handedness.capitalize()] = {
+                    'days': len(results),
+                    'mean_rank_correlation': round(float(np.mean(correlations)), 4) if correlations else None,
+                    'points_captured': round(captured, 3),
+                    'points_possible': round(possible, 3),
+                    'capture_rate': round(captured / possible, 4) if possible else None,
+                }
+        return {
+            'profiles': summary,
+            'days': len(days),
+            'first_day': days[0][0].isoformat() if days else None,
+            'last_day': days[-1][0].isoformat() if days else None,
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict:
+    """Run a backtest from the command line and print the summary as JSON."""
+    from app import create_app
+    from services import FantasyCalculatorService
+
+    parser = argparse.ArgumentParser(description='Backtest matchup rankings against game lines.')
+    parser.add_argument('lines', help='CSV or Parquet file of game lines')
+    parser.add_argument('--start', type=date.fromisoformat)
+    parser.add_argument('--end', type=date.fromisoformat)
+    parser.add_argument('--profiles', default='ESPN,CBS,Yahoo')
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--lag-days', type=int, default=1)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    lines = {
+        day: day_lines for day, day_lines in load_game_lines(args.lines).items()
+        if (args.start is None or day >= args.start) and (args.end is None or day <= args.end)
+    }
+    profiles = {
+        name: FantasyCalculatorService.get_scoring_settings(name)
+        for name in args.profiles.split(',')
+    }
+    app = create_app()
+    with app.app_context():
+        summary = Backtester(profiles, args.top_k, args.lag_days).run(lines, args.processes)
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Requests per second benchmark for the Fantasy Baseball API.
+
+Sends keep-alive requests from several client threads against a running
+server for a fixed duration, then reports throughput, latency percentiles
+and requests per second per server core.
+
+Usage:
+    python bench.py --url http://127.0.0.1:8000 --duration 10 --concurrency 16 --cores 4
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Request mix, weighted toward the calculator the frontend calls most
+REQUESTS = [
+    ('POST', '/api/calculate-expected', {'handedness': 'Righty', 'inning': 6, 'league_type': 'ESPN'}),
+    ('POST', '/api/calculate-expected', {'handedness': 'Lefty', 'inning': 5, 'league_type': 'Yahoo'}),
+    ('POST', '/api/calculate-expected', {'handedness': 'Righty', 'inning': 7, 'league_type': 'CBS'}),
+    ('GET', '/api/teams', None),
+    ('GET', '/api/health', None),
+]
+
+
+def run_client(url: str, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    """Send requests over one keep-alive connection until the deadline."""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    headers = {'Content-Type': 'application/json'}
+    i = 0
+    while time.perf_counter() < deadline:
+        method, path, body = REQUESTS[i % len(REQUESTS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, json.dumps(body) if body else None, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def benchmark(url: str, duration: float, concurrency: int, cores: int) -> Dict:
+    """
+    Run the benchmark.
+
+    Args:
+        url: Base URL of a running server
+        duration: Seconds to send requests for
+        concurrency: Number of client threads
+        cores: Server cores to divide throughput by
+
+    Returns:
+        Dictionary of throughput and latency figures
+    """
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(url, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    milliseconds = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    requests_per_second = len(latencies) / elapsed
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 2),
+        'requests_per_second': round(requests_per_second, 1),
+        'requests_per_second_per_core': round(requests_per_second / cores, 1),
+        'latency_ms': {
+            'p50': round(float(np.percentile(milliseconds, 50)), 2),
+            'p90': round(float(np.percentile(milliseconds, 90)), 2),
+            'p99': round(float(np.percentile(milliseconds, 99)), 2),
+        },
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cores', type=int, default=1, help='Cores the server is using')
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.url, args.duration, args.concurrency, args.cores), indent=2))
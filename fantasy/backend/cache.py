@@ -0,0 +1,127 @@
+"""
+In-process result cache for the Fantasy Baseball application.
+
+Every server worker has its own cache, and the scraper writes from another
+process, so invalidate() alone cannot reach them. Callers put the data
+version they read from the database in the key instead: a write anywhere
+changes the version, and stale entries are never looked up again and age
+out of the LRU.
+"""
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def scoring_settings_key(scoring_settings: Optional[Dict]) -> str:
+    """
+    Canonical hash of a scoring settings dictionary.
+
+    Key order and int/float spelling (3 vs 3.0) do not change the hash, so
+    equivalent custom scoring dicts share a cache entry.
+
+    Args:
+        scoring_settings: Dictionary of scoring settings
+
+    Returns:
+        Hex digest identifying the scoring settings
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return float(value)
+        return value
+
+    canonical = json.dumps(normalize(scoring_settings or {}), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A deep copy of the cached value, or None on a miss
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+        # Callers decorate results in place, so never hand out the stored object
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached entry, e.g. after the teams table changes."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+        logger.info("Result cache invalidated")
+
+    def reset(self, maxsize: Optional[int] = None) -> None:
+        """Clear entries and counters, optionally resizing the cache."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def stats(self) -> Dict:
+        """Cache counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'invalidations': self.invalidations,
+            }
+
+
+# Shared cache for all-teams expected points results
+expected_points_cache = ResultCache()
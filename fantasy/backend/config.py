@@ -3,6 +3,7 @@ Configuration settings for the Fantasy Baseball application.
 """
 import os
 from pathlib import Path
+from database import bind_engine_options, engine_options, replica_binds
 
 class Config:
     """Base configuration class."""
@@ -10,9 +11,38 @@ class Config:
     # Database configuration
     BASE_DIR = Path(__file__).parent
     DATABASE_PATH = BASE_DIR / 'fantasy_baseball.db'
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{DATABASE_PATH}'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or f'sqlite:///{DATABASE_PATH}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Read replicas for read only routes, as comma separated URLs
+    SQLALCHEMY_BINDS = replica_binds(os.environ.get('DATABASE_REPLICA_URLS', ''))
+    
+    # Wait for a locked database instead of failing with "database is locked"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_PRAGMAS = {'busy_timeout': SQLITE_BUSY_TIMEOUT_MS}
+    
+    # Result cache configuration
+    RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 256))
+    
+    # FanGraphs contact exports for the contact screens, cached as typed columns
+    CONTACT_DATASETS = {
+        'batter': os.environ.get('CONTACT_BATTER_CSV') or str(BASE_DIR.parent.parent / 'batter_contact' / 'batter_contact.csv'),
+        'pitcher': os.environ.get('CONTACT_PITCHER_CSV') or str(BASE_DIR.parent.parent / 'pitcher_contact' / 'Pitcher_Contact_Example.csv'),
+    }
+    CONTACT_CACHE_DIR = os.environ.get('CONTACT_CACHE_DIR')
+    
+    # Lahman database CSVs for the historical pitching screens and Marcel projections
+    LAHMAN_PITCHING_CSV = os.environ.get('LAHMAN_PITCHING_CSV')
+    LAHMAN_BATTING_CSV = os.environ.get('LAHMAN_BATTING_CSV')
+    LAHMAN_PEOPLE_CSV = os.environ.get('LAHMAN_PEOPLE_CSV')
+    
+    # Production server configuration (serve.py)
+    SERVER_BIND = os.environ.get('SERVER_BIND', f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 2 * (os.cpu_count() or 1) + 1))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 1))
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 30))
+    SERVER_PRELOAD = os.environ.get('SERVER_PRELOAD', 'true').lower() == 'true'
+    
     # API configuration
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
@@ -50,6 +80,31 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     
+    # SQLite tuning. WAL lets reads run while the scraper holds a write
+    # transaction, and synchronous=NORMAL is durable in WAL mode.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024)),  # Negative is KiB
+        'temp_store': 'MEMORY',
+        'busy_timeout': Config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    
+    # Pool connections for concurrent readers, sized for one worker's threads
+    DB_POOL_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', max(5, Config.SERVER_THREADS))),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        Config.SQLALCHEMY_DATABASE_URI, DB_POOL_OPTIONS, Config.SQLITE_BUSY_TIMEOUT_MS
+    )
+    # Each replica gets options for its own URL, which may differ from the primary's
+    SQLALCHEMY_BINDS = bind_engine_options(
+        Config.SQLALCHEMY_BINDS, DB_POOL_OPTIONS, Config.SQLITE_BUSY_TIMEOUT_MS
+    )
+    
     # CSRF Protection - ENABLED for production
     WTF_CSRF_ENABLED = True
     WTF_CSRF_CHECK_DEFAULT = True
@@ -59,6 +114,7 @@ class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_BINDS = {}
 
 # Configuration mapping
 config = {
@@ -0,0 +1,204 @@
+"""
+Typed, cached loader for the FanGraphs contact exports.
+
+batter_contact/batter_contact.csv and pitcher_contact/Pitcher_Contact_Example.csv
+quote every value and write percentages as "23.1 %". The first load of a
+file streams it once, parses the numbers into float32 columns and writes one
+.npy file per column under a directory named for the file's hash. Later loads
+memory-map those columns, so there is no CSV parsing and no string to number
+conversion. The hash is kept per path and only recomputed when the file's
+mtime or size changes.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get(
+    'CONTACT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.contact_cache')
+)
+# Bump when the parsing or cache layout changes, so old caches are not read
+CACHE_VERSION = 1
+TEXT_COLUMNS = ('Name', 'Team')
+ID_COLUMNS = ('playerid',)
+# Rows parsed before they are packed into a float block
+CHUNK_ROWS = 65536
+MISSING = ('', '- - -', '-', 'NA')
+# A file modified this recently could change again within the same mtime
+# tick without changing size, so its hash is not reused yet
+RACY_SECONDS = 2.0
+
+# Path -> ((mtime_ns, size), sha256) for files already hashed
+_hashes = {}
+
+
+def parse_number(value: str) -> float:
+    """Float for a FanGraphs number or "23.1 %" percent, NaN when missing."""
+    value = value.strip().rstrip('%').strip()
+    if value in MISSING:
+        return float('nan')
+    return float(value)
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_hash(path: str) -> str:
+    """file_hash, recomputed only when the file's mtime or size changes."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _hashes.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    digest = file_hash(path)
+    if time.time() - stat.st_mtime > RACY_SECONDS:
+        _hashes[path] = (key, digest)
+    return digest
+
+
+def read_csv_columns(
+    path: str,
+    text_columns: Sequence[str] = TEXT_COLUMNS,
+    int_columns: Sequence[str] = ID_COLUMNS
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Stream a CSV export into typed columns.
+
+    Args:
+        path: CSV file with a header row
+        text_columns: Columns kept as text
+        int_columns: Numeric columns stored as int64
+
+    Returns:
+        Column names and a dictionary of column name to array. Text columns
+        are fixed width unicode, int_columns int64 and the rest float32.
+    """
+    # utf-8-sig drops the byte order mark FanGraphs puts before the header
+    with open(path, newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.reader(csv_file)
+        names = next(reader)
+        text_index = [i for i, name in enumerate(names) if name in text_columns]
+        number_index = [i for i, name in enumerate(names) if name not in text_columns]
+
+        text = [[] for _ in text_index]
+        blocks, chunk = [], []
+        for row in reader:
+            if not row:
+                continue
+            for values, i in zip(text, text_index):
+                values.append(row[i])
+            chunk.append([parse_number(row[i]) for i in number_index])
+            if len(chunk) == CHUNK_ROWS:
+                blocks.append(np.array(chunk, dtype=np.float64))
+                chunk = []
+        if chunk or not blocks:
+            blocks.append(np.array(chunk, dtype=np.float64).reshape(len(chunk), len(number_index)))
+
+    numbers = np.concatenate(blocks)
+    columns = {names[i]: np.array(values, dtype=str) for values, i in zip(text, text_index)}
+    for j, i in enumerate(number_index):
+        dtype = np.int64 if names[i] in int_columns else np.float32
+        columns[names[i]] = numbers[:, j].astype(dtype)
+    return names, columns
+
+
+class ContactTable:
+    """Columns of one contact export, memory-mapped from the cache."""
+
+    def __init__(self, names: List[str], columns: Dict[str, np.ndarray]):
+        self.names = list(names)
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def rows(self, indices: Optional[Iterable[int]] = None, names: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Yield rows as dictionaries of column name to value.
+
+        Args:
+            indices: Row indices, defaults to every row
+            names: Columns to include, defaults to every column
+        """
+        names = names or self.names
+        if indices is None:
+            indices = range(len(self))
+        for i in indices:
+            row = {}
+            for name in names:
+                value = self.columns[name][i].item()
+                # float32 values print with float64 noise otherwise
+                row[name] = round(value, 3) if isinstance(value, float) else value
+            yield row
+
+
+def cache_path(path: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, f'v{CACHE_VERSION}-{cached_file_hash(path)}')
+
+
+def write_cache(directory: str, names: List[str], columns: Dict[str, np.ndarray]) -> None:
+    """Write columns as .npy files, renaming the directory into place when complete."""
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    tmp_directory = tempfile.mkdtemp(dir=parent, suffix='.tmp')
+    try:
+        for i, name in enumerate(names):
+            np.save(os.path.join(tmp_directory, f'{i:03d}.npy'), columns[name])
+        with open(os.path.join(tmp_directory, 'columns.json'), 'w') as columns_file:
+            json.dump({'names': names}, columns_file)
+        os.rename(tmp_directory, directory)
+    except OSError:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        # Another process finished the same cache first
+        if not os.path.exists(os.path.join(directory, 'columns.json')):
+            raise
+
+
+def read_cache(directory: str) -> ContactTable:
+    with open(os.path.join(directory, 'columns.json')) as columns_file:
+        names = json.load(columns_file)['names']
+    columns = {
+        name: np.load(os.path.join(directory, f'{i:03d}.npy'), mmap_mode='r')
+        for i, name in enumerate(names)
+    }
+    return ContactTable(names, columns)
+
+
+def load_contact_data(path: str, cache_dir: Optional[str] = None) -> ContactTable:
+    """
+    Load a contact export, parsing it only when its contents are not cached.
+
+    Args:
+        path: FanGraphs contact CSV
+        cache_dir: Cache directory, defaults to CONTACT_CACHE_DIR
+
+    Returns:
+        ContactTable with memory-mapped columns
+    """
+    directory = cache_path(path, cache_dir)
+    if not os.path.exists(os.path.join(directory, 'columns.json')):
+        names, columns = read_csv_columns(path)
+        write_cache(directory, names, columns)
+        logger.info(f"Cached {len(names)} contact columns from {path}")
+    return read_cache(directory)
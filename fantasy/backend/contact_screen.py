@@ -0,0 +1,195 @@
+"""
+Contact profile screens over the typed contact columns.
+
+Replaces the MySQL screens in batter_contact.sql and Contact_Scout.sql.
+A screen is a list of filters and an optional sort:
+
+    {"filters": [{"column": "LD%", "op": ">=", "value": 20}],
+     "sort": {"column": "Hard%", "descending": true}}
+
+Filters are vectorized boolean masks. Every numeric column's sort order is
+computed once when the data is loaded, so a sorted screen only keeps the
+masked rows from that order instead of sorting them.
+
+Usage:
+    python contact_screen.py --screen hard_contact_batters
+    python contact_screen.py ../../batter_contact/batter_contact.csv --where "LD%>=20" --sort "Hard% desc"
+"""
+import argparse
+import json
+import operator
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from contact_data import ContactTable, load_contact_data
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+FILTER_PATTERN = re.compile(r'^\s*(.+?)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$')
+
+# The SQL screens, as declarative specs
+SCREENS = {
+    'hard_contact_batters': {
+        'dataset': 'batter',
+        'filters': [
+            {'column': 'LD%', 'op': '>=', 'value': 20},
+            {'column': 'Med%', 'op': '>=', 'value': 42},
+            {'column': 'Hard%', 'op': '>=', 'value': 40},
+        ],
+        'sort': {'column': 'Hard%', 'descending': True},
+    },
+    'contact_scout': {
+        'dataset': 'pitcher',
+        'filters': [
+            {'column': 'Z-Swing%', 'op': '<=', 'value': 70},
+            {'column': 'SwStr%', 'op': '>=', 'value': 11},
+        ],
+        'sort': {'column': 'Contact%', 'descending': False},
+    },
+}
+
+
+def parse_filter(text: str) -> Dict:
+    """Filter spec for a "column op value" string such as "LD%>=20"."""
+    match = FILTER_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid filter: {text}")
+    column, op, value = match.groups()
+    try:
+        value = float(value)
+    except ValueError:
+        value = value.strip('\'"')
+    return {'column': column, 'op': op, 'value': value}
+
+
+def parse_sort(text: str) -> Dict:
+    """Sort spec for "column", "column desc" or "-column"."""
+    text = text.strip()
+    descending = text.startswith('-') or text.lower().endswith(' desc')
+    column = re.sub(r'\s+(asc|desc)$', '', text.lstrip('-'), flags=re.IGNORECASE)
+    return {'column': column, 'descending': descending}
+
+
+class ContactScreen:
+    """Screens one contact table with precomputed per-column sort orders."""
+
+    def __init__(self, table: ContactTable):
+        """
+        Index a contact table.
+
+        Args:
+            table: Loaded contact columns
+        """
+        self.table = table
+        self.orders = {}
+        for name in table.names:
+            values = np.asarray(table[name])
+            if values.dtype.kind not in 'fi':
+                continue
+            # Stable sorts put NaN last in both directions
+            self.orders[name, False] = np.argsort(values, kind='stable')
+            self.orders[name, True] = np.argsort(-values, kind='stable')
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.table.columns:
+            raise ValueError(f"Unknown column: {name}")
+        return self.table[name]
+
+    def mask(self, filters: List[Dict]) -> np.ndarray:
+        """
+        Rows matching every filter. Comparisons with missing values are false.
+
+        Args:
+            filters: List of {'column', 'op', 'value'} specs
+
+        Returns:
+            Boolean array of shape (rows,)
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        for spec in filters:
+            values = self.column(spec['column'])
+            if spec['op'] not in OPERATORS:
+                raise ValueError(f"Unknown operator: {spec['op']}")
+            value = spec['value']
+            if values.dtype.kind in 'fi':
+                if not isinstance(value, (int, float)):
+                    raise ValueError(f"{spec['column']} needs a numeric value")
+            elif spec['op'] not in ('==', '!='):
+                raise ValueError(f"{spec['column']} only supports == and !=")
+            mask &= OPERATORS[spec['op']](values, value)
+        return mask
+
+    def indices(self, filters: List[Dict], sort: Optional[Dict] = None) -> np.ndarray:
+        """Indices of the matching rows, in sort order when a sort is given."""
+        mask = self.mask(filters)
+        if sort is None:
+            return np.flatnonzero(mask)
+        key = (sort['column'], bool(sort.get('descending', False)))
+        if key not in self.orders:
+            self.column(sort['column'])
+            raise ValueError(f"Cannot sort by text column: {sort['column']}")
+        order = self.orders[key]
+        return order[mask[order]]
+
+    def run(
+        self,
+        filters: List[Dict],
+        sort: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[int, List[Dict]]:
+        """
+        Run a screen.
+
+        Args:
+            filters: List of {'column', 'op', 'value'} specs
+            sort: {'column', 'descending'} spec, or None for file order
+            limit: Maximum rows to return
+            columns: Columns to return, defaults to every column
+
+        Returns:
+            Number of matching rows and the returned rows
+        """
+        for name in columns or []:
+            self.column(name)
+        indices = self.indices(filters, sort)
+        return len(indices), list(self.table.rows(indices[:limit], columns))
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict]:
+    """Run a screen from the command line and print the rows as JSON."""
+    from config import Config
+
+    parser = argparse.ArgumentParser(description='Screen contact data.')
+    parser.add_argument('csv', nargs='?', help='Contact CSV, defaults to the screen\'s dataset')
+    parser.add_argument('--screen', choices=sorted(SCREENS))
+    parser.add_argument('--where', action='append', default=[], help='Filter such as "LD%%>=20"')
+    parser.add_argument('--sort', help='Sort such as "Hard%% desc"')
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--columns', help='Comma separated columns to print')
+    args = parser.parse_args(argv)
+
+    spec = SCREENS.get(args.screen, {})
+    path = args.csv or Config.CONTACT_DATASETS.get(spec.get('dataset'))
+    if not path:
+        parser.error('a CSV path or --screen is required')
+    filters = spec.get('filters', []) + [parse_filter(text) for text in args.where]
+    sort = parse_sort(args.sort) if args.sort else spec.get('sort')
+    columns = args.columns.split(',') if args.columns else None
+
+    screen = ContactScreen(load_contact_data(str(path)))
+    _, rows = screen.run(filters, sort, args.limit, columns)
+    print(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Database engine setup for the Fantasy Baseball application.
+
+Besides the SQLite tuning, this routes reads to read replicas. Replicas
+are the SQLALCHEMY_BINDS whose key starts with 'replica'. Views marked
+with read_replica send their reads to one of them. Flushes, UPDATE/
+INSERT/DELETE statements and every other view use the primary database.
+"""
+import functools
+import logging
+import random
+from typing import Callable, Dict, List
+
+from flask import Flask, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = 'replica'
+
+
+def replica_binds(urls: str) -> Dict[str, str]:
+    """
+    SQLALCHEMY_BINDS entries for a comma separated list of replica URLs.
+
+    Args:
+        urls: Comma separated database URLs, may be empty
+
+    Returns:
+        Dictionary of bind key to URL
+    """
+    urls = [url.strip() for url in urls.split(',') if url.strip()]
+    return {f'{REPLICA_BIND_PREFIX}_{i}': url for i, url in enumerate(urls)}
+
+
+def engine_options(url: str, pool_options: Dict, busy_timeout_ms: int) -> Dict:
+    """
+    Engine options for one database URL.
+
+    Every database gets the pool sizing. SQLite also gets a QueuePool
+    shared across threads and the busy timeout; other databases keep
+    their driver's defaults.
+
+    Args:
+        url: Database URL
+        pool_options: pool_size, max_overflow and pool_timeout
+        busy_timeout_ms: How long SQLite waits on a locked database
+
+    Returns:
+        SQLALCHEMY_ENGINE_OPTIONS style dictionary
+    """
+    options = dict(pool_options)
+    if url.startswith('sqlite'):
+        options['poolclass'] = QueuePool
+        options['connect_args'] = {
+            'check_same_thread': False,
+            'timeout': busy_timeout_ms / 1000.0,
+        }
+    return options
+
+
+def bind_engine_options(binds: Dict[str, str], pool_options: Dict, busy_timeout_ms: int) -> Dict[str, Dict]:
+    """
+    SQLALCHEMY_BINDS entries with engine options for each bind's own URL.
+
+    Args:
+        binds: Dictionary of bind key to URL
+        pool_options: pool_size, max_overflow and pool_timeout
+        busy_timeout_ms: How long SQLite waits on a locked database
+
+    Returns:
+        Dictionary of bind key to engine options, including the url
+    """
+    return {
+        key: dict(engine_options(url, pool_options, busy_timeout_ms), url=url)
+        for key, url in binds.items()
+    }
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica while in read only mode."""
+
+    def replica_engines(self) -> List[Engine]:
+        return [
+            engine for key, engine in self._db.engines.items()
+            if key is not None and key.startswith(REPLICA_BIND_PREFIX)
+        ]
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and self.info.get('read_only')
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            replicas = self.replica_engines()
+            if replicas:
+                # Stay on one replica per session so reads are consistent
+                if self.info.get('replica') not in replicas:
+                    self.info['replica'] = random.choice(replicas)
+                return self.info['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_replica(view: Callable) -> Callable:
+    """
+    Run a view with its database reads going to a read replica.
+
+    Without replicas configured the view reads from the primary as usual.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        session = current_app.extensions['sqlalchemy'].session
+        session.info['read_only'] = True
+        try:
+            return view(*args, **kwargs)
+        finally:
+            session.info.pop('read_only', None)
+            session.info.pop('replica', None)
+    return wrapper
+
+
+def sqlite_pragma_statements(pragmas: Dict) -> List[str]:
+    """
+    PRAGMA statements for a dictionary of SQLite settings.
+
+    journal_mode is set first, since it decides how the other settings
+    apply to the database file.
+
+    Args:
+        pragmas: Dictionary of pragma name to value
+
+    Returns:
+        List of PRAGMA statements
+    """
+    names = sorted(pragmas, key=lambda name: name != 'journal_mode')
+    return [f"PRAGMA {name}={pragmas[name]}" for name in names]
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict) -> None:
+    """
+    Run the given pragmas on every new connection from an engine.
+
+    Pragmas such as synchronous, cache_size and busy_timeout only last for
+    one connection, so they are set from a connect hook rather than once.
+
+    Args:
+        engine: SQLAlchemy engine for a SQLite database
+        pragmas: Dictionary of pragma name to value
+    """
+    statements = sqlite_pragma_statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite pragmas for {engine.url}: {', '.join(statements)}")
+
+
+def init_engine(app: Flask) -> None:
+    """
+    Apply the configured database tuning to the app's engines.
+
+    Must run inside an app context, before the first connection is made.
+
+    Args:
+        app: Flask application instance
+    """
+    engines = app.extensions['sqlalchemy'].engines
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    for key, engine in engines.items():
+        if pragmas and engine.dialect.name == 'sqlite':
+            apply_sqlite_pragmas(engine, pragmas)
+
+    replicas = [key for key in engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+    if replicas:
+        logger.info(f"Routing read only views to {len(replicas)} replica(s)")
@@ -0,0 +1,310 @@
+"""
+Vectorized expected points engine for the Fantasy Baseball application.
+
+Team split rates are held in a single NumPy matrix so expected stats and
+fantasy points for every team come out of one matrix-vector product.
+"""
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models import db, Team, TeamSplitStat
+
+logger = logging.getLogger(__name__)
+
+
+class ExpectedPointsEngine:
+    """Batched expected points calculator over a teams x stats x handedness matrix."""
+
+    # Per-9 split rates, in matrix column order
+    STAT_COLUMNS = ('era', 'whip', 'k_per_9', 'bb_per_9', 'hr_per_9', 'hits_per_9')
+    HANDEDNESS = ('lefty', 'righty')
+
+    # Typical hit distribution: ~75% singles, ~20% doubles, ~3% triples
+    SINGLES_SHARE = 0.75
+    DOUBLES_SHARE = 0.20
+    TRIPLES_SHARE = 0.03
+
+    def __init__(self, abbreviations: Sequence[str], rates: np.ndarray):
+        """
+        Create an engine from pre-loaded split rates.
+
+        Args:
+            abbreviations: Team abbreviations, one per matrix row
+            rates: Array of shape (teams, len(STAT_COLUMNS), len(HANDEDNESS))
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        expected_shape = (len(abbreviations), len(self.STAT_COLUMNS), len(self.HANDEDNESS))
+        if rates.shape != expected_shape:
+            raise ValueError(f"Rates must have shape {expected_shape}, got {rates.shape}")
+
+        self.abbreviations = list(abbreviations)
+        self.rates = rates
+
+    @classmethod
+    def from_database(
+        cls,
+        as_of_date: Optional[date] = None,
+        team_abbreviations: Optional[Sequence[str]] = None
+    ) -> 'ExpectedPointsEngine':
+        """
+        Load split rates from the latest split snapshot with a single query.
+
+        Databases without snapshots fall back to the wide Team columns.
+
+        Args:
+            as_of_date: Use the latest snapshot on or before this date
+            team_abbreviations: Only load these teams, defaults to every team
+
+        Returns:
+            ExpectedPointsEngine instance
+
+        Raises:
+            ValueError: If as_of_date is before the first snapshot
+        """
+        split_types = [f'vs_{side}' for side in cls.HANDEDNESS]
+        query = TeamSplitStat.latest(split_types, as_of_date=as_of_date)
+        if team_abbreviations is not None:
+            query = query.filter(TeamSplitStat.team_abbreviation.in_(team_abbreviations))
+        rows = query.all()
+
+        if rows:
+            rates = {}
+            for split_type, abbr, *values in rows:
+                rates.setdefault(abbr, {})[split_type] = values
+            # A team needs both sides of the snapshot to be scored
+            abbreviations = sorted(abbr for abbr, splits in rates.items() if len(splits) == len(split_types))
+            values = np.array(
+                [[rates[abbr][split_type] for split_type in split_types] for abbr in abbreviations],
+                dtype=np.float64
+            ).reshape(len(abbreviations), len(cls.HANDEDNESS), len(cls.STAT_COLUMNS))
+            return cls.from_values(abbreviations, values)
+
+        if as_of_date is not None and TeamSplitStat.latest_as_of(split_types[0], as_of_date=as_of_date) is None:
+            raise ValueError(f"No split stats on or before {as_of_date}")
+        if as_of_date is None and TeamSplitStat.query.first() is None:
+            return cls.from_team_columns(team_abbreviations)
+        # None of the requested teams are in the snapshot
+        return cls.from_values([], np.empty((0, len(cls.HANDEDNESS), len(cls.STAT_COLUMNS))))
+
+    @classmethod
+    def from_team_columns(cls, team_abbreviations: Optional[Sequence[str]] = None) -> 'ExpectedPointsEngine':
+        """
+        Load split rates from the wide Team columns with a single query.
+
+        Only used for databases written before split snapshots existed.
+
+        Args:
+            team_abbreviations: Only load these teams, defaults to every team
+
+        Returns:
+            ExpectedPointsEngine instance
+        """
+        columns = [
+            getattr(Team, f'vs_{side}_{stat}')
+            for side in cls.HANDEDNESS
+            for stat in cls.STAT_COLUMNS
+        ]
+        query = db.session.query(Team.abbreviation, *columns)
+        if team_abbreviations is not None:
+            query = query.filter(Team.abbreviation.in_(team_abbreviations))
+        rows = query.all()
+
+        abbreviations = [row[0] for row in rows]
+        values = np.array(
+            [[np.nan if value is None else value for value in row[1:]] for row in rows],
+            dtype=np.float64
+        ).reshape(len(rows), len(cls.HANDEDNESS), len(cls.STAT_COLUMNS))
+        return cls.from_values(abbreviations, values)
+
+    @classmethod
+    def from_values(cls, abbreviations: Sequence[str], values: np.ndarray) -> 'ExpectedPointsEngine':
+        """
+        Create an engine from stored rates, leaving out teams with missing rates.
+
+        A NULL rate would otherwise score as a perfect pitching-against
+        number and put the team at the top of every ranking.
+
+        Args:
+            abbreviations: Team abbreviations, one per row
+            values: Array of shape (teams, len(HANDEDNESS), len(STAT_COLUMNS)), NaN where NULL
+
+        Returns:
+            ExpectedPointsEngine instance
+        """
+        complete = ~np.isnan(values).any(axis=(1, 2))
+        for abbr in np.asarray(abbreviations, dtype=object)[~complete]:
+            logger.warning(f"Skipping {abbr}: missing split stats")
+        abbreviations = [abbr for abbr, keep in zip(abbreviations, complete) if keep]
+
+        # Stored as (teams, handedness, stats); engine works in (teams, stats, handedness)
+        return cls(abbreviations, values[complete].transpose(0, 2, 1))
+
+    def __len__(self) -> int:
+        return len(self.abbreviations)
+
+    @classmethod
+    def handedness_index(cls, handedness: str) -> int:
+        """Matrix index for a handedness, matching the service's lefty/righty fallback."""
+        return 0 if handedness.lower() == 'lefty' else 1
+
+    @classmethod
+    def scoring_weights(cls, scoring_settings: Dict) -> np.ndarray:
+        """
+        Collapse batting scoring settings into per-stat-column weights.
+
+        Expected stats are linear in the split rates, so a whole scoring dict
+        reduces to one weight per column of the rate matrix.
+
+        Args:
+            scoring_settings: Dictionary of scoring settings
+
+        Returns:
+            Array of shape (len(STAT_COLUMNS),)
+        """
+        batting = scoring_settings['batting']
+        hit_weight = (
+            cls.SINGLES_SHARE * batting.get('S', 0) +
+            cls.DOUBLES_SHARE * batting.get('D', 0) +
+            cls.TRIPLES_SHARE * batting.get('T', 0)
+        )
+        weights = {
+            'era': batting.get('R', 0) + batting.get('RBI', 0),  # RBI roughly equals runs
+            'whip': 0.0,
+            'k_per_9': batting.get('SO', 0),
+            'bb_per_9': batting.get('BB', 0),
+            'hr_per_9': batting.get('HR', 0),
+            'hits_per_9': hit_weight,
+        }
+        return np.array([weights[stat] for stat in cls.STAT_COLUMNS], dtype=np.float64)
+
+    def split_rates(self, handedness: str) -> np.ndarray:
+        """Rates for one handedness, shape (teams, len(STAT_COLUMNS))."""
+        return self.rates[:, :, self.handedness_index(handedness)]
+
+    def expected_stats(self, handedness: str, inning: int) -> np.ndarray:
+        """
+        Expected per-batter stats for every team.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to calculate for (1-9)
+
+        Returns:
+            Array of shape (teams, len(STAT_COLUMNS))
+        """
+        innings_factor = inning / 9.0
+        return self.split_rates(handedness) * innings_factor / 9
+
+    def expected_points(self, handedness: str, inning: int, scoring_settings: Dict) -> np.ndarray:
+        """
+        Expected fantasy points for every team in one matrix-vector product.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to calculate for (1-9)
+            scoring_settings: Dictionary of scoring settings
+
+        Returns:
+            Array of shape (teams,)
+        """
+        return self.expected_stats(handedness, inning) @ self.scoring_weights(scoring_settings)
+
+    def expected_points_matrix(
+        self,
+        handedness: str,
+        inning: int,
+        scoring_profiles: Sequence[Dict]
+    ) -> np.ndarray:
+        """
+        Expected fantasy points for every team under several scoring profiles.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to calculate for (1-9)
+            scoring_profiles: Sequence of scoring settings dictionaries
+
+        Returns:
+            Array of shape (teams, len(scoring_profiles))
+        """
+        weights = np.stack([self.scoring_weights(profile) for profile in scoring_profiles], axis=1)
+        return self.expected_stats(handedness, inning) @ weights
+
+    @classmethod
+    def build_result(
+        cls,
+        team_abbreviation: str,
+        handedness: str,
+        inning: int,
+        expected_fantasy_points: float,
+        expected_runs: float,
+        expected_hits: float,
+        expected_home_runs: float,
+        expected_walks: float,
+        expected_strikeouts: float,
+        team_stats: Dict
+    ) -> Dict:
+        """
+        Build a rounded expected points result from unrounded expected stats.
+
+        Returns:
+            Dictionary shaped like FantasyCalculatorService.calculate_expected_points
+        """
+        return {
+            'team_abbreviation': team_abbreviation,
+            'handedness': handedness,
+            'inning': inning,
+            'expected_fantasy_points': round(expected_fantasy_points, 2),
+            'expected_runs': round(expected_runs, 3),
+            'expected_hits': round(expected_hits, 3),
+            'expected_singles': round(expected_hits * cls.SINGLES_SHARE, 3),
+            'expected_doubles': round(expected_hits * cls.DOUBLES_SHARE, 3),
+            'expected_triples': round(expected_hits * cls.TRIPLES_SHARE, 3),
+            'expected_home_runs': round(expected_home_runs, 3),
+            'expected_walks': round(expected_walks, 3),
+            'expected_strikeouts': round(expected_strikeouts, 3),
+            'expected_rbi': round(expected_runs, 3),  # RBI roughly equals runs
+            'team_stats': team_stats
+        }
+
+    def calculate(self, handedness: str, inning: int, scoring_settings: Dict) -> List[Dict]:
+        """
+        Expected points results for all teams, sorted best matchup first.
+
+        Result dictionaries have the same shape as
+        FantasyCalculatorService.calculate_expected_points.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to calculate for (1-9)
+            scoring_settings: Dictionary of scoring settings
+
+        Returns:
+            List of dictionaries containing expected points for all teams
+        """
+        rates = self.split_rates(handedness)
+        stats = self.expected_stats(handedness, inning)
+        points = stats @ self.scoring_weights(scoring_settings)
+
+        column = {stat: i for i, stat in enumerate(self.STAT_COLUMNS)}
+        results = []
+        for i in range(len(self.abbreviations)):
+            results.append(self.build_result(
+                team_abbreviation=self.abbreviations[i],
+                handedness=handedness,
+                inning=inning,
+                expected_fantasy_points=float(points[i]),
+                expected_runs=float(stats[i, column['era']]),
+                expected_hits=float(stats[i, column['hits_per_9']]),
+                expected_home_runs=float(stats[i, column['hr_per_9']]),
+                expected_walks=float(stats[i, column['bb_per_9']]),
+                expected_strikeouts=float(stats[i, column['k_per_9']]),
+                team_stats={stat: float(rates[i, column[stat]]) for stat in self.STAT_COLUMNS}
+            ))
+
+        # Sort by expected fantasy points (descending)
+        results.sort(key=lambda x: x['expected_fantasy_points'], reverse=True)
+
+        return results
@@ -0,0 +1,370 @@
+"""
+Historical stats from the Lahman database's Pitching, Batting and People CSVs.
+
+Replaces the pitcher_upside MySQL query. The CSV is parsed once into typed
+columns, sorted by season and cached like the contact data. Later loads
+memory-map the columns and find each season's rows from its offsets. IP,
+K/BB, FIP and ERA - FIP are computed for every row in one vectorized pass,
+so screening all 150 seasons is a handful of array comparisons.
+
+Each season's league context (FIP constant, league ERA, K% and BB%) is one
+grouped sum over those season offsets. FIP uses its own season's constant.
+
+Usage:
+    python lahman.py Pitching.csv --year 2016
+    python lahman.py Pitching.csv --all-seasons --min-ip 100
+    python lahman.py Pitching.csv --league-context
+"""
+import argparse
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+import contact_data
+from contact_data import ContactTable, cache_path, read_cache, read_csv_columns, write_cache
+
+TEXT_COLUMNS = ('playerID', 'teamID', 'lgID')
+PEOPLE_TEXT_COLUMNS = ('playerID', 'nameFirst', 'nameLast')
+PEOPLE_NUMBER_COLUMNS = ('birthYear', 'birthMonth')
+INT_COLUMNS = ('yearID', 'stint')
+DERIVED_COLUMNS = ('IP', 'K_BB', 'FIP', 'ERA_FIP')
+# The constant pitcher_upside used, right for one season only
+DEFAULT_FIP_CONSTANT = 3.147
+LEAGUE_CONTEXT_COLUMNS = ('FIP_constant', 'lgERA', 'K_pct', 'BB_pct')
+UPSIDE_COLUMNS = ['playerID', 'yearID', 'W', 'L', 'HR', 'IP', 'SO', 'BB', 'K_BB', 'ERA', 'FIP']
+
+
+def truncate(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """MySQL TRUNCATE, ignoring float noise in the last places."""
+    scale = 10.0 ** decimals
+    return np.trunc(np.round(values * scale, 6)) / scale
+
+
+def derive_stats(columns: Dict[str, np.ndarray], fip_constant=DEFAULT_FIP_CONSTANT) -> Dict[str, np.ndarray]:
+    """
+    IP, K_BB, FIP and ERA_FIP for every row.
+
+    K_BB and FIP are truncated to two places, as pitcher_upside does.
+    Rows without innings or walks get NaN, which no screen matches, like
+    MySQL's NULL for a division by zero.
+
+    Args:
+        columns: Pitching columns (IPouts, SO, BB, HBP, HR, ERA)
+        fip_constant: FIP constant, a scalar or one value per row
+
+    Returns:
+        Dictionary of derived column name to float64 array
+    """
+    ip = np.asarray(columns['IPouts'], dtype=np.float64) / 3
+    so = np.asarray(columns['SO'], dtype=np.float64)
+    bb = np.asarray(columns['BB'], dtype=np.float64)
+    hbp = np.asarray(columns['HBP'], dtype=np.float64)
+    hr = np.asarray(columns['HR'], dtype=np.float64)
+    era = np.asarray(columns['ERA'], dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_bb = np.where(bb > 0, so / bb, np.nan)
+        fip = np.where(ip > 0, (13 * hr + 3 * (bb + hbp) - 2 * so) / ip, np.nan) + fip_constant
+    fip = truncate(fip)
+    return {
+        'IP': ip,
+        'K_BB': truncate(k_bb),
+        'FIP': fip,
+        'ERA_FIP': era - fip,
+    }
+
+
+class LeagueContext:
+    """League rates per season, for FIP constants and normalizing pitcher rates."""
+
+    def __init__(self, seasons: np.ndarray, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            seasons: Sorted season years
+            columns: LEAGUE_CONTEXT_COLUMNS arrays, one value per season
+        """
+        self.seasons = np.asarray(seasons)
+        self.columns = columns
+
+    @classmethod
+    def from_totals(cls, seasons: np.ndarray, totals: Dict[str, np.ndarray]) -> 'LeagueContext':
+        """
+        League rates from each season's pitching totals.
+
+        The totals come from SeasonTable.season_totals, one np.add.reduceat
+        over the season offsets for every season at once. Missing counts,
+        such as HBP and BFP in early seasons, count as zero. K% and BB% are
+        NaN for seasons without any BFP.
+
+        Args:
+            seasons: Sorted season years
+            totals: IPouts, ER, HR, BB, HBP, SO and BFP totals per season
+
+        Returns:
+            LeagueContext instance
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ip = totals['IPouts'] / 3
+            league_era = 9 * totals['ER'] / ip
+            fip_core = (13 * totals['HR'] + 3 * (totals['BB'] + totals['HBP']) - 2 * totals['SO']) / ip
+            batters = np.where(totals['BFP'] > 0, totals['BFP'], np.nan)
+            return cls(seasons, {
+                'FIP_constant': league_era - fip_core,
+                'lgERA': league_era,
+                'K_pct': totals['SO'] / batters,
+                'BB_pct': totals['BB'] / batters,
+            })
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def lookup(self, years: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Join league context onto rows by season.
+
+        Args:
+            years: Season of each row
+
+        Returns:
+            Dictionary of context column to one value per row, NaN for
+            seasons without context
+        """
+        years = np.asarray(years)
+        i = np.clip(np.searchsorted(self.seasons, years), 0, max(len(self.seasons) - 1, 0))
+        found = (self.seasons[i] == years) if len(self.seasons) else np.zeros(len(years), dtype=bool)
+        return {
+            name: np.where(found, values[i], np.nan) if len(values) else np.full(len(years), np.nan)
+            for name, values in self.columns.items()
+        }
+
+    def rows(self) -> Iterator[Dict]:
+        """Yield one dictionary per season."""
+        for i, year in enumerate(self.seasons):
+            row = {'yearID': int(year)}
+            row.update({name: round(float(values[i]), 4) for name, values in self.columns.items()})
+            yield row
+
+
+class SeasonTable:
+    """Lahman rows sorted by yearID, so each season is one contiguous slice."""
+
+    def __init__(self, table: ContactTable):
+        """
+        Index a table sorted by yearID.
+
+        Args:
+            table: Lahman columns, sorted by yearID
+        """
+        self.table = table
+        self.derived = {}
+        self.seasons, starts = np.unique(np.asarray(table['yearID']), return_index=True)
+        self.offsets = np.append(starts, len(table))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self.derived:
+            return self.derived[name]
+        return self.table[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.derived or name in self.table.columns
+
+    def season_rows(self, year: int) -> slice:
+        """Rows of one season, empty when the season is not loaded."""
+        i = np.searchsorted(self.seasons, year)
+        if i == len(self.seasons) or self.seasons[i] != year:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def season_totals(self, names) -> Dict[str, np.ndarray]:
+        """
+        League totals of each column for every season, in one grouped sum.
+
+        Missing values count as zero.
+
+        Args:
+            names: Columns to total
+
+        Returns:
+            Dictionary of column to one total per season
+        """
+        if not len(self.seasons):
+            return {name: np.zeros(0) for name in names}
+        return {
+            name: np.add.reduceat(np.nan_to_num(np.asarray(self[name], dtype=np.float64)), self.offsets[:-1])
+            for name in names
+        }
+
+
+class PitchingTable(SeasonTable):
+    """Season partitioned Lahman pitching rows with derived rate columns."""
+
+    def __init__(self, table: ContactTable, fip_constant=None):
+        """
+        Index a pitching table sorted by yearID.
+
+        Args:
+            table: Pitching columns, sorted by yearID
+            fip_constant: FIP constant for every row, defaults to each
+                season's constant from the league context
+        """
+        super().__init__(table)
+        self.league = LeagueContext.from_totals(
+            self.seasons, self.season_totals(('IPouts', 'ER', 'HR', 'BB', 'HBP', 'SO', 'BFP'))
+        )
+        if fip_constant is None:
+            fip_constant = np.repeat(self.league['FIP_constant'], np.diff(self.offsets))
+        self.derived = derive_stats(table.columns, fip_constant)
+
+    def upside(
+        self,
+        year: Optional[int] = 2016,
+        min_era_fip: float = 1.0,
+        min_ip: float = 45.0,
+        min_k_bb: float = 2.0,
+        max_era: float = 5.0
+    ) -> np.ndarray:
+        """
+        Rows of the pitcher_upside screen: pitchers whose ERA trails their
+        FIP, with enough innings and K/BB to trust it.
+
+        Args:
+            year: Season to screen, None for every season
+            min_era_fip: ERA - FIP must be greater than this
+            min_ip: Innings pitched must be greater than this
+            min_k_bb: K/BB must be greater than this
+            max_era: ERA must be less than this
+
+        Returns:
+            Row indices in file order within each season
+        """
+        rows = slice(None) if year is None else self.season_rows(year)
+        mask = (
+            (self['ERA_FIP'][rows] > min_era_fip)
+            & (self['IP'][rows] > min_ip)
+            & (self['K_BB'][rows] > min_k_bb)
+            & (np.asarray(self['ERA'][rows]) < max_era)
+        )
+        return np.flatnonzero(mask) + (rows.start or 0)
+
+    def rows(self, indices, names: List[str] = UPSIDE_COLUMNS) -> Iterator[Dict]:
+        """Yield rows as dictionaries, rounding the derived columns."""
+        for i in indices:
+            row = {}
+            for name in names:
+                value = self[name][i].item()
+                row[name] = round(value, 3) if isinstance(value, float) else value
+            yield row
+
+
+def lahman_cache_path(path: str, cache_dir: Optional[str] = None) -> str:
+    return cache_path(path, cache_dir or os.path.join(contact_data.CACHE_DIR, 'lahman'))
+
+
+def load_table(path: str, cache_dir: Optional[str] = None) -> ContactTable:
+    """
+    Load a Lahman season CSV (Pitching, Batting, ...) as columns sorted by yearID.
+
+    The CSV is only parsed when its contents are not cached.
+
+    Args:
+        path: Lahman CSV with a yearID column
+        cache_dir: Cache directory, defaults to a lahman directory in CONTACT_CACHE_DIR
+
+    Returns:
+        ContactTable with memory-mapped columns
+    """
+    directory = lahman_cache_path(path, cache_dir)
+    if not os.path.exists(os.path.join(directory, 'columns.json')):
+        names, columns = read_csv_columns(path, TEXT_COLUMNS, INT_COLUMNS)
+        # Partition by season: each season's rows are contiguous
+        order = np.argsort(columns['yearID'], kind='stable')
+        write_cache(directory, names, {name: values[order] for name, values in columns.items()})
+    return read_cache(directory)
+
+
+def load_pitching(path: str, cache_dir: Optional[str] = None, fip_constant=None) -> PitchingTable:
+    """
+    Load a Lahman Pitching.csv.
+
+    Args:
+        path: Lahman Pitching.csv
+        cache_dir: Cache directory, defaults to a lahman directory in CONTACT_CACHE_DIR
+        fip_constant: FIP constant for every row, defaults to each season's
+
+    Returns:
+        PitchingTable with memory-mapped columns
+    """
+    return PitchingTable(load_table(path, cache_dir), fip_constant)
+
+
+def load_batting(path: str, cache_dir: Optional[str] = None) -> SeasonTable:
+    """Load a Lahman Batting.csv, see load_table."""
+    return SeasonTable(load_table(path, cache_dir))
+
+
+def load_people(path: str, cache_dir: Optional[str] = None) -> ContactTable:
+    """
+    Load names and birth dates from a Lahman People.csv, sorted by playerID.
+
+    Only PEOPLE_TEXT_COLUMNS and PEOPLE_NUMBER_COLUMNS are kept. The CSV is
+    only parsed when its contents are not cached.
+
+    Args:
+        path: Lahman People.csv (Master.csv in older releases)
+        cache_dir: Cache directory, defaults to a lahman directory in CONTACT_CACHE_DIR
+
+    Returns:
+        ContactTable with memory-mapped columns
+    """
+    directory = lahman_cache_path(path, cache_dir)
+    if not os.path.exists(os.path.join(directory, 'columns.json')):
+        with open(path, newline='', encoding='utf-8-sig') as people_file:
+            rows = sorted(csv.DictReader(people_file), key=lambda row: row['playerID'])
+        columns = {name: np.array([row[name] for row in rows], dtype=str) for name in PEOPLE_TEXT_COLUMNS}
+        for name in PEOPLE_NUMBER_COLUMNS:
+            columns[name] = np.array([contact_data.parse_number(row[name]) for row in rows], dtype=np.float32)
+        names = list(PEOPLE_TEXT_COLUMNS + PEOPLE_NUMBER_COLUMNS)
+        write_cache(directory, names, columns)
+    return read_cache(directory)
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict]:
+    """Run the upside screen from the command line and print the rows as JSON."""
+    from config import Config
+
+    parser = argparse.ArgumentParser(description='Screen Lahman pitching for ERA - FIP upside.')
+    parser.add_argument('csv', nargs='?', default=Config.LAHMAN_PITCHING_CSV, help='Lahman Pitching.csv')
+    parser.add_argument('--year', type=int, default=2016)
+    parser.add_argument('--all-seasons', action='store_true')
+    parser.add_argument('--min-era-fip', type=float, default=1.0)
+    parser.add_argument('--min-ip', type=float, default=45.0)
+    parser.add_argument('--min-k-bb', type=float, default=2.0)
+    parser.add_argument('--max-era', type=float, default=5.0)
+    parser.add_argument('--fip-constant', type=float, help='One FIP constant for every season')
+    parser.add_argument('--league-context', action='store_true', help='Print each season\'s league context')
+    args = parser.parse_args(argv)
+    if not args.csv:
+        parser.error('a Pitching.csv path or LAHMAN_PITCHING_CSV is required')
+
+    table = load_pitching(args.csv, fip_constant=args.fip_constant)
+    if args.league_context:
+        rows = list(table.league.rows())
+        print(json.dumps(rows, indent=2))
+        return rows
+    indices = table.upside(
+        None if args.all_seasons else args.year,
+        args.min_era_fip, args.min_ip, args.min_k_bb, args.max_era
+    )
+    rows = list(table.rows(indices))
+    print(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+"""
+Marcel style multi-season projections over the Lahman tables.
+
+Each player's projection for a season comes from the three seasons before it:
+- counts are weighted 5/4/3, most recent first;
+- the weighted counts are regressed toward the league rates of those same
+  seasons by adding league average playing time;
+- rates get an age adjustment, up 0.6% a year under 29 and down 0.3% a year
+  over it;
+- playing time is half of last season's plus a tenth of the season before,
+  plus a floor (200 PA, or 25 IP for relievers and 60 IP for starters).
+
+A season is projected for every player at once. Stints are summed per player
+with np.bincount, the three seasons are aligned by playerID with
+np.searchsorted and the weighting, regression and aging are array operations.
+Fantasy points for a scoring profile are one matrix product, cached per
+(season, scoring profile).
+
+Usage:
+    python marcel.py batters 2017 --profiles ESPN,CBS,Yahoo --limit 25
+    python marcel.py pitchers 2017 --profiles ESPN
+"""
+import argparse
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cache import ResultCache, scoring_settings_key
+from contact_data import ContactTable
+from lahman import SeasonTable
+from projections import (
+    BATTING_CATEGORIES, BATTING_COLUMNS, PITCHING_CATEGORIES, batting_weights, pitching_weights
+)
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('batters', 'pitchers')
+# Season weights, most recent season first
+WEIGHTS = (5, 4, 3)
+# League average playing time added per unit of season weight: 1200 PA and
+# about 268 IP at the 5/4/3 weights
+BATTER_REGRESSION_PA = 100.0
+PITCHER_REGRESSION_IP = 134.0 / 6
+BATTER_PA_FLOOR = 200.0
+RELIEVER_IP_FLOOR = 25.0
+STARTER_IP_FLOOR = 60.0
+PEAK_AGE = 29
+YOUNG_AGE_RATE = 0.006
+OLD_AGE_RATE = 0.003
+
+# Lahman columns summed per player season
+BATTER_COLUMNS = ('AB', 'BB', 'HBP', 'SH', 'SF', 'H', '2B', '3B', 'HR', 'IBB', 'R', 'RBI', 'SB', 'CS', 'SO')
+PITCHER_COLUMNS = ('IPouts', 'G', 'GS', 'W', 'L', 'ER', 'HR', 'SO', 'H', 'BB')
+# Pitching category for each Pitching.csv count, projected per inning
+PITCHER_RATE_COLUMNS = {'W': 'W', 'L': 'L', 'ER': 'ER', 'HRA': 'HR', 'K': 'SO', 'HA': 'H', 'BB': 'BB'}
+# Categories that get worse, rather than better, with a younger player
+BATTER_DECLINING = ('CS', 'SO')
+PITCHER_DECLINING = ('L', 'ER', 'HRA', 'HA', 'BB')
+
+
+def player_season_totals(table: SeasonTable, year: int, names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum each player's stints in one season.
+
+    Args:
+        table: Lahman season table
+        year: Season to total
+        names: Columns to sum. Missing columns and values count as zero.
+
+    Returns:
+        Sorted playerIDs and their totals, shape (players, len(names))
+    """
+    rows = table.season_rows(year)
+    players, inverse = np.unique(np.asarray(table['playerID'][rows]), return_inverse=True)
+    totals = np.zeros((len(players), len(names)))
+    for j, name in enumerate(names):
+        if name in table:
+            values = np.nan_to_num(np.asarray(table[name][rows], dtype=np.float64))
+            totals[:, j] = np.bincount(inverse, weights=values, minlength=len(players))
+    return players, totals
+
+
+def aligned_seasons(
+    table: SeasonTable,
+    season: int,
+    names: Sequence[str],
+    seasons: int = len(WEIGHTS)
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Totals for the seasons before season, aligned by player.
+
+    Args:
+        table: Lahman season table
+        season: Projected season
+        names: Columns to sum
+        seasons: Number of prior seasons
+
+    Returns:
+        Sorted playerIDs of everyone who played in any of those seasons, and
+        totals of shape (seasons, players, len(names)), most recent first
+    """
+    totals = [player_season_totals(table, season - k, names) for k in range(1, seasons + 1)]
+    players = np.unique(np.concatenate([ids for ids, _ in totals]))
+    stacked = np.zeros((seasons, len(players), len(names)))
+    for k, (ids, values) in enumerate(totals):
+        stacked[k, np.searchsorted(players, ids)] = values
+    return players, stacked
+
+
+def regressed_rates(
+    counts: np.ndarray,
+    playing_time: np.ndarray,
+    weights: Sequence[float],
+    regression: float
+) -> np.ndarray:
+    """
+    Weighted rates regressed toward the league rates of the same seasons.
+
+    The league rate each player regresses toward weights every season's
+    league rate by the player's own weighted playing time in it.
+
+    Args:
+        counts: Counts, shape (seasons, players, stats)
+        playing_time: PA or IP, shape (seasons, players)
+        weights: One weight per season, most recent first
+        regression: League average playing time added per unit of weight
+
+    Returns:
+        Rates per unit of playing time, shape (players, stats)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    league_time = playing_time.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        league_rates = np.where(league_time[:, None] > 0, counts.sum(axis=1) / league_time[:, None], 0.0)
+    # Seasons missing from the tables don't count toward the league mean
+    played = (league_time > 0) * weights
+    season_mean = played @ league_rates / max(played.sum(), 1.0)
+
+    weighted_time = weights @ playing_time
+    weighted_counts = np.tensordot(weights, counts, axes=1)
+    league_share = weights[:, None] * playing_time
+    with np.errstate(divide='ignore', invalid='ignore'):
+        player_league = np.where(
+            weighted_time[:, None] > 0,
+            league_share.T @ league_rates / weighted_time[:, None],
+            season_mean
+        )
+    added = regression * weights.sum()
+    return (weighted_counts + added * player_league) / (weighted_time[:, None] + added)
+
+
+def season_ages(people: Optional[ContactTable], players: np.ndarray, season: int) -> np.ndarray:
+    """
+    Age on July 1 of the season, NaN for players without a birth date.
+
+    Args:
+        people: load_people output, sorted by playerID
+        players: playerIDs
+        season: Projected season
+    """
+    ages = np.full(len(players), np.nan)
+    if people is None or not len(people) or not len(players):
+        return ages
+    ids = np.asarray(people['playerID'])
+    i = np.minimum(np.searchsorted(ids, players), len(ids) - 1)
+    found = ids[i] == players
+    birth_year = np.asarray(people['birthYear'], dtype=np.float64)[i]
+    birth_month = np.nan_to_num(np.asarray(people['birthMonth'], dtype=np.float64)[i], nan=1.0)
+    ages[found] = (season - birth_year - (birth_month >= 7))[found]
+    return ages
+
+
+def age_factors(ages: np.ndarray) -> np.ndarray:
+    """Rate multiplier for each age, 1 when the age is unknown."""
+    years = PEAK_AGE - np.nan_to_num(ages, nan=PEAK_AGE)
+    return 1 + years * np.where(years > 0, YOUNG_AGE_RATE, OLD_AGE_RATE)
+
+
+def apply_age(rates: np.ndarray, factors: np.ndarray, categories: Sequence[str], declining: Sequence[str]) -> np.ndarray:
+    """Multiply improving rates by the age factor and divide declining ones by it."""
+    exponent = np.array([-1.0 if category in declining else 1.0 for category in categories])
+    return rates * factors[:, None] ** exponent
+
+
+def player_names(people: Optional[ContactTable], players: np.ndarray) -> List[str]:
+    """"First Last" for each playerID, or the playerID when not in People.csv."""
+    if people is None or not len(people) or not len(players):
+        return [str(player) for player in players]
+    ids = np.asarray(people['playerID'])
+    i = np.minimum(np.searchsorted(ids, players), len(ids) - 1)
+    first, last = people['nameFirst'], people['nameLast']
+    return [
+        f'{first[j]} {last[j]}'.strip() if ids[j] == player else str(player)
+        for player, j in zip(players, i)
+    ]
+
+
+class MarcelProjector:
+    """Marcel projections for every player in the Lahman tables."""
+
+    def __init__(
+        self,
+        batting: Optional[SeasonTable] = None,
+        pitching: Optional[SeasonTable] = None,
+        people: Optional[ContactTable] = None,
+        weights: Sequence[float] = WEIGHTS,
+        cache_size: int = 64
+    ):
+        """
+        Create a projector.
+
+        Args:
+            batting: load_batting output
+            pitching: load_pitching output
+            people: load_people output, for names and ages
+            weights: Season weights, most recent first
+            cache_size: Projected seasons and point totals to keep
+        """
+        self.tables = {'batters': batting, 'pitchers': pitching}
+        self.people = people
+        self.weights = tuple(float(weight) for weight in weights)
+        self.cache = ResultCache(cache_size)
+
+    def table(self, kind: str) -> SeasonTable:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown player kind: {kind}")
+        if self.tables[kind] is None:
+            raise ValueError(f"No Lahman {'Batting' if kind == 'batters' else 'Pitching'}.csv loaded")
+        return self.tables[kind]
+
+    def project(self, kind: str, season: int) -> Dict[str, np.ndarray]:
+        """
+        Project one season for every player who played in the seasons before it.
+
+        Args:
+            kind: 'batters' or 'pitchers'
+            season: Projected season
+
+        Returns:
+            Dictionary of 'playerID', 'age' and each of BATTING_CATEGORIES
+            plus 'PA', or PITCHING_CATEGORIES, to one value per player
+
+        Raises:
+            ValueError: If the kind is unknown, its table is not loaded or
+                nobody played in the seasons before season
+        """
+        key = ('projection', kind, season)
+        projection = self.cache.get(key)
+        if projection is None:
+            table = self.table(kind)
+            if kind == 'batters':
+                projection = self._project_batters(table, season)
+            else:
+                projection = self._project_pitchers(table, season)
+            if not len(projection['playerID']):
+                raise ValueError(f"No {kind} in the {len(self.weights)} seasons before {season}")
+            self.cache.set(key, projection)
+        return projection
+
+    def _project_batters(self, table: SeasonTable, season: int) -> Dict[str, np.ndarray]:
+        players, totals = aligned_seasons(table, season, BATTER_COLUMNS, len(self.weights))
+        column = {name: totals[:, :, j] for j, name in enumerate(BATTER_COLUMNS)}
+        pa = sum(column[name] for name in ('AB', 'BB', 'HBP', 'SH', 'SF'))
+        counts = {category: column[name] for category, name in BATTING_COLUMNS.items()}
+        counts['S'] = column['H'] - column['2B'] - column['3B'] - column['HR']
+        stacked = np.stack([counts[category] for category in BATTING_CATEGORIES], axis=2)
+
+        rates = regressed_rates(stacked, pa, self.weights, BATTER_REGRESSION_PA)
+        ages = season_ages(self.people, players, season)
+        rates = apply_age(rates, age_factors(ages), BATTING_CATEGORIES, BATTER_DECLINING)
+        projected_pa = np.round(0.5 * pa[0] + 0.1 * pa[1] + BATTER_PA_FLOOR)
+
+        projection = {'playerID': players, 'age': ages, 'PA': projected_pa}
+        for c, category in enumerate(BATTING_CATEGORIES):
+            projection[category] = rates[:, c] * projected_pa
+        return projection
+
+    def _project_pitchers(self, table: SeasonTable, season: int) -> Dict[str, np.ndarray]:
+        players, totals = aligned_seasons(table, season, PITCHER_COLUMNS, len(self.weights))
+        column = {name: totals[:, :, j] for j, name in enumerate(PITCHER_COLUMNS)}
+        innings = column['IPouts'] / 3
+        categories = list(PITCHER_RATE_COLUMNS)
+        stacked = np.stack([column[PITCHER_RATE_COLUMNS[category]] for category in categories], axis=2)
+
+        rates = regressed_rates(stacked, innings, self.weights, PITCHER_REGRESSION_IP)
+        ages = season_ages(self.people, players, season)
+        rates = apply_age(rates, age_factors(ages), categories, PITCHER_DECLINING)
+        # Starters are pitchers who started at least half their games last season
+        starter = 2 * column['GS'][0] >= np.maximum(column['G'][0], 1)
+        floor = np.where(starter, STARTER_IP_FLOOR, RELIEVER_IP_FLOOR)
+        projected_innings = np.round(0.5 * innings[0] + 0.1 * innings[1] + floor, 1)
+
+        projection = {'playerID': players, 'age': ages, 'INN': projected_innings}
+        for c, category in enumerate(categories):
+            projection[category] = rates[:, c] * projected_innings
+        return projection
+
+    def points(self, kind: str, season: int, scoring_settings: Dict) -> np.ndarray:
+        """
+        Projected fantasy points for every player under one scoring profile.
+
+        Args:
+            kind: 'batters' or 'pitchers'
+            season: Projected season
+            scoring_settings: Scoring settings with batting and pitching weights
+
+        Returns:
+            Points in project(kind, season) player order
+        """
+        key = ('points', kind, season, scoring_settings_key(scoring_settings))
+        points = self.cache.get(key)
+        if points is None:
+            projection = self.project(kind, season)
+            if kind == 'batters':
+                categories, weights = BATTING_CATEGORIES, batting_weights({'profile': scoring_settings})
+            else:
+                categories, weights = PITCHING_CATEGORIES, pitching_weights({'profile': scoring_settings})
+            counts = np.stack([projection[category] for category in categories], axis=1)
+            points = (counts @ weights)[:, 0]
+            self.cache.set(key, points)
+        return points
+
+    def rows(self, kind: str, season: int, profiles: Dict[str, Dict], limit: Optional[int] = None) -> List[Dict]:
+        """
+        Rows of projected counts and points, best first by the first profile.
+
+        Args:
+            kind: 'batters' or 'pitchers'
+            season: Projected season
+            profiles: Profile name to scoring settings
+            limit: Maximum players to return
+
+        Returns:
+            List of projections
+        """
+        projection = self.project(kind, season)
+        players = projection['playerID']
+        points = np.stack([self.points(kind, season, settings) for settings in profiles.values()], axis=1)
+        order = np.argsort(-points[:, 0], kind='stable')[:limit]
+        names = player_names(self.people, players[order])
+        categories = ('PA',) + BATTING_CATEGORIES if kind == 'batters' else PITCHING_CATEGORIES
+        return [
+            {
+                'playerID': str(players[i]),
+                'name': name,
+                'age': None if np.isnan(projection['age'][i]) else int(projection['age'][i]),
+                'projection': {category: round(float(projection[category][i]), 1) for category in categories},
+                'points': {profile: round(float(points[i, p]), 1) for p, profile in enumerate(profiles)},
+            }
+            for name, i in zip(names, order)
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict]:
+    """Project a season from the command line and print the rows as JSON."""
+    from config import Config
+    from lahman import load_batting, load_people, load_pitching
+    from services import FantasyCalculatorService
+
+    parser = argparse.ArgumentParser(description='Marcel projections from the Lahman database.')
+    parser.add_argument('kind', choices=KINDS)
+    parser.add_argument('season', type=int, help='Season to project')
+    parser.add_argument('--batting', default=Config.LAHMAN_BATTING_CSV, help='Lahman Batting.csv')
+    parser.add_argument('--pitching', default=Config.LAHMAN_PITCHING_CSV, help='Lahman Pitching.csv')
+    parser.add_argument('--people', default=Config.LAHMAN_PEOPLE_CSV, help='Lahman People.csv, for names and ages')
+    parser.add_argument('--profiles', default='ESPN,CBS,Yahoo')
+    parser.add_argument('--limit', type=int)
+    args = parser.parse_args(argv)
+
+    path = args.batting if args.kind == 'batters' else args.pitching
+    if not path:
+        parser.error(f'--{"batting" if args.kind == "batters" else "pitching"} or its LAHMAN_ setting is required')
+    projector = MarcelProjector(
+        batting=load_batting(path) if args.kind == 'batters' else None,
+        pitching=load_pitching(path) if args.kind == 'pitchers' else None,
+        people=load_people(args.people) if args.people else None
+    )
+    profiles = {name: FantasyCalculatorService.get_scoring_settings(name) for name in args.profiles.split(',')}
+    rows = projector.rows(args.kind, args.season, profiles, args.limit)
+    print(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,12 @@
 """
 Database models for the Fantasy Baseball application.
 """
-from datetime import datetime
+from datetime import date, datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import JSON
+from database import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class ScoringSettings:
     """Default scoring settings for different league types."""
@@ -197,6 +198,9 @@ class ExpectedGame(db.Model):
     """Model for storing expected game calculations."""
     
     __tablename__ = 'expected_games'
+    __table_args__ = (
+        db.Index('ix_expected_games_lookup', 'league_type', 'handedness', 'inning'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     team_abbreviation = db.Column(db.String(3), db.ForeignKey('teams.abbreviation'), nullable=False)
@@ -239,3 +243,122 @@ class ExpectedGame(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
 
+
+class TeamSplitStat(db.Model):
+    """Model for one team's per-9 pitching rates in one split on one date."""
+    
+    __tablename__ = 'team_split_stats'
+    __table_args__ = (
+        # One split slice for every team is a single range scan of this index
+        db.Index(
+            'ix_team_split_stats_slice',
+            'split_type', 'season', 'as_of_date', 'team_abbreviation',
+            unique=True
+        ),
+        db.Index('ix_team_split_stats_team', 'team_abbreviation', 'split_type', 'as_of_date'),
+        # Resolves an as_of date to its snapshot with one seek
+        db.Index('ix_team_split_stats_as_of', 'split_type', 'as_of_date'),
+    )
+    
+    # Split types mirrored from the wide Team columns
+    TEAM_SPLIT_TYPES = ('vs_lefty', 'vs_righty')
+    STAT_COLUMNS = ('era', 'whip', 'k_per_9', 'bb_per_9', 'hr_per_9', 'hits_per_9')
+    
+    id = db.Column(db.Integer, primary_key=True)
+    team_abbreviation = db.Column(db.String(3), db.ForeignKey('teams.abbreviation'), nullable=False)
+    split_type = db.Column(db.String(20), nullable=False)  # 'vs_lefty', 'vs_righty', 'home', ...
+    season = db.Column(db.Integer, nullable=False)
+    as_of_date = db.Column(db.Date, nullable=False)
+    
+    # No defaults: a missing rate stays NULL rather than becoming a perfect 0.0
+    era = db.Column(db.Float)
+    whip = db.Column(db.Float)
+    k_per_9 = db.Column(db.Float)
+    bb_per_9 = db.Column(db.Float)
+    hr_per_9 = db.Column(db.Float)
+    hits_per_9 = db.Column(db.Float)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TeamSplitStat {self.team_abbreviation} {self.split_type} {self.as_of_date}>'
+    
+    @classmethod
+    def latest_as_of(cls, split_type: str, season: int = None, as_of_date: date = None):
+        """Latest snapshot date for a split, optionally within a season or before a date."""
+        query = db.session.query(db.func.max(cls.as_of_date)).filter(cls.split_type == split_type)
+        if season is not None:
+            query = query.filter(cls.season == season)
+        if as_of_date is not None:
+            query = query.filter(cls.as_of_date <= as_of_date)
+        return query.scalar()
+    
+    @classmethod
+    def latest(cls, split_types, season: int = None, as_of_date: date = None):
+        """
+        Query for every team's rates in the latest snapshot of each split.
+        
+        Each split resolves its own snapshot date with a correlated max()
+        on the as_of index, so several splits are still one statement.
+        
+        Returns:
+            Query of (split_type, team_abbreviation, era, whip, k_per_9,
+            bb_per_9, hr_per_9, hits_per_9) rows
+        """
+        snapshot = db.aliased(cls)
+        newest = db.session.query(db.func.max(snapshot.as_of_date)).filter(
+            snapshot.split_type == cls.split_type
+        )
+        query = db.session.query(
+            cls.split_type, cls.team_abbreviation, *[getattr(cls, stat) for stat in cls.STAT_COLUMNS]
+        ).filter(cls.split_type.in_(split_types))
+        if season is not None:
+            newest = newest.filter(snapshot.season == season)
+            query = query.filter(cls.season == season)
+        if as_of_date is not None:
+            newest = newest.filter(snapshot.as_of_date <= as_of_date)
+        return query.filter(cls.as_of_date == newest.scalar_subquery())
+    
+    @classmethod
+    def slice(cls, split_type: str, season: int = None, as_of_date: date = None) -> list:
+        """
+        Every team's rates for one split from the latest snapshot on or before a date.
+        
+        Returns:
+            List of (team_abbreviation, era, whip, k_per_9, bb_per_9, hr_per_9, hits_per_9)
+            rows ordered by team, empty if there is no snapshot
+        """
+        snapshot = cls.latest_as_of(split_type, season, as_of_date)
+        if snapshot is None:
+            return []
+        
+        query = db.session.query(
+            cls.team_abbreviation, *[getattr(cls, stat) for stat in cls.STAT_COLUMNS]
+        ).filter(cls.split_type == split_type, cls.as_of_date == snapshot)
+        if season is not None:
+            query = query.filter(cls.season == season)
+        return query.order_by(cls.team_abbreviation).all()
+    
+    @classmethod
+    def rows_from_team(cls, team: dict, season: int, as_of_date: date) -> list:
+        """Split rows for the wide vs_lefty_*/vs_righty_* values of one team."""
+        return [
+            dict(
+                team_abbreviation=team['abbreviation'],
+                split_type=split_type,
+                season=season,
+                as_of_date=as_of_date,
+                **{stat: team.get(f'{split_type}_{stat}') for stat in cls.STAT_COLUMNS}
+            )
+            for split_type in cls.TEAM_SPLIT_TYPES
+        ]
+    
+    def to_dict(self):
+        """Convert split stat to dictionary."""
+        return {
+            'team_abbreviation': self.team_abbreviation,
+            'split_type': self.split_type,
+            'season': self.season,
+            'as_of_date': self.as_of_date.isoformat() if self.as_of_date else None,
+            **{stat: getattr(self, stat) for stat in self.STAT_COLUMNS},
+        }
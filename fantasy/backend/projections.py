@@ -0,0 +1,344 @@
+"""
+Batch season projections for whole player pools.
+
+Pitchers are projected the way the legacy inning_extrapolator projects one
+pitcher at a time:
+- innings come from innings per start times projected starts;
+- wins and losses come from the per-start rates;
+- HR, K, hits and walks come from the per-inning rates;
+- earned runs come from FIP.
+Every pitcher is projected in one set of array operations. Fantasy points
+for any number of scoring profiles are then one matrix product.
+
+Batters are projected like pa_extrapolator and BatterExtrapolator. Each
+counting stat becomes a per plate appearance rate. The rates times each
+profile's weights give points per PA, which scale to each lineup slot's
+plate appearances.
+
+Usage:
+    python projections.py pitchers lines.csv --profiles ESPN,CBS,Yahoo --starts 32
+    python projections.py batters lines.csv --profiles ESPN,CBS,Yahoo --slot 3
+"""
+import argparse
+import json
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from contact_data import read_csv_columns
+from lahman import DEFAULT_FIP_CONSTANT, LeagueContext, PitchingTable
+
+logger = logging.getLogger(__name__)
+
+# Projected pitching counts, as ScoringSettings pitching keys
+PITCHING_CATEGORIES = ('INN', 'W', 'L', 'ER', 'HRA', 'K', 'HA', 'BB')
+TEXT_COLUMNS = ('Name', 'name', 'playerID', 'Team', 'teamID', 'lgID')
+
+# Projected batting counts, as ScoringSettings batting keys
+BATTING_CATEGORIES = ('S', 'D', 'T', 'HR', 'BB', 'IBB', 'HBP', 'R', 'RBI', 'SB', 'CS', 'SO')
+# Season line column for each batting category; singles are derived from H
+BATTING_COLUMNS = {'D': '2B', 'T': '3B', 'HR': 'HR', 'BB': 'BB', 'IBB': 'IBB', 'HBP': 'HBP',
+                   'R': 'R', 'RBI': 'RBI', 'SB': 'SB', 'CS': 'CS', 'SO': 'SO'}
+# BatterExtrapolator's plate appearances for lineup slots 1 through 8
+LINEUP_SLOT_PA = np.array([670, 650, 630, 600, 581, 541, 523, 460], dtype=np.float64)
+
+
+def innings_from_notation(ip: np.ndarray) -> np.ndarray:
+    """Innings for box score notation, where 72.1 is 72 and one third."""
+    ip = np.asarray(ip, dtype=np.float64)
+    whole = np.floor(ip)
+    return whole + np.round((ip - whole) * 10) / 3
+
+
+def read_season_lines(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read pitcher or batter season lines from a CSV.
+
+    Pitcher lines need IP (box score notation) or IPouts, GS, W, L, H, HR,
+    BB and SO. Optional columns are:
+    - HBP;
+    - FIP, which is computed when missing or blank;
+    - yearID or season, to pick the FIP constant;
+    - projected_starts, which falls back to GS when blank.
+
+    Batter lines need H, 2B, 3B, HR, BB, R, RBI, SB and SO, plus PA or the
+    AB, BB, HBP, SH and SF to count it from. IBB, HBP and CS count as zero
+    when missing. A projected_PA column gives each batter's own plate
+    appearances.
+    """
+    names, columns = read_csv_columns(path, TEXT_COLUMNS, ('yearID', 'season'))
+    if 'season' in columns and 'yearID' not in columns:
+        columns['yearID'] = columns.pop('season')
+    return columns
+
+
+def pitcher_lines_from_lahman(pitching: PitchingTable, year: int) -> Dict[str, np.ndarray]:
+    """One season of a Lahman pitching table as pitcher lines."""
+    rows = pitching.season_rows(year)
+    return {
+        name: np.asarray(pitching[name][rows])
+        for name in ('playerID', 'yearID', 'IPouts', 'GS', 'W', 'L', 'H', 'HR', 'BB', 'SO', 'HBP')
+    }
+
+
+def pitching_weights(profiles: Dict[str, Dict]) -> np.ndarray:
+    """
+    Pitching weights for several scoring profiles.
+
+    Args:
+        profiles: Profile name to scoring settings
+
+    Returns:
+        Array of shape (len(PITCHING_CATEGORIES), profiles)
+    """
+    return np.array([
+        [float(settings['pitching'].get(category, 0)) for settings in profiles.values()]
+        for category in PITCHING_CATEGORIES
+    ], dtype=np.float64).reshape(len(PITCHING_CATEGORIES), len(profiles))
+
+
+def project_pitchers(
+    lines: Dict[str, np.ndarray],
+    projected_starts=None,
+    league: Optional[LeagueContext] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Project season counts for every pitcher.
+
+    Args:
+        lines: Pitcher season lines, see read_season_lines
+        projected_starts: Starts next season, a scalar or one per pitcher.
+            Defaults to the projected_starts column, then to last season's GS.
+        league: League context for each season's FIP constant. Pitchers
+            without a season in it use DEFAULT_FIP_CONSTANT.
+
+    Returns:
+        Dictionary of PITCHING_CATEGORIES to projected counts, plus FIP
+    """
+    raw = lambda name: np.asarray(lines[name], dtype=np.float64)
+    f64 = lambda name: np.nan_to_num(raw(name))
+    innings = f64('IPouts') / 3 if 'IPouts' in lines else innings_from_notation(f64('IP'))
+    starts = f64('GS')
+    if projected_starts is None:
+        projected_starts = starts
+        if 'projected_starts' in lines:
+            projected_starts = np.where(np.isnan(raw('projected_starts')), starts, raw('projected_starts'))
+    projected_starts = np.broadcast_to(np.asarray(projected_starts, dtype=np.float64), starts.shape)
+
+    # Blank FIP cells are computed like a missing column rather than read
+    # as 0, which would project no earned runs
+    fip = raw('FIP') if 'FIP' in lines else np.full(len(starts), np.nan)
+    blank = np.isnan(fip)
+    if blank.any():
+        constant = np.full(len(starts), DEFAULT_FIP_CONSTANT)
+        if league is not None and 'yearID' in lines:
+            season_constant = league.lookup(lines['yearID'])['FIP_constant']
+            constant = np.where(np.isnan(season_constant), constant, season_constant)
+        hbp = f64('HBP') if 'HBP' in lines else 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fip_core = (13 * f64('HR') + 3 * (f64('BB') + hbp) - 2 * f64('SO')) / innings
+        fip = np.where(blank, np.where(innings > 0, fip_core, 0.0) + constant, fip)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_start = lambda values: np.where(starts > 0, values / starts, 0.0)
+        per_inning = lambda values: np.where(innings > 0, values / innings, 0.0)
+        projected_innings = np.round(projected_starts * per_start(innings), 1)
+        return {
+            'INN': projected_innings,
+            'W': projected_starts * per_start(f64('W')),
+            'L': projected_starts * per_start(f64('L')),
+            'ER': np.round(projected_innings * fip / 9, 2),
+            'HRA': np.round(per_inning(f64('HR')) * projected_innings),
+            'K': np.round(per_inning(f64('SO')) * projected_innings),
+            'HA': np.round(per_inning(f64('H')) * projected_innings),
+            'BB': np.round(per_inning(f64('BB')) * projected_innings),
+            'FIP': fip,
+        }
+
+
+def pitcher_points(projection: Dict[str, np.ndarray], weights: np.ndarray) -> np.ndarray:
+    """
+    Projected fantasy points for every pitcher and profile.
+
+    Args:
+        projection: project_pitchers output
+        weights: pitching_weights output
+
+    Returns:
+        Array of shape (pitchers, profiles)
+    """
+    counts = np.stack([projection[category] for category in PITCHING_CATEGORIES], axis=1)
+    return counts @ weights
+
+
+def plate_appearances(lines: Dict[str, np.ndarray]) -> np.ndarray:
+    """PA from the lines, or AB + BB + HBP + SH + SF for Lahman style lines."""
+    if 'PA' in lines:
+        return np.nan_to_num(np.asarray(lines['PA'], dtype=np.float64))
+    return sum(
+        (np.nan_to_num(np.asarray(lines[name], dtype=np.float64))
+         for name in ('AB', 'BB', 'HBP', 'SH', 'SF') if name in lines),
+        np.zeros(len(lines['H']))
+    )
+
+
+def batting_weights(profiles: Dict[str, Dict]) -> np.ndarray:
+    """
+    Batting weights for several scoring profiles.
+
+    Args:
+        profiles: Profile name to scoring settings
+
+    Returns:
+        Array of shape (len(BATTING_CATEGORIES), profiles)
+    """
+    return np.array([
+        [float(settings['batting'].get(category, 0)) for settings in profiles.values()]
+        for category in BATTING_CATEGORIES
+    ], dtype=np.float64).reshape(len(BATTING_CATEGORIES), len(profiles))
+
+
+def batter_rates(lines: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Per plate appearance rates for every batter.
+
+    Args:
+        lines: Batter season lines, see read_season_lines
+
+    Returns:
+        Array of shape (batters, len(BATTING_CATEGORIES)), zero for batters without a PA
+    """
+    pa = plate_appearances(lines)
+    f64 = lambda name: np.nan_to_num(np.asarray(lines[name], dtype=np.float64)) if name in lines else np.zeros(len(pa))
+    counts = {category: f64(column) for category, column in BATTING_COLUMNS.items()}
+    counts['S'] = f64('H') - counts['D'] - counts['T'] - counts['HR']
+    stacked = np.stack([counts[category] for category in BATTING_CATEGORIES], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(pa[:, None] > 0, stacked / pa[:, None], 0.0)
+
+
+def batter_points(rates: np.ndarray, weights: np.ndarray, plate_appearances=LINEUP_SLOT_PA) -> np.ndarray:
+    """
+    Projected fantasy points for every batter, plate appearance count and profile.
+
+    Args:
+        rates: batter_rates output
+        weights: batting_weights output
+        plate_appearances: Plate appearances to project, defaults to every lineup slot
+
+    Returns:
+        Array of shape (batters, len(plate_appearances), profiles)
+    """
+    points_per_pa = rates @ weights
+    return points_per_pa[:, None, :] * np.asarray(plate_appearances, dtype=np.float64)[None, :, None]
+
+
+def batter_rows(
+    names: Sequence[str],
+    rates: np.ndarray,
+    weights: np.ndarray,
+    profile_names: Sequence[str],
+    lineup_slot: Optional[int] = None,
+    projected_pa: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Rows of per PA rates and projected points, best first by the first profile.
+
+    Every row has points for each lineup slot. projected_points is at
+    the batter's own projected_pa when given, else at lineup_slot's plate
+    appearances, else at the first slot's. Batters with a NaN projected_pa
+    get the same default.
+    """
+    points_per_pa = rates @ weights
+    slot_points = batter_points(rates, weights)
+    default_pa = LINEUP_SLOT_PA[(lineup_slot or 1) - 1]
+    if projected_pa is None:
+        projected_pa = np.full(len(names), default_pa)
+    projected_pa = np.asarray(projected_pa, dtype=np.float64)
+    projected_pa = np.where(np.isnan(projected_pa), default_pa, projected_pa)
+    projected = points_per_pa * projected_pa[:, None]
+    order = np.argsort(-projected[:, 0], kind='stable') if projected.shape[1] else range(len(names))
+    return [
+        {
+            'name': names[i],
+            'rates': {category: round(float(rates[i, c]), 4) for c, category in enumerate(BATTING_CATEGORIES)},
+            'points_per_pa': {profile: round(float(points_per_pa[i, p]), 4) for p, profile in enumerate(profile_names)},
+            'projected_pa': float(projected_pa[i]),
+            'projected_points': {profile: round(float(projected[i, p]), 1) for p, profile in enumerate(profile_names)},
+            'lineup_slot_points': {
+                profile: [round(float(value), 1) for value in slot_points[i, :, p]]
+                for p, profile in enumerate(profile_names)
+            },
+        }
+        for i in order
+    ]
+
+
+def player_names(lines: Dict[str, np.ndarray]) -> List[str]:
+    for column in ('Name', 'name', 'playerID'):
+        if column in lines:
+            return [str(name) for name in lines[column]]
+    return [str(i) for i in range(len(next(iter(lines.values()))))]
+
+
+def projection_rows(
+    names: Sequence[str],
+    projection: Dict[str, np.ndarray],
+    points: np.ndarray,
+    profile_names: Sequence[str]
+) -> List[Dict]:
+    """Rows of projected counts and points, best first by the first profile."""
+    order = np.argsort(-points[:, 0], kind='stable') if points.shape[1] else range(len(names))
+    return [
+        {
+            'name': names[i],
+            'projection': {category: round(float(values[i]), 2) for category, values in projection.items()},
+            'points': {profile: round(float(points[i, p]), 1) for p, profile in enumerate(profile_names)},
+        }
+        for i in order
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict]:
+    """Project a player pool from the command line and print the rows as JSON."""
+    from config import Config
+    from lahman import load_pitching
+    from services import FantasyCalculatorService
+
+    parser = argparse.ArgumentParser(description='Project season fantasy points for a player pool.')
+    subparsers = parser.add_subparsers(dest='players', required=True)
+    pitchers = subparsers.add_parser('pitchers', help='Project pitchers from season lines')
+    pitchers.add_argument('csv', help='Pitcher season lines')
+    pitchers.add_argument('--starts', type=float, help='Projected starts for every pitcher')
+    pitchers.add_argument('--lahman', default=Config.LAHMAN_PITCHING_CSV, help='Pitching.csv for season FIP constants')
+    batters = subparsers.add_parser('batters', help='Project batters from season lines')
+    batters.add_argument('csv', help='Batter season lines')
+    batters.add_argument('--slot', type=int, choices=range(1, len(LINEUP_SLOT_PA) + 1), help='Lineup slot to project')
+    for subparser in (pitchers, batters):
+        subparser.add_argument('--profiles', default='ESPN,CBS,Yahoo')
+        subparser.add_argument('--limit', type=int)
+    args = parser.parse_args(argv)
+
+    profiles = {name: FantasyCalculatorService.get_scoring_settings(name) for name in args.profiles.split(',')}
+    if args.players == 'batters':
+        lines = read_season_lines(args.csv)
+        projected_pa = lines.get('projected_PA') if args.slot is None else None
+        rows = batter_rows(
+            player_names(lines), batter_rates(lines), batting_weights(profiles), list(profiles),
+            args.slot, projected_pa
+        )[:args.limit]
+        print(json.dumps(rows, indent=2))
+        return rows
+
+    lines = read_season_lines(args.csv)
+    league = load_pitching(args.lahman).league if args.lahman else None
+    projection = project_pitchers(lines, args.starts, league)
+    points = pitcher_points(projection, pitching_weights(profiles))
+    rows = projection_rows(player_names(lines), projection, points, list(profiles))[:args.limit]
+    print(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,11 @@ API routes for the Fantasy Baseball application.
 """
 from flask import Blueprint, request, jsonify
 from marshmallow import Schema, fields, ValidationError
-from services import FantasyCalculatorService, TeamService
+from services import FantasyCalculatorService, TeamService, ContactScreenService, ProjectionService
 from models import ScoringSettings, Team
+from cache import expected_points_cache
+from database import read_replica
+from contact_screen import OPERATORS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +17,12 @@ api = Blueprint('api', __name__, url_prefix='/api')
 
 
 # Validation schemas
-class CalculateExpectedSchema(Schema):
+class AsOfSchema(Schema):
+    """Schema for an optional split snapshot date (YYYY-MM-DD)."""
+    as_of = fields.Date(missing=None)
+
+
+class CalculateExpectedSchema(AsOfSchema):
     """Schema for validating expected points calculation requests."""
     handedness = fields.Str(required=True, validate=lambda x: x in ['Lefty', 'Righty'])
     inning = fields.Int(required=True, validate=lambda x: 1 <= x <= 9)
@@ -22,6 +30,63 @@ class CalculateExpectedSchema(Schema):
     custom_scoring = fields.Dict(missing=None)
 
 
+class SplitStatsQuerySchema(AsOfSchema):
+    """Schema for validating split stats query parameters."""
+    season = fields.Int(missing=None)
+
+
+class SimulateStartSchema(CalculateExpectedSchema):
+    """Schema for validating start simulation requests."""
+    team_abbreviation = fields.Str(missing=None)
+    simulations = fields.Int(missing=100000, validate=lambda x: 1 <= x <= 1000000)
+    thresholds = fields.List(fields.Float(), missing=list)
+    seed = fields.Int(missing=None)
+
+
+class ContactFilterSchema(Schema):
+    """Schema for one contact screen filter."""
+    column = fields.Str(required=True)
+    op = fields.Str(required=True, validate=lambda x: x in OPERATORS)
+    value = fields.Raw(required=True)
+
+
+class ContactSortSchema(Schema):
+    """Schema for a contact screen sort."""
+    column = fields.Str(required=True)
+    descending = fields.Bool(missing=False)
+
+
+class ContactScreenSchema(Schema):
+    """Schema for validating contact screen requests."""
+    filters = fields.List(fields.Nested(ContactFilterSchema), missing=list)
+    sort = fields.Nested(ContactSortSchema, missing=None)
+    limit = fields.Int(missing=None, validate=lambda x: x >= 1)
+    columns = fields.List(fields.Str(), missing=None)
+
+
+class ProjectionSchema(Schema):
+    """Schema for the scoring options of batch projection requests."""
+    league_types = fields.List(
+        fields.Str(validate=lambda x: x in ['Custom', 'ESPN', 'CBS', 'Yahoo']),
+        missing=lambda: ['ESPN', 'CBS', 'Yahoo'],
+        validate=lambda x: len(x) >= 1
+    )
+    custom_scoring = fields.Dict(missing=None)
+    limit = fields.Int(missing=None, validate=lambda x: x >= 1)
+
+
+class ProjectPitchersSchema(ProjectionSchema):
+    """Schema for validating batch pitcher projection requests."""
+    pitchers = fields.List(fields.Dict(), required=True, validate=lambda x: 1 <= len(x) <= 5000)
+    projected_starts = fields.Float(missing=None, validate=lambda x: x >= 0)
+
+
+class ProjectBattersSchema(ProjectionSchema):
+    """Schema for validating batch batter projection requests."""
+    batters = fields.List(fields.Dict(), required=True, validate=lambda x: 1 <= len(x) <= 10000)
+    lineup_slot = fields.Int(missing=None, validate=lambda x: 1 <= x <= 8)
+
+
 class ScoringSettingsSchema(Schema):
     """Schema for validating scoring settings."""
     batting = fields.Dict(required=True)
@@ -65,6 +130,7 @@ def get_scoring_settings(league_type):
 
 
 @api.route('/teams', methods=['GET'])
+@read_replica
 def get_teams():
     """Get all teams with their statistics."""
     try:
@@ -80,6 +146,7 @@ def get_teams():
 
 
 @api.route('/teams/<abbreviation>', methods=['GET'])
+@read_replica
 def get_team(abbreviation):
     """
     Get a specific team by abbreviation.
@@ -101,6 +168,7 @@ def get_team(abbreviation):
 
 
 @api.route('/calculate-expected', methods=['POST'])
+@read_replica
 def calculate_expected():
     """Calculate expected fantasy points for all teams."""
     try:
@@ -116,6 +184,7 @@ def calculate_expected():
         inning = data['inning']
         league_type = data['league_type']
         custom_scoring = data.get('custom_scoring')
+        as_of = data.get('as_of')
         
         # Validate custom scoring if provided
         if league_type == 'Custom' and custom_scoring:
@@ -133,7 +202,8 @@ def calculate_expected():
             handedness=handedness,
             inning=inning,
             league_type=league_type,
-            custom_scoring=custom_scoring
+            custom_scoring=custom_scoring,
+            as_of=as_of
         )
         
         return jsonify({
@@ -141,17 +211,21 @@ def calculate_expected():
             'parameters': {
                 'handedness': handedness,
                 'inning': inning,
-                'league_type': league_type
+                'league_type': league_type,
+                'as_of': as_of.isoformat() if as_of else None
             },
             'count': len(results)
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error calculating expected points: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 
 @api.route('/calculate-team-expected', methods=['POST'])
+@read_replica
 def calculate_team_expected():
     """Calculate expected fantasy points for a specific team."""
     try:
@@ -179,12 +253,19 @@ def calculate_team_expected():
         else:
             scoring_settings = FantasyCalculatorService.get_scoring_settings(data['league_type'])
         
+        # Optional snapshot date, e.g. '2025-06-01'
+        try:
+            as_of = AsOfSchema().load({'as_of': data['as_of']} if data.get('as_of') else {})['as_of']
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
         # Calculate expected points
         result = FantasyCalculatorService.calculate_expected_points(
             team_abbreviation=data['team_abbreviation'].upper(),
             handedness=data['handedness'],
             inning=data['inning'],
-            scoring_settings=scoring_settings
+            scoring_settings=scoring_settings,
+            as_of=as_of
         )
         
         return jsonify({'result': result})
@@ -197,6 +278,7 @@ def calculate_team_expected():
 
 
 @api.route('/matchup-analysis', methods=['POST'])
+@read_replica
 def matchup_analysis():
     """
     Analyze matchups and return color-coded results.
@@ -215,7 +297,8 @@ def matchup_analysis():
             handedness=data['handedness'],
             inning=data['inning'],
             league_type=data['league_type'],
-            custom_scoring=data.get('custom_scoring')
+            custom_scoring=data.get('custom_scoring'),
+            as_of=data.get('as_of')
         )
         
         if not results:
@@ -260,16 +343,62 @@ def matchup_analysis():
             'parameters': {
                 'handedness': data['handedness'],
                 'inning': data['inning'],
-                'league_type': data['league_type']
+                'league_type': data['league_type'],
+                'as_of': data['as_of'].isoformat() if data.get('as_of') else None
             }
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error in matchup analysis: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@api.route('/simulate-start', methods=['POST'])
+@read_replica
+def simulate_start():
+    """Simulate the fantasy points distribution of a start against each team."""
+    try:
+        schema = SimulateStartSchema()
+        try:
+            data = schema.load(request.json)
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        team_abbreviation = data.get('team_abbreviation')
+        results = FantasyCalculatorService.simulate_start(
+            handedness=data['handedness'],
+            inning=data['inning'],
+            league_type=data['league_type'],
+            custom_scoring=data.get('custom_scoring'),
+            team_abbreviation=team_abbreviation.upper() if team_abbreviation else None,
+            simulations=data['simulations'],
+            thresholds=data['thresholds'],
+            seed=data.get('seed'),
+            as_of=data.get('as_of')
+        )
+        
+        return jsonify({
+            'results': results,
+            'parameters': {
+                'handedness': data['handedness'],
+                'inning': data['inning'],
+                'league_type': data['league_type'],
+                'simulations': data['simulations']
+            },
+            'count': len(results)
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error simulating start: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @api.route('/team-stats', methods=['GET'])
+@read_replica
 def get_all_team_stats():
     """
     Get basic team stats for all teams (vs lefty and righty).
@@ -315,6 +444,210 @@ def get_all_team_stats():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@api.route('/team-split-stats/<split_type>', methods=['GET'])
+@read_replica
+def get_team_split_stats(split_type):
+    """
+    Get one split for every team from the latest snapshot.
+    
+    Args:
+        split_type: Split type (e.g., 'vs_lefty', 'home')
+    
+    Query parameters:
+        season: Season to read, defaults to the latest
+        as_of: Latest snapshot date to consider (YYYY-MM-DD)
+    """
+    try:
+        try:
+            args = SplitStatsQuerySchema().load({
+                key: request.args[key] for key in ('season', 'as_of') if request.args.get(key)
+            })
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        stats = TeamService.get_split_stats(split_type, args['season'], args['as_of'])
+        
+        if not stats:
+            return jsonify({'error': 'No split stats found'}), 404
+        
+        return jsonify({
+            'split_type': split_type,
+            'teams': stats,
+            'count': len(stats)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching {split_type} split stats: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/contact-screen/<dataset>', methods=['POST'])
+def contact_screen(dataset):
+    """
+    Screen batter or pitcher contact data.
+    
+    Args:
+        dataset: Contact dataset ('batter' or 'pitcher')
+    """
+    try:
+        schema = ContactScreenSchema()
+        try:
+            data = schema.load(request.json or {})
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        return jsonify(ContactScreenService.screen(
+            dataset,
+            filters=data['filters'],
+            sort=data['sort'],
+            limit=data['limit'],
+            columns=data['columns']
+        ))
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error screening {dataset} contact data: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/contact-screens/<name>', methods=['GET'])
+def run_contact_screen(name):
+    """
+    Run a predefined contact screen.
+    
+    Args:
+        name: Screen name (e.g., 'hard_contact_batters', 'contact_scout')
+    
+    Query parameters:
+        limit: Maximum players to return
+    """
+    try:
+        limit = request.args.get('limit', type=int)
+        return jsonify(ContactScreenService.run_preset(name, limit))
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        logger.error(f"Error running contact screen {name}: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/project-pitchers', methods=['POST'])
+def project_pitchers():
+    """Project season fantasy points for a pool of pitchers under several scorings."""
+    try:
+        schema = ProjectPitchersSchema()
+        try:
+            data = schema.load(request.json)
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        results = ProjectionService.project_pitchers(
+            data['pitchers'],
+            league_types=data['league_types'],
+            custom_scoring=data['custom_scoring'],
+            projected_starts=data['projected_starts'],
+            limit=data['limit']
+        )
+        
+        return jsonify({
+            'results': results,
+            'league_types': data['league_types'],
+            'count': len(results)
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error projecting pitchers: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/project-batters', methods=['POST'])
+def project_batters():
+    """Project per PA rates and season fantasy points for a pool of batters."""
+    try:
+        schema = ProjectBattersSchema()
+        try:
+            data = schema.load(request.json)
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        results = ProjectionService.project_batters(
+            data['batters'],
+            league_types=data['league_types'],
+            custom_scoring=data['custom_scoring'],
+            lineup_slot=data['lineup_slot'],
+            limit=data['limit']
+        )
+        
+        return jsonify({
+            'results': results,
+            'league_types': data['league_types'],
+            'count': len(results)
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error projecting batters: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/marcel/<kind>/<int:season>', methods=['GET', 'POST'])
+def marcel_projections(kind, season):
+    """
+    Marcel projections for every batter or pitcher in the Lahman history.
+    
+    Args:
+        kind: 'batters' or 'pitchers'
+        season: Season to project
+    
+    GET query parameters are league_type (repeatable) and limit. POST takes
+    league_types, custom_scoring and limit as JSON.
+    """
+    try:
+        schema = ProjectionSchema()
+        try:
+            if request.method == 'POST':
+                data = schema.load(request.get_json(silent=True) or {})
+            else:
+                args = {'league_types': request.args.getlist('league_type')}
+                if 'limit' in request.args:
+                    args['limit'] = request.args['limit']
+                data = schema.load({key: value for key, value in args.items() if value})
+        except ValidationError as err:
+            return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+        
+        results = ProjectionService.marcel(
+            kind,
+            season,
+            league_types=data['league_types'],
+            custom_scoring=data['custom_scoring'],
+            limit=data['limit']
+        )
+        
+        return jsonify({
+            'results': results,
+            'kind': kind,
+            'season': season,
+            'league_types': data['league_types'],
+            'count': len(results)
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error projecting {kind} for {season}: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@api.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit/miss counters for the expected points result cache."""
+    return jsonify({'expected_points': expected_points_cache.stats()})
+
 
 # Error handlers
 @api.errorhandler(404)
@@ -5,9 +5,11 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import logging
+from datetime import date, datetime
 from typing import Dict, List, Optional
-from models import db, Team
+from models import db, Team, ExpectedGame
 from config import Config
+from services import FantasyCalculatorService, TeamService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -122,44 +124,76 @@ class MLBScraper:
         
         return teams_data
     
-    def save_team_data(self, teams_data: List[Dict]) -> None:
+    def save_team_data(self, teams_data: List[Dict]) -> Dict[str, int]:
         """
-        Save team data to the database.
+        Bulk upsert team data into the database.
+        
+        Existing rows are loaded with one query, rows whose values did not
+        change are skipped, and inserts and updates are each written with a
+        single executemany. Today's split snapshot of every team is written
+        in the same transaction, unless nothing changed and it already exists.
         
         Args:
             teams_data: List of team data dictionaries
+            
+        Returns:
+            Counts of 'inserted', 'updated' and 'unchanged' rows
         """
         logger.info("Saving team data to database...")
         
+        columns = {column.name for column in Team.__table__.columns} - {'id', 'created_at', 'updated_at'}
+        existing = {team['abbreviation']: team for team in TeamService.team_values()}
+        
+        now = datetime.utcnow()
+        inserts = []
+        updates = []
+        unchanged = 0
+        
         for team_data in teams_data:
-            # Check if team exists
-            team = Team.query.filter_by(abbreviation=team_data['abbreviation']).first()
+            values = {key: value for key, value in team_data.items() if key in columns}
+            team = existing.get(values['abbreviation'])
             
-            if team:
-                # Update existing team
-                for key, value in team_data.items():
-                    if hasattr(team, key):
-                        setattr(team, key, value)
-                logger.info(f"Updated team: {team_data['abbreviation']}")
+            if team is None:
+                inserts.append(dict(values, created_at=now, updated_at=now))
+            elif any(team[key] != value for key, value in values.items()):
+                updates.append(dict(values, id=team['id'], updated_at=now))
             else:
-                # Create new team
-                team = Team(**team_data)
-                db.session.add(team)
-                logger.info(f"Created team: {team_data['abbreviation']}")
+                unchanged += 1
+            existing[values['abbreviation']] = dict(team or {}, **values)
         
         try:
+            if inserts:
+                db.session.bulk_insert_mappings(Team, inserts)
+            if updates:
+                db.session.bulk_update_mappings(Team, updates)
+            # Rewriting an identical snapshot would change data_version and
+            # miss every cached result, so a no-op save leaves it alone
+            today = date.today()
+            if inserts or updates or not TeamService.has_split_snapshot(today):
+                TeamService.stage_split_snapshot(existing.values(), today)
             db.session.commit()
-            logger.info("Successfully saved all team data")
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error saving team data: {e}")
             raise
+        
+        counts = {'inserted': len(inserts), 'updated': len(updates), 'unchanged': unchanged}
+        
+        logger.info(
+            f"Saved team data: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+        )
+        return counts
     
     def run_full_scrape(self) -> None:
         """Run the complete scraping process."""
         try:
             teams_data = self.scrape_team_stats()
-            self.save_team_data(teams_data)
+            counts = self.save_team_data(teams_data)
+            
+            # Only rebuild the grid when teams changed or it was never built
+            if counts['inserted'] or counts['updated'] or ExpectedGame.query.first() is None:
+                FantasyCalculatorService.precompute_expected_games()
             logger.info("Full scraping process completed successfully")
         except Exception as e:
             logger.error(f"Error during scraping process: {e}")
@@ -0,0 +1,103 @@
+"""
+Production server for the Fantasy Baseball API.
+
+Runs the same Flask app under gunicorn with a pre-fork model: the app is
+created and its team data loaded once in the master process, then forked
+into SERVER_WORKERS workers of SERVER_THREADS threads each.
+
+Usage:
+    SERVER_WORKERS=4 SERVER_THREADS=2 python serve.py
+"""
+import logging
+import os
+from typing import Dict
+
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+
+from app import create_app
+from models import db
+from services import FantasyCalculatorService
+
+logger = logging.getLogger(__name__)
+
+
+def gunicorn_options(app: Flask) -> Dict:
+    """
+    Gunicorn settings from the app's SERVER_* configuration.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Dictionary of gunicorn settings
+    """
+    threads = app.config['SERVER_THREADS']
+    return {
+        'bind': app.config['SERVER_BIND'],
+        'workers': app.config['SERVER_WORKERS'],
+        'threads': threads,
+        # The threaded worker is only worth its overhead with more than one thread
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'timeout': app.config['SERVER_TIMEOUT'],
+        'preload_app': app.config['SERVER_PRELOAD'],
+        'accesslog': '-' if app.config.get('DEBUG') else None,
+    }
+
+
+def warm_app(app: Flask) -> int:
+    """
+    Load team data into the result cache before workers are forked.
+
+    The connections used for warming are closed afterwards on every engine,
+    primary and replicas, so no connection is shared between the forked
+    workers.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Number of cached results
+    """
+    with app.app_context():
+        try:
+            warmed = FantasyCalculatorService.warm_result_cache()
+        except Exception as e:
+            # An empty database still serves requests, just without a warm cache
+            logger.warning(f"Could not warm result cache: {e}")
+            warmed = 0
+        finally:
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    return warmed
+
+
+class FantasyServer(BaseApplication):
+    """Gunicorn application serving an already created Flask app."""
+
+    def __init__(self, app: Flask, options: Dict = None):
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+if __name__ == '__main__':
+    app = create_app(os.environ.get('FLASK_ENV', 'production'))
+    options = gunicorn_options(app)
+    if options['preload_app']:
+        warm_app(app)
+
+    logger.info(
+        f"Serving on {options['bind']} with {options['workers']} workers "
+        f"x {options['threads']} threads"
+    )
+    FantasyServer(app, options).run()
@@ -2,8 +2,23 @@
 Business logic services for the Fantasy Baseball application.
 """
 import logging
-from typing import Dict, List, Optional
-from models import db, Team, ExpectedGame, ScoringSettings
+import os
+import numpy as np
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from flask import current_app
+from models import db, Team, TeamSplitStat, ExpectedGame, ScoringSettings
+from engine import ExpectedPointsEngine
+from simulate import StartSimulator
+from cache import expected_points_cache, scoring_settings_key
+from contact_data import load_contact_data
+from contact_screen import ContactScreen, SCREENS
+from lahman import LeagueContext, load_batting, load_people, load_pitching
+from marcel import MarcelProjector
+from projections import (
+    TEXT_COLUMNS, batter_rates, batter_rows, batting_weights,
+    pitcher_points, pitching_weights, player_names, project_pitchers, projection_rows
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +26,11 @@ logger = logging.getLogger(__name__)
 class FantasyCalculatorService:
     """Service for calculating fantasy baseball expected points."""
     
+    # Grid materialized into the expected_games table at scrape time
+    PRESET_LEAGUE_TYPES = ['ESPN', 'CBS', 'Yahoo', 'Custom']
+    PRECOMPUTED_HANDEDNESS = ['Lefty', 'Righty']
+    PRECOMPUTED_INNINGS = range(1, 10)
+    
     @staticmethod
     def get_scoring_settings(league_type: str) -> Dict:
         """
@@ -36,7 +56,8 @@ class FantasyCalculatorService:
         team_abbreviation: str,
         handedness: str,
         inning: int,
-        scoring_settings: Dict
+        scoring_settings: Dict,
+        as_of: Optional[date] = None
     ) -> Dict:
         """
         Calculate expected fantasy points for a team matchup.
@@ -46,92 +67,51 @@ class FantasyCalculatorService:
             handedness: Batter handedness ('Lefty' or 'Righty')
             inning: Number of innings to calculate for (1-9)
             scoring_settings: Dictionary of scoring settings
+            as_of: Use the split snapshot in effect on this date
             
         Returns:
             Dictionary containing expected statistics and points
         """
-        # Get team data
-        team = Team.query.filter_by(abbreviation=team_abbreviation).first()
-        if not team:
+        # Same split snapshot as the all-teams calculation and the grid
+        engine = ExpectedPointsEngine.from_database(as_of, [team_abbreviation])
+        results = engine.calculate(handedness, inning, scoring_settings)
+        if not results:
             raise ValueError(f"Team {team_abbreviation} not found")
+        return results[0]
+    
+    @staticmethod
+    def data_version() -> tuple:
+        """
+        Version of the team data, read with a single query.
         
-        # Select appropriate stats based on handedness
-        if handedness.lower() == 'lefty':
-            era = team.vs_lefty_era
-            whip = team.vs_lefty_whip
-            k_per_9 = team.vs_lefty_k_per_9
-            bb_per_9 = team.vs_lefty_bb_per_9
-            hr_per_9 = team.vs_lefty_hr_per_9
-            hits_per_9 = team.vs_lefty_hits_per_9
-        else:
-            era = team.vs_righty_era
-            whip = team.vs_righty_whip
-            k_per_9 = team.vs_righty_k_per_9
-            bb_per_9 = team.vs_righty_bb_per_9
-            hr_per_9 = team.vs_righty_hr_per_9
-            hits_per_9 = team.vs_righty_hits_per_9
-        
-        # Calculate expected stats per inning
-        innings_factor = inning / 9.0
-        
-        # Basic expected stats (simplified calculation)
-        expected_hits = (hits_per_9 * innings_factor) / 9  # Per batter
-        expected_walks = (bb_per_9 * innings_factor) / 9
-        expected_strikeouts = (k_per_9 * innings_factor) / 9
-        expected_home_runs = (hr_per_9 * innings_factor) / 9
-        expected_runs = (era * innings_factor) / 9
-        
-        # Break down hits into singles, doubles, triples
-        # Typical distribution: ~75% singles, ~20% doubles, ~3% triples, ~2% HR
-        expected_singles = expected_hits * 0.75
-        expected_doubles = expected_hits * 0.20
-        expected_triples = expected_hits * 0.03
-        
-        # Calculate fantasy points
-        batting_points = (
-            expected_singles * scoring_settings['batting'].get('S', 0) +
-            expected_doubles * scoring_settings['batting'].get('D', 0) +
-            expected_triples * scoring_settings['batting'].get('T', 0) +
-            expected_home_runs * scoring_settings['batting'].get('HR', 0) +
-            expected_walks * scoring_settings['batting'].get('BB', 0) +
-            expected_runs * scoring_settings['batting'].get('R', 0) +
-            expected_strikeouts * scoring_settings['batting'].get('SO', 0)
-        )
-        
-        # For simplicity, assume RBI roughly equals runs
-        expected_rbi = expected_runs
-        batting_points += expected_rbi * scoring_settings['batting'].get('RBI', 0)
+        The latest team update, split snapshot and expected games grid
+        times. Any write by any process, including the scraper, changes it,
+        so results cached under an older version are never served again.
+        It is read through db.session like the results themselves, so in a
+        read_replica view both come from the same replica: a lagging replica
+        caches its rows under its own older version, never the primary's.
         
-        return {
-            'team_abbreviation': team_abbreviation,
-            'handedness': handedness,
-            'inning': inning,
-            'expected_fantasy_points': round(batting_points, 2),
-            'expected_runs': round(expected_runs, 3),
-            'expected_hits': round(expected_hits, 3),
-            'expected_singles': round(expected_singles, 3),
-            'expected_doubles': round(expected_doubles, 3),
-            'expected_triples': round(expected_triples, 3),
-            'expected_home_runs': round(expected_home_runs, 3),
-            'expected_walks': round(expected_walks, 3),
-            'expected_strikeouts': round(expected_strikeouts, 3),
-            'expected_rbi': round(expected_rbi, 3),
-            'team_stats': {
-                'era': era,
-                'whip': whip,
-                'k_per_9': k_per_9,
-                'bb_per_9': bb_per_9,
-                'hr_per_9': hr_per_9,
-                'hits_per_9': hits_per_9
-            }
-        }
+        Returns:
+            Tuple of ISO timestamps, None for an empty table
+        """
+        latest = [
+            db.session.query(db.func.max(column)).scalar_subquery()
+            for column in (Team.updated_at, TeamSplitStat.created_at, ExpectedGame.created_at)
+        ]
+        row = db.session.query(*latest).one()
+        return tuple(
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row
+        )
     
     @staticmethod
     def calculate_all_teams_expected_points(
         handedness: str,
         inning: int,
         league_type: str,
-        custom_scoring: Optional[Dict] = None
+        custom_scoring: Optional[Dict] = None,
+        as_of: Optional[date] = None,
+        data_version: Optional[tuple] = None
     ) -> List[Dict]:
         """
         Calculate expected points for all teams.
@@ -141,6 +121,8 @@ class FantasyCalculatorService:
             inning: Number of innings to calculate for (1-9)
             league_type: Type of league ('Custom', 'ESPN', 'CBS', 'Yahoo')
             custom_scoring: Custom scoring settings (if league_type is 'Custom')
+            as_of: Use the split snapshot in effect on this date
+            data_version: data_version() when the caller already read it
             
         Returns:
             List of dictionaries containing expected points for all teams
@@ -151,28 +133,223 @@ class FantasyCalculatorService:
         else:
             scoring_settings = FantasyCalculatorService.get_scoring_settings(league_type)
         
-        # Get all teams
-        teams = Team.query.all()
+        if data_version is None:
+            data_version = FantasyCalculatorService.data_version()
+        cache_key = (data_version, handedness, inning, scoring_settings_key(scoring_settings))
+        if as_of is not None:
+            cache_key += (as_of.isoformat(),)
+        cached = expected_points_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        results = None
+        # The materialized grid only holds the current snapshot
+        if not (league_type.upper() == 'CUSTOM' and custom_scoring) and as_of is None:
+            results = FantasyCalculatorService.get_precomputed_expected_points(
+                handedness, inning, league_type
+            )
+        
+        if results is None:
+            # Load every team's split rates in one query and score them together
+            engine = ExpectedPointsEngine.from_database(as_of)
+            results = engine.calculate(handedness, inning, scoring_settings)
+        
+        expected_points_cache.set(cache_key, results)
+        return results
+    
+    @staticmethod
+    def simulate_start(
+        handedness: str,
+        inning: int,
+        league_type: str,
+        custom_scoring: Optional[Dict] = None,
+        team_abbreviation: Optional[str] = None,
+        simulations: int = 100000,
+        thresholds: Optional[List[float]] = None,
+        seed: Optional[int] = None,
+        as_of: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        Simulate the distribution of fantasy points for a start.
+        
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to simulate (1-9)
+            league_type: Type of league ('Custom', 'ESPN', 'CBS', 'Yahoo')
+            custom_scoring: Custom scoring settings (if league_type is 'Custom')
+            team_abbreviation: Single team to simulate, or None for all teams
+            simulations: Number of simulated starts per team
+            thresholds: Points values to report P(points > X) for
+            seed: Optional random seed for reproducible results
+            as_of: Use the split snapshot in effect on this date
+            
+        Returns:
+            List of distribution summaries sorted by mean points
+        """
+        if league_type.upper() == 'CUSTOM' and custom_scoring:
+            scoring_settings = custom_scoring
+        else:
+            scoring_settings = FantasyCalculatorService.get_scoring_settings(league_type)
+        
+        engine = ExpectedPointsEngine.from_database(as_of)
+        if team_abbreviation and team_abbreviation not in engine.abbreviations:
+            raise ValueError(f"Team {team_abbreviation} not found")
+        
+        simulator = StartSimulator(engine, seed=seed)
+        return simulator.simulate(
+            handedness,
+            inning,
+            scoring_settings,
+            simulations=simulations,
+            thresholds=thresholds or [],
+            team_abbreviations=[team_abbreviation] if team_abbreviation else None
+        )
+    
+    @staticmethod
+    def get_precomputed_expected_points(
+        handedness: str,
+        inning: int,
+        league_type: str
+    ) -> Optional[List[Dict]]:
+        """
+        Read preset league results from the materialized expected_games grid.
+        
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings (1-9)
+            league_type: Preset league type ('Custom', 'ESPN', 'CBS', 'Yahoo')
+            
+        Returns:
+            List of result dictionaries sorted by expected points, or None if
+            the grid has not been populated for these parameters
+        """
+        league_type = FantasyCalculatorService._preset_league_type(league_type)
+        if league_type is None:
+            return None
+        
+        side = 'lefty' if handedness.lower() == 'lefty' else 'righty'
+        # Team stats come from the split snapshot the grid was built from
+        snapshot = TeamSplitStat.latest([f'vs_{side}']).subquery()
+        rate_columns = [snapshot.c[stat] for stat in ExpectedPointsEngine.STAT_COLUMNS]
+        rows = db.session.query(ExpectedGame, *rate_columns).join(
+            snapshot, ExpectedGame.team_abbreviation == snapshot.c.team_abbreviation
+        ).filter(
+            ExpectedGame.league_type == league_type,
+            ExpectedGame.handedness == handedness.capitalize(),
+            ExpectedGame.inning == inning
+        ).order_by(ExpectedGame.expected_fantasy_points.desc()).all()
+        
+        # Exactly one row per team, otherwise fall back to computing
+        if not rows or len({row[0].team_abbreviation for row in rows}) != len(rows):
+            return None
+        
         results = []
+        for expected_game, *rates in rows:
+            results.append(ExpectedPointsEngine.build_result(
+                team_abbreviation=expected_game.team_abbreviation,
+                handedness=handedness,
+                inning=inning,
+                expected_fantasy_points=expected_game.expected_fantasy_points,
+                expected_runs=expected_game.expected_runs,
+                expected_hits=expected_game.expected_hits,
+                expected_home_runs=expected_game.expected_home_runs,
+                expected_walks=expected_game.expected_walks,
+                expected_strikeouts=expected_game.expected_strikeouts,
+                team_stats=dict(zip(ExpectedPointsEngine.STAT_COLUMNS, rates))
+            ))
         
-        for team in teams:
-            try:
-                result = FantasyCalculatorService.calculate_expected_points(
-                    team.abbreviation,
-                    handedness,
-                    inning,
-                    scoring_settings
-                )
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error calculating for team {team.abbreviation}: {e}")
-                continue
-        
-        # Sort by expected fantasy points (descending)
+        # Match the compute path's ordering on rounded points
         results.sort(key=lambda x: x['expected_fantasy_points'], reverse=True)
-        
         return results
     
+    @staticmethod
+    def precompute_expected_games() -> int:
+        """
+        Materialize the full preset grid into the expected_games table.
+        
+        Writes every team x handedness x inning 1-9 x preset league type in
+        a single transaction, replacing the previous grid.
+        
+        Returns:
+            Number of rows written. The result cache is cleared once the
+            new grid is committed.
+        """
+        engine = ExpectedPointsEngine.from_database()
+        league_types = FantasyCalculatorService.PRESET_LEAGUE_TYPES
+        profiles = [FantasyCalculatorService.get_scoring_settings(lt) for lt in league_types]
+        column = {stat: i for i, stat in enumerate(ExpectedPointsEngine.STAT_COLUMNS)}
+        created_at = datetime.utcnow()
+        
+        rows = []
+        for handedness in FantasyCalculatorService.PRECOMPUTED_HANDEDNESS:
+            for inning in FantasyCalculatorService.PRECOMPUTED_INNINGS:
+                stats = engine.expected_stats(handedness, inning)
+                points = engine.expected_points_matrix(handedness, inning, profiles)
+                for t, abbreviation in enumerate(engine.abbreviations):
+                    for p, league_type in enumerate(league_types):
+                        rows.append({
+                            'team_abbreviation': abbreviation,
+                            'handedness': handedness,
+                            'inning': inning,
+                            'league_type': league_type,
+                            'scoring_settings': profiles[p],
+                            'expected_fantasy_points': float(points[t, p]),
+                            'expected_runs': float(stats[t, column['era']]),
+                            'expected_hits': float(stats[t, column['hits_per_9']]),
+                            'expected_home_runs': float(stats[t, column['hr_per_9']]),
+                            'expected_strikeouts': float(stats[t, column['k_per_9']]),
+                            'expected_walks': float(stats[t, column['bb_per_9']]),
+                            'created_at': created_at,
+                        })
+        
+        try:
+            ExpectedGame.query.filter(
+                ExpectedGame.league_type.in_(league_types)
+            ).delete(synchronize_session=False)
+            db.session.bulk_insert_mappings(ExpectedGame, rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error precomputing expected games: {e}")
+            raise
+        
+        # Only now is the grid current; clearing earlier lets a request re-cache the old one
+        expected_points_cache.invalidate()
+        logger.info(f"Precomputed {len(rows)} expected games")
+        return len(rows)
+    
+    @staticmethod
+    def warm_result_cache() -> int:
+        """
+        Load the preset grid into the in-process result cache.
+        
+        Run before forking server workers so every worker starts with the
+        team data already in memory instead of querying it on first use.
+        
+        Returns:
+            Number of cached results
+        """
+        warmed = 0
+        data_version = FantasyCalculatorService.data_version()
+        for league_type in FantasyCalculatorService.PRESET_LEAGUE_TYPES:
+            for handedness in FantasyCalculatorService.PRECOMPUTED_HANDEDNESS:
+                for inning in FantasyCalculatorService.PRECOMPUTED_INNINGS:
+                    FantasyCalculatorService.calculate_all_teams_expected_points(
+                        handedness, inning, league_type, data_version=data_version
+                    )
+                    warmed += 1
+        
+        logger.info(f"Warmed {warmed} cached results")
+        return warmed
+    
+    @staticmethod
+    def _preset_league_type(league_type: str) -> Optional[str]:
+        """Canonical spelling of a preset league type, or None."""
+        for preset in FantasyCalculatorService.PRESET_LEAGUE_TYPES:
+            if preset.upper() == league_type.upper():
+                return preset
+        return None
+    
     @staticmethod
     def save_expected_game(
         team_abbreviation: str,
@@ -272,6 +449,399 @@ class TeamService:
             if field in allowed_fields and hasattr(team, field):
                 setattr(team, field, value)
         
-        db.session.commit()
+        try:
+            # The split snapshot is written in the same transaction as the team
+            TeamService.stage_split_snapshot(TeamService.team_values(), date.today())
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error updating team stats: {e}")
+            raise
+        
+        # Keep the materialized grid in step with the new stats
+        FantasyCalculatorService.precompute_expected_games()
         return team.to_dict()
+    
+    @staticmethod
+    def team_values() -> List[Dict]:
+        """Every team's column values, including changes not yet committed."""
+        columns = [column.name for column in Team.__table__.columns]
+        return [
+            {column: getattr(team, column) for column in columns}
+            for team in Team.query.all()
+        ]
+    
+    @staticmethod
+    def has_split_snapshot(as_of_date: date) -> bool:
+        """
+        Check whether a date's vs_lefty/vs_righty split rows exist.
+        
+        Args:
+            as_of_date: Snapshot date
+            
+        Returns:
+            True if the snapshot has been written
+        """
+        return db.session.query(
+            TeamSplitStat.query.filter(
+                TeamSplitStat.split_type.in_(TeamSplitStat.TEAM_SPLIT_TYPES),
+                TeamSplitStat.season == as_of_date.year,
+                TeamSplitStat.as_of_date == as_of_date
+            ).exists()
+        ).scalar()
+    
+    @staticmethod
+    def stage_split_snapshot(teams: Iterable[Dict], as_of_date: date) -> int:
+        """
+        Replace one date's vs_lefty/vs_righty split rows without committing.
+        
+        Callers commit it together with the team rows it was built from,
+        so the snapshot never disagrees with the Team table.
+        
+        Args:
+            teams: Team column values, one dictionary per team
+            as_of_date: Snapshot date
+            
+        Returns:
+            Number of split rows staged
+        """
+        rows = []
+        for team in teams:
+            rows.extend(TeamSplitStat.rows_from_team(team, as_of_date.year, as_of_date))
+        
+        TeamSplitStat.query.filter(
+            TeamSplitStat.split_type.in_(TeamSplitStat.TEAM_SPLIT_TYPES),
+            TeamSplitStat.season == as_of_date.year,
+            TeamSplitStat.as_of_date == as_of_date
+        ).delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(TeamSplitStat, rows)
+        return len(rows)
+    
+    @staticmethod
+    def snapshot_split_stats(as_of_date: Optional[date] = None) -> int:
+        """
+        Write every team's current vs_lefty/vs_righty rates as a dated snapshot.
+        
+        Earlier snapshots are kept. Writing the same date again replaces
+        that date's rows.
+        
+        Args:
+            as_of_date: Snapshot date, defaults to today
+            
+        Returns:
+            Number of split rows written
+        """
+        as_of_date = as_of_date or date.today()
+        try:
+            written = TeamService.stage_split_snapshot(TeamService.team_values(), as_of_date)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error writing split snapshot: {e}")
+            raise
+        
+        logger.info(f"Wrote {written} split stats as of {as_of_date}")
+        return written
+    
+    @staticmethod
+    def get_split_stats(
+        split_type: str,
+        season: Optional[int] = None,
+        as_of_date: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        Get one split for every team from the latest snapshot.
+        
+        Args:
+            split_type: Split type (e.g., 'vs_lefty', 'home')
+            season: Season to read, defaults to the latest
+            as_of_date: Latest snapshot date to consider, defaults to the newest
+            
+        Returns:
+            List of split stat dictionaries ordered by team
+        """
+        rows = TeamSplitStat.slice(split_type, season, as_of_date)
+        return [
+            dict(zip(('team_abbreviation',) + TeamSplitStat.STAT_COLUMNS, row))
+            for row in rows
+        ]
+
+
+class ContactScreenService:
+    """Service for screening the batter and pitcher contact data."""
+    
+    # Screens by dataset, replaced when the file on disk changes
+    _screens = {}
+    
+    @staticmethod
+    def get_screen(dataset: str) -> ContactScreen:
+        """
+        Get the indexed screen for a contact dataset.
+        
+        Args:
+            dataset: Dataset name from CONTACT_DATASETS ('batter' or 'pitcher')
+            
+        Returns:
+            ContactScreen instance
+            
+        Raises:
+            ValueError: If the dataset is not configured
+        """
+        path = current_app.config['CONTACT_DATASETS'].get(dataset)
+        if not path:
+            raise ValueError(f"Unknown contact dataset: {dataset}")
+        
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        cached = ContactScreenService._screens.get(dataset)
+        if cached is None or cached[0] != key:
+            table = load_contact_data(path, current_app.config.get('CONTACT_CACHE_DIR'))
+            cached = (key, ContactScreen(table))
+            ContactScreenService._screens[dataset] = cached
+        return cached[1]
+    
+    @staticmethod
+    def screen(
+        dataset: str,
+        filters: List[Dict],
+        sort: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Screen a contact dataset.
+        
+        Args:
+            dataset: Dataset name from CONTACT_DATASETS
+            filters: List of {'column', 'op', 'value'} specs
+            sort: {'column', 'descending'} spec, or None for file order
+            limit: Maximum players to return
+            columns: Columns to return, defaults to every column
+            
+        Returns:
+            Dictionary with the matching count and players
+            
+        Raises:
+            ValueError: If the dataset or a spec is invalid
+        """
+        count, players = ContactScreenService.get_screen(dataset).run(filters, sort, limit, columns)
+        return {'dataset': dataset, 'count': count, 'players': players}
+    
+    @staticmethod
+    def run_preset(name: str, limit: Optional[int] = None) -> Dict:
+        """
+        Run one of the predefined SCREENS.
+        
+        Raises:
+            ValueError: If there is no screen with that name
+        """
+        if name not in SCREENS:
+            raise ValueError(f"Unknown contact screen: {name}")
+        spec = SCREENS[name]
+        result = ContactScreenService.screen(spec['dataset'], spec['filters'], spec['sort'], limit)
+        result['screen'] = name
+        return result
+
 
+class ProjectionService:
+    """Service for batch season projections."""
+    
+    PITCHER_STATS = ('IP', 'GS', 'W', 'L', 'H', 'HR', 'BB', 'SO')
+    BATTER_STATS = ('PA', 'H', '2B', '3B', 'HR', 'BB', 'R', 'RBI', 'SB', 'SO')
+    
+    # League context by Pitching.csv path, loaded once per process
+    _league_contexts = {}
+    # Marcel projectors by Lahman paths, each caching its projected seasons
+    _marcel_projectors = {}
+    
+    @staticmethod
+    def league_context() -> Optional[LeagueContext]:
+        """
+        Get the per-season league context from LAHMAN_PITCHING_CSV.
+        
+        Returns:
+            LeagueContext instance, or None when no Pitching.csv is configured
+        """
+        path = current_app.config.get('LAHMAN_PITCHING_CSV')
+        if not path:
+            return None
+        if path not in ProjectionService._league_contexts:
+            ProjectionService._league_contexts[path] = load_pitching(
+                path, current_app.config.get('CONTACT_CACHE_DIR')
+            ).league
+        return ProjectionService._league_contexts[path]
+    
+    @staticmethod
+    def season_lines(players: List[Dict], required: tuple, kind: str) -> Dict[str, np.ndarray]:
+        """
+        Turn a list of player season lines into column arrays.
+        
+        Args:
+            players: Season line dictionaries
+            required: Stats every line set must have. IP is satisfied by
+                IPouts, and PA by AB.
+            kind: 'pitcher' or 'batter', for the error message
+            
+        Returns:
+            Dictionary of column name to array
+            
+        Raises:
+            ValueError: If a required stat is missing
+        """
+        columns = sorted({key for player in players for key in player})
+        alternatives = {'IP': 'IPouts', 'PA': 'AB'}
+        missing = [
+            stat for stat in required
+            if stat not in columns and alternatives.get(stat) not in columns
+        ]
+        if missing:
+            raise ValueError(f"Missing {kind} stats: {', '.join(missing)}")
+        
+        lines = {}
+        for column in columns:
+            values = [player.get(column) for player in players]
+            if column in TEXT_COLUMNS:
+                lines[column] = np.array(['' if value is None else str(value) for value in values])
+            else:
+                lines[column] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        return lines
+    
+    @staticmethod
+    def scoring_profiles(league_types: List[str], custom_scoring: Optional[Dict] = None) -> Dict[str, Dict]:
+        """
+        Get scoring settings for each league type.
+        
+        Args:
+            league_types: League types ('Custom', 'ESPN', 'CBS', 'Yahoo')
+            custom_scoring: Settings for the 'Custom' league type
+            
+        Returns:
+            Dictionary of league type to scoring settings
+        """
+        return {
+            league_type: custom_scoring if league_type.upper() == 'CUSTOM' and custom_scoring
+            else FantasyCalculatorService.get_scoring_settings(league_type)
+            for league_type in league_types
+        }
+    
+    @staticmethod
+    def project_pitchers(
+        pitchers: List[Dict],
+        league_types: List[str],
+        custom_scoring: Optional[Dict] = None,
+        projected_starts: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Project season fantasy points for a pool of pitchers.
+        
+        Args:
+            pitchers: Season lines, each with IP or IPouts, GS, W, L, H, HR,
+                BB and SO, and optionally name, HBP, FIP, yearID and projected_starts
+            league_types: League types to score
+            custom_scoring: Settings for the 'Custom' league type
+            projected_starts: Starts next season for every pitcher
+            limit: Maximum pitchers to return
+            
+        Returns:
+            List of projections, best first by the first league type
+            
+        Raises:
+            ValueError: If a pitcher is missing a required stat
+        """
+        lines = ProjectionService.season_lines(pitchers, ProjectionService.PITCHER_STATS, 'pitcher')
+        profiles = ProjectionService.scoring_profiles(league_types, custom_scoring)
+        projection = project_pitchers(lines, projected_starts, ProjectionService.league_context())
+        points = pitcher_points(projection, pitching_weights(profiles))
+        return projection_rows(player_names(lines), projection, points, list(profiles))[:limit]
+    
+    @staticmethod
+    def project_batters(
+        batters: List[Dict],
+        league_types: List[str],
+        custom_scoring: Optional[Dict] = None,
+        lineup_slot: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Project per PA rates and season fantasy points for a pool of batters.
+        
+        Args:
+            batters: Season lines, each with PA (or AB), H, 2B, 3B, HR, BB, R,
+                RBI, SB and SO, and optionally name, IBB, HBP, CS and projected_PA
+            league_types: League types to score
+            custom_scoring: Settings for the 'Custom' league type
+            lineup_slot: Lineup slot (1-8) whose plate appearances to project,
+                instead of each batter's projected_PA
+            limit: Maximum batters to return
+            
+        Returns:
+            List of projections, best first by the first league type
+            
+        Raises:
+            ValueError: If a batter is missing a required stat
+        """
+        lines = ProjectionService.season_lines(batters, ProjectionService.BATTER_STATS, 'batter')
+        profiles = ProjectionService.scoring_profiles(league_types, custom_scoring)
+        
+        projected_pa = lines.get('projected_PA') if lineup_slot is None else None
+        rows = batter_rows(
+            player_names(lines), batter_rates(lines), batting_weights(profiles), list(profiles),
+            lineup_slot, projected_pa
+        )
+        return rows[:limit]
+    
+    @staticmethod
+    def marcel_projector() -> MarcelProjector:
+        """
+        Get the Marcel projector for the configured Lahman CSVs.
+        
+        Returns:
+            MarcelProjector instance, loaded once per process
+            
+        Raises:
+            ValueError: If neither LAHMAN_BATTING_CSV nor LAHMAN_PITCHING_CSV is configured
+        """
+        paths = tuple(
+            current_app.config.get(name)
+            for name in ('LAHMAN_BATTING_CSV', 'LAHMAN_PITCHING_CSV', 'LAHMAN_PEOPLE_CSV')
+        )
+        batting, pitching, people = paths
+        if not batting and not pitching:
+            raise ValueError("Marcel projections need LAHMAN_BATTING_CSV or LAHMAN_PITCHING_CSV")
+        if paths not in ProjectionService._marcel_projectors:
+            cache_dir = current_app.config.get('CONTACT_CACHE_DIR')
+            ProjectionService._marcel_projectors[paths] = MarcelProjector(
+                batting=load_batting(batting, cache_dir) if batting else None,
+                pitching=load_pitching(pitching, cache_dir) if pitching else None,
+                people=load_people(people, cache_dir) if people else None
+            )
+        return ProjectionService._marcel_projectors[paths]
+    
+    @staticmethod
+    def marcel(
+        kind: str,
+        season: int,
+        league_types: List[str],
+        custom_scoring: Optional[Dict] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Marcel projections for a whole season from the Lahman history.
+        
+        Args:
+            kind: 'batters' or 'pitchers'
+            season: Season to project from the three seasons before it
+            league_types: League types to score
+            custom_scoring: Settings for the 'Custom' league type
+            limit: Maximum players to return
+            
+        Returns:
+            List of projections, best first by the first league type
+            
+        Raises:
+            ValueError: If the kind is unknown, its CSV is not configured or
+                there are no seasons to project from
+        """
+        profiles = ProjectionService.scoring_profiles(league_types, custom_scoring)
+        return ProjectionService.marcel_projector().rows(kind, season, profiles, limit)
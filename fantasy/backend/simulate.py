@@ -0,0 +1,211 @@
+"""
+Monte Carlo start simulator for the Fantasy Baseball application.
+
+Samples plate appearance outcomes from each team's split rates to give the
+full distribution of fantasy points for a start, not just its mean.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from engine import ExpectedPointsEngine
+
+logger = logging.getLogger(__name__)
+
+
+class StartSimulator:
+    """Vectorized simulation of many starts against each team."""
+
+    # League average plate appearances per inning
+    PA_PER_INNING = 4.25
+
+    # Plate appearance outcomes sampled per start, in multinomial order.
+    # Hits are split by the engine's hit type shares; the remainder of
+    # hits scores nothing, as in the engine.
+    OUTCOMES = (
+        'singles', 'doubles', 'triples', 'other_hits',
+        'walks', 'strikeouts', 'home_runs', 'outs'
+    )
+
+    PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+    DOWNSIDE_QUANTILE = 0.10
+
+    def __init__(self, engine: ExpectedPointsEngine, seed: Optional[int] = None):
+        """
+        Create a simulator over an engine's split rates.
+
+        Args:
+            engine: ExpectedPointsEngine holding every team's split rates
+            seed: Optional random seed for reproducible simulations
+        """
+        self.engine = engine
+        self.rng = np.random.default_rng(seed)
+        hit_type_shares = [
+            ExpectedPointsEngine.SINGLES_SHARE,
+            ExpectedPointsEngine.DOUBLES_SHARE,
+            ExpectedPointsEngine.TRIPLES_SHARE,
+        ]
+        self.hit_type_shares = np.array(hit_type_shares + [1.0 - sum(hit_type_shares)])
+
+    @classmethod
+    def plate_appearances(cls, inning: int) -> int:
+        """Plate appearances simulated for a start of this many innings."""
+        return max(1, int(np.ceil(inning * cls.PA_PER_INNING)))
+
+    def outcome_probabilities(self, handedness: str, inning: int) -> np.ndarray:
+        """
+        Per plate appearance outcome probabilities for every team.
+
+        Probabilities are chosen so the expected lineup totals over the start
+        equal rate_per_9 * inning / 9, the same rates the engine uses.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to simulate (1-9)
+
+        Returns:
+            Array of shape (teams, len(OUTCOMES))
+        """
+        column = {stat: i for i, stat in enumerate(ExpectedPointsEngine.STAT_COLUMNS)}
+        rates = self.engine.split_rates(handedness)
+        per_start = rates * inning / 9.0
+        events = np.stack([
+            per_start[:, column['hits_per_9']],
+            per_start[:, column['bb_per_9']],
+            per_start[:, column['k_per_9']],
+            per_start[:, column['hr_per_9']],
+        ], axis=1) / self.plate_appearances(inning)
+
+        # Rates this extreme are bad data; scale them down to a valid distribution
+        totals = events.sum(axis=1, keepdims=True)
+        events = np.where(totals > 1.0, events / np.maximum(totals, 1.0), events)
+        outs = 1.0 - events.sum(axis=1, keepdims=True)
+
+        # Splitting each hit by type is the same as sampling hit types directly
+        hit_types = events[:, :1] * self.hit_type_shares
+        return np.clip(np.concatenate([hit_types, events[:, 1:], outs], axis=1), 0.0, 1.0)
+
+    def simulate_points(
+        self,
+        probabilities: np.ndarray,
+        expected_runs: float,
+        inning: int,
+        simulations: int,
+        weights: Dict[str, float]
+    ) -> np.ndarray:
+        """
+        Simulate one team's starts and score them per batter.
+
+        Args:
+            probabilities: Outcome probabilities, shape (len(OUTCOMES),)
+            expected_runs: Expected lineup runs for the start
+            inning: Number of innings to simulate (1-9)
+            simulations: Number of starts to draw
+            weights: Batting scoring settings
+
+        Returns:
+            Array of shape (simulations,) with fantasy points per batter
+        """
+        outcome_weights = np.array([
+            weights.get('S', 0), weights.get('D', 0), weights.get('T', 0), 0,
+            weights.get('BB', 0), weights.get('SO', 0), weights.get('HR', 0), 0
+        ], dtype=np.float64)
+
+        # Only the points matter, so outcomes worth the same are sampled as one
+        values, classes = np.unique(outcome_weights, return_inverse=True)
+        class_probabilities = np.bincount(classes, weights=probabilities, minlength=len(values))
+        counts = self.rng.multinomial(
+            self.plate_appearances(inning),
+            class_probabilities / class_probabilities.sum(),
+            size=simulations
+        )
+        runs = self.rng.poisson(expected_runs, size=simulations)
+
+        lineup_points = (
+            counts @ values +
+            runs * (weights.get('R', 0) + weights.get('RBI', 0))  # RBI roughly equals runs
+        )
+        # The engine reports points per batter, so spread the lineup total over nine
+        return lineup_points / 9.0
+
+    @classmethod
+    def summarize(cls, points: np.ndarray, thresholds: Sequence[float]) -> Dict:
+        """
+        Summarize simulated points as a distribution.
+
+        Args:
+            points: Simulated fantasy points per start
+            thresholds: Points values to report P(points > X) for
+
+        Returns:
+            Dictionary of mean, spread, percentiles and tail probabilities
+        """
+        # One sort serves every percentile, tail probability and the downside mean
+        points = np.sort(points)
+        percentiles = np.percentile(points, cls.PERCENTILES, method='linear')
+        worst = points[:max(1, int(len(points) * cls.DOWNSIDE_QUANTILE))]
+        return {
+            'mean': round(float(points.mean()), 3),
+            'std': round(float(points.std()), 3),
+            'variance': round(float(points.var()), 4),
+            'percentiles': {
+                str(p): round(float(v), 3) for p, v in zip(cls.PERCENTILES, percentiles)
+            },
+            'prob_above': {
+                str(x): round(1.0 - np.searchsorted(points, x, side='right') / len(points), 4)
+                for x in thresholds
+            },
+            # Mean of the worst 10% of starts
+            'downside_risk': round(float(worst.mean()), 3)
+        }
+
+    def simulate(
+        self,
+        handedness: str,
+        inning: int,
+        scoring_settings: Dict,
+        simulations: int = 100000,
+        thresholds: Sequence[float] = (),
+        team_abbreviations: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Simulate starts against every team, or the given teams.
+
+        Args:
+            handedness: Batter handedness ('Lefty' or 'Righty')
+            inning: Number of innings to simulate (1-9)
+            scoring_settings: Dictionary of scoring settings
+            simulations: Number of starts to draw per team
+            thresholds: Points values to report P(points > X) for
+            team_abbreviations: Teams to simulate, defaults to all teams
+
+        Returns:
+            List of dictionaries, sorted by mean points (descending)
+        """
+        rows = range(len(self.engine))
+        if team_abbreviations is not None:
+            wanted = set(team_abbreviations)
+            rows = [i for i, abbr in enumerate(self.engine.abbreviations) if abbr in wanted]
+
+        probabilities = self.outcome_probabilities(handedness, inning)
+        era_column = ExpectedPointsEngine.STAT_COLUMNS.index('era')
+        expected_runs = self.engine.split_rates(handedness)[:, era_column] * inning / 9.0
+        weights = scoring_settings['batting']
+
+        results = []
+        for i in rows:
+            points = self.simulate_points(
+                probabilities[i], float(expected_runs[i]), inning, simulations, weights
+            )
+            result = {
+                'team_abbreviation': self.engine.abbreviations[i],
+                'handedness': handedness,
+                'inning': inning,
+                'simulations': simulations
+            }
+            result.update(self.summarize(points, thresholds))
+            results.append(result)
+
+        results.sort(key=lambda x: x['mean'], reverse=True)
+        return results
@@ -1,10 +1,15 @@
 from calculator.settings.logger import log
+import numpy as np
 from calculator.full_season_forecaster.pitcher_calculator import calculate_game
+from calculator.full_season_forecaster.pitcher_calculator import pitching_weights, PITCHING_CATEGORIES
 
 
 # TODO: Write tests
 class SplitExpectedGame(object):
 
+    # Split order of the expected_game_tensor axis
+    SPLITS = ('no', 'lefty', 'righty', 'home', 'away')
+
     def __init__(self):
         """get necessary data from standings."""
         pass
@@ -102,3 +107,71 @@ class SplitExpectedGame(object):
             0 # quality_starts
         )
         league[team].expected_game_away_split = expected_game
+
+    def split_rates(self, frame):
+        '''
+        Stack a LeagueFrame's split rates for expected_game_tensor.
+
+        Returns (rates, records, per_pa): rates is teams x splits x
+        (r, bb, h, hr, so), records is teams x splits x (win, loss) and
+        per_pa marks the splits whose rates are per plate appearance.
+        '''
+        c = frame.columns
+        stats = ('r', 'bb', 'h', 'hr', 'so')
+        generic = [c['runs_per_game'], c['walks_per_game'], c['hits_per_game'],
+            c['homeruns_per_game'], c['strikeouts_per_game']]
+        rates = np.stack([
+            np.stack(generic, axis=-1),
+            np.stack([c['vs_l_%s_per_pa' % stat] for stat in stats], axis=-1),
+            np.stack([c['vs_r_%s_per_pa' % stat] for stat in stats], axis=-1),
+            np.stack([c['home_%s_pg' % stat] for stat in stats], axis=-1),
+            np.stack([c['away_%s_pg' % stat] for stat in stats], axis=-1),
+        ], axis=1)
+        records = np.stack([
+            np.stack([c['win_avg'], c['loss_avg']], axis=-1),
+            np.stack([c['wins_avg_left'], c['losses_avg_left']], axis=-1),
+            np.stack([c['wins_avg_right'], c['loss_avg_right']], axis=-1),
+            np.stack([c['w_avg_home'], c['l_avg_home']], axis=-1),
+            np.stack([c['w_avg_road'], c['l_avg_road']], axis=-1),
+        ], axis=1)
+        per_pa = np.array([split in ('lefty', 'righty') for split in self.SPLITS])
+        return rates, records, per_pa
+
+    def expected_game_tensor(self, frame, innings=(4, 5, 6, 7, 8), scoring_profiles=None):
+        '''
+        Expected points for every team, split and innings count at once.
+
+        Gives the same numbers as the calculate_*_expected_game methods.
+        Per plate appearance splits scale with the starter's expected
+        plate appearances; the per game splits do not depend on innings.
+
+        Returns a teams x SPLITS x innings array, or teams x SPLITS x
+        innings x profiles when scoring_profiles (Pitching classes or
+        dicts keyed like PITCHING_CATEGORIES) is given.
+        '''
+        innings = np.atleast_1d(np.asarray(innings, dtype=np.float64))
+        rates, records, per_pa = self.split_rates(frame)
+        teams, splits = rates.shape[:2]
+
+        # teams x splits x innings multiplier on the five counting stats
+        expected_pa = (innings / 9.0)[None, :] * frame.columns['plate_appearences_per_game'][:, None]
+        scale = np.where(per_pa[None, :, None], expected_pa[:, None, :], 1.0)
+
+        # Features in PITCHING_CATEGORIES order: INN, ER, BBI, HA, HRA, K, S, W, L, QS
+        features = np.zeros((teams, splits, len(innings), len(PITCHING_CATEGORIES)))
+        features[..., 0] = innings
+        features[..., 1:6] = rates[:, :, None, :] * scale[..., None]
+        features[..., 7:9] = records[:, :, None, :]
+
+        if scoring_profiles is None:
+            return np.round(features @ pitching_weights(), 1)
+        weights = np.stack([pitching_weights(profile) for profile in scoring_profiles], axis=1)
+        return np.round(features @ weights, 1)
+
+    def calculate_all_expected_games(self, frame, innings=7):
+        '''Every split for every team in a LeagueFrame, one column at a time.'''
+        log.debug('calculating all expected games')
+        expected_games = self.expected_game_tensor(frame, [innings])[:, :, 0]
+        for i, split in enumerate(self.SPLITS):
+            frame.column('expected_game_%s_split' % split)[:] = expected_games[:, i]
+        return frame
@@ -1,3 +1,4 @@
+import numpy as np
 from calculator.settings.scoring_settings import ScoringSettings
 ssp = ScoringSettings.Pitching
 
@@ -15,3 +16,14 @@ def calculate_game(innings, earned_runs, total_walks, hits_allowed, \
 		+ (float(losses) * ssp.L) \
 		+ (float(quality_starts) * ssp.QS)
 	return round(float(total),1)
+
+
+# calculate_game's stat order, as pitching scoring setting names
+PITCHING_CATEGORIES = ('INN', 'ER', 'BBI', 'HA', 'HRA', 'K', 'S', 'W', 'L', 'QS')
+
+
+def pitching_weights(scoring=ssp):
+	'''Weight per PITCHING_CATEGORIES entry from a Pitching class or dict.'''
+	if isinstance(scoring, dict):
+		return np.array([float(scoring.get(c, 0.0)) for c in PITCHING_CATEGORIES])
+	return np.array([float(getattr(scoring, c, 0.0)) for c in PITCHING_CATEGORIES])
@@ -1,130 +1,15 @@
-import json
-import operator
-import re
-import requests
-from datetime import datetime
-from calculator.full_season_forecaster.pitcher_calculator import calculate_game
-from calculator.scraper.league import get_all_team_names
-from calculator.scraper.standings_data import get_standings, StandingsData
-from calculator.settings.api import BASE_URL, UPDATED_BASE_URL, TEAM_AWAY_URI, TEAM_AT_HOME_URI
-from calculator.settings.api import TEAM_VS_LEFTY_URI, TEAM_VS_RIGHTY_URI
-from calculator.settings.api import TEAM_STANDING_URL
-from calculator.settings.logger import log
-from static.team_map import TEAM_MAP
+from calculator.scraper.league import League
+from calculator.scraper.snapshot_store import default_snapshot_store
 
 # Todo Test that find by ID gets correct team from api
-mlb = get_all_team_names(TEAM_MAP)
-
-from calculator.scraper.team_hitting_stats import get_team_stats
-TEAM_STATS_DICT = get_team_stats()
-
-from calculator.scraper.team_splits_stats import SplitsScraper
-
-split_scraper = SplitsScraper()
-log.debug('\n\n Geting Home Splits')
-TEAM_AT_HOME_DICT = split_scraper.get_splits_by_uri(TEAM_AT_HOME_URI)
-
-for stats in TEAM_AT_HOME_DICT:
-    log.debug('getting home splits')
-    runs_per_game, hits_per_game, hr_per_game, walks_per_game, so_per_game = split_scraper.get_relevant_splits_per_dict(stats)
-    mlb[stats['teamAbbrev']].home_r_pg = runs_per_game
-    mlb[stats['teamAbbrev']].home_h_pg = hits_per_game
-    mlb[stats['teamAbbrev']].home_hr_pg = hr_per_game
-    mlb[stats['teamAbbrev']].home_bb_pg = walks_per_game
-    mlb[stats['teamAbbrev']].home_so_pg = so_per_game
-
-log.debug('\n\n Geting Away Splits')
-TEAM_AWAY_DICT = split_scraper.get_splits_by_uri(TEAM_AWAY_URI)
-for stats in TEAM_AWAY_DICT:
-    log.debug('getting away splits')
-    runs_per_game, hits_per_game, hr_per_game, walks_per_game, so_per_game = split_scraper.get_relevant_splits_per_dict(stats)
-    mlb[stats['teamAbbrev']].away_r_pg = runs_per_game
-    mlb[stats['teamAbbrev']].away_h_pg = hits_per_game
-    mlb[stats['teamAbbrev']].away_hr_pg = hr_per_game
-    mlb[stats['teamAbbrev']].away_bb_pg = walks_per_game
-    mlb[stats['teamAbbrev']].away_so_pg = so_per_game
-
-
-log.debug('\n\n Geting Lefty Splits')
-TEAM_VS_LEFTY_DICT = split_scraper.get_splits_by_uri(TEAM_VS_LEFTY_URI)
-for stats in TEAM_VS_LEFTY_DICT:
-    log.debug('getting lefty splits')
-    runs_per_pa, hits_per_pa, hr_per_pa, walks_per_pa, so_per_pa = split_scraper.get_pitcher_rl_splits_per_dict(stats)
-    mlb[stats['teamAbbrev']].vs_l_r_per_pa = runs_per_pa
-    mlb[stats['teamAbbrev']].vs_l_h_per_pa = hits_per_pa
-    mlb[stats['teamAbbrev']].vs_l_hr_per_pa = hr_per_pa
-    mlb[stats['teamAbbrev']].vs_l_bb_per_pa = walks_per_pa
-    mlb[stats['teamAbbrev']].vs_l_so_per_pa = so_per_pa
-
-
-log.debug('\n\n Geting Righty Splits')
-TEAM_VS_RIGHTY_DICT = split_scraper.get_splits_by_uri(TEAM_VS_RIGHTY_URI)
-for stats in TEAM_VS_RIGHTY_DICT:
-    log.debug('getting righty splits')
-    rbi_per_pa, hits_per_pa, hr_per_pa, walks_per_pa, so_per_pa = split_scraper.get_pitcher_rl_splits_per_dict(stats)
-    mlb[stats['teamAbbrev']].vs_r_r_per_pa = rbi_per_pa
-    mlb[stats['teamAbbrev']].vs_r_h_per_pa = hits_per_pa
-    mlb[stats['teamAbbrev']].vs_r_hr_per_pa = hr_per_pa
-    mlb[stats['teamAbbrev']].vs_r_bb_per_pa = walks_per_pa
-    mlb[stats['teamAbbrev']].vs_r_so_per_pa = so_per_pa
-
-# Get standings and win loss for splits
-TEAM_STANDING_DICT = get_standings()
-standings_data = StandingsData()
-
-def set_league_standings_data(current_standings_dict):
-    assert isinstance(current_standings_dict, list), type(current_standings_dict)
-    for current_standings in current_standings_dict:
-        log.debug('\n\n getting set_league_standings_data data')
-        assert isinstance(current_standings, dict), type(current_standings)
-
-        wins = standings_data.get_wins(current_standings)
-        log.debug("Getting standings for {}".format(current_standings['team']['abbreviation']))
-        log.debug("{team} has {wins} Wins".format(
-            wins=wins,
-            team=current_standings['team']['abbreviation'])
-        )
-        mlb[current_standings['team']['abbreviation']].wins = wins
-
-        losses = standings_data.get_losses(current_standings)
-        mlb[current_standings['team']['abbreviation']].losses = standings_data.get_losses(current_standings)
-
-        mlb[current_standings['team']['abbreviation']].games = standings_data.get_games_total(current_standings)
-
-        mlb[current_standings['team']['abbreviation']].win_avg = standings_data.set_win_avg(current_standings)
-
-        mlb[current_standings['team']['abbreviation']].loss_avg = standings_data.set_loss_avg(current_standings)
-
-        wins_v_left, loss_v_left, g_v_left = standings_data.get_vs_left(current_standings)
-        mlb[current_standings['team']['abbreviation']].wins_avg_left = wins_v_left/g_v_left
-        mlb[current_standings['team']['abbreviation']].losses_avg_left = loss_v_left/g_v_left
-        mlb[current_standings['team']['abbreviation']].g_v_left = g_v_left
-
-        wins_v_right, loss_v_right, g_v_right = standings_data.get_vs_right(current_standings)
-        mlb[current_standings['team']['abbreviation']].wins_avg_right = wins_v_right / g_v_right
-        mlb[current_standings['team']['abbreviation']].loss_avg_right = loss_v_right /g_v_right
-        mlb[current_standings['team']['abbreviation']].g_v_right = g_v_right
-
-        w_at_home, l_at_home, g_at_home = standings_data.get_at_home(current_standings)
-        mlb[current_standings['team']['abbreviation']].w_avg_home = w_at_home / g_at_home
-        mlb[current_standings['team']['abbreviation']].l_avg_home = l_at_home / g_at_home
-        mlb[current_standings['team']['abbreviation']].g_at_home = g_at_home
-
-        w_on_road, l_on_road, g_at_road = standings_data.get_at_road(current_standings)
-        mlb[current_standings['team']['abbreviation']].w_avg_road = w_on_road / g_at_road
-        mlb[current_standings['team']['abbreviation']].l_avg_road = l_on_road / g_at_road
-        mlb[current_standings['team']['abbreviation']].g_at_road = g_at_road
-        log.debug("{team} has {w_on_road} wins on road".format(
-            w_on_road=w_on_road,
-            team=current_standings['team']['abbreviation'])
-        )
-        log.debug("{team} has {l_on_road} losses on road".format(
-            l_on_road=l_on_road,
-            team=current_standings['team']['abbreviation'])
-        )
-        mlb[current_standings['team']['abbreviation']].run_avg = standings_data.get_run_avg(current_standings)
-
-set_league_standings_data(TEAM_STANDING_DICT)
+# Nothing is fetched until a team is first looked up. Every live fetch is
+# kept as a dated snapshot.
+mlb = League(snapshots=default_snapshot_store())
+
+
+def set_league_standings_data(current_standings_dict, league=mlb):
+    league.frame.set_standings(current_standings_dict)
+
 
 class SelfCalculated(object):
 
@@ -144,68 +29,7 @@ class SelfCalculated(object):
 
 ## Finish these just in case
 self_calc = SelfCalculated()
-innings = self_calc.get_total_innings(mlb['HOU'])
-# assert innings == 1089, 'TODO: Write test for innings %d' % innings
-
-
-class TeamStatsNoSplit(object):
-
-    def __init__(self):
-        """get necessary data from standings."""
-        pass
-
-    def get_walks_per_game(self, current_dict):
-        return int(current_dict['baseOnBalls']) / int(current_dict['gamesPlayed'])
-
-    def get_hits_per_game(self, current_dict):
-        return int(current_dict['hits']) / int(current_dict['gamesPlayed'])
-
-    def get_runs_per_game(self, current_dict):
-        return int(current_dict['runs']) / int(current_dict['gamesPlayed'])
-
-    def get_homeruns_per_game(self, current_dict):
-        return int(current_dict['homeRuns']) / int(current_dict['gamesPlayed'])
-
-    def get_strikeouts_per_game(self, current_dict):
-        return int(current_dict['strikeOuts']) / int(current_dict['gamesPlayed'])
-
-    def get_total_plate_appearance(self, current_dict):
-        return int(current_dict['plateAppearances'])
-
-    def get_plate_appearences_per_game(self, current_dict):
-        return int(current_dict['plateAppearances']) / int(current_dict['gamesPlayed'])
-
-
-team_stats = TeamStatsNoSplit()
-
-for t_stat in TEAM_STATS_DICT:
-    #TODO: Write tests for these
-    log.debug('getting team stats (no split)')
-    assert isinstance(t_stat, dict), type(t_stat)
-    
-    log.debug('REMOVE LATER - this used to just pass t_stat was there a reason why?')
-    mlb[t_stat['teamAbbrev']].walks_per_game = walks_per_game
-    walks_per_game = team_stats.get_walks_per_game(t_stat)
-
-    hits_per_game = team_stats.get_hits_per_game(t_stat)
-    mlb[t_stat['teamAbbrev']].hits_per_game = hits_per_game
-
-    runs_per_game = team_stats.get_runs_per_game(t_stat)
-    mlb[t_stat['teamAbbrev']].runs_per_game = runs_per_game
-
-    homeruns_per_game = team_stats.get_homeruns_per_game(t_stat)
-    mlb[t_stat['teamAbbrev']].homeruns_per_game = homeruns_per_game
-
-    strikeouts_per_game = team_stats.get_strikeouts_per_game(t_stat)
-    mlb[t_stat['teamAbbrev']].strikeouts_per_game = strikeouts_per_game
-
-    total_plate_appearances = team_stats.get_total_plate_appearance(t_stat)
-    mlb[t_stat['teamAbbrev']].total_plate_appearances = total_plate_appearances
-
-    plate_appearences_per_game = team_stats.get_plate_appearences_per_game(t_stat)
-    mlb[t_stat['teamAbbrev']].plate_appearences_per_game = plate_appearences_per_game
-
-# print('TODO: Write test for total_plate_appearances %f' % mlb['HOU'].total_plate_appearances)
+# assert self_calc.get_total_innings(mlb['HOU']) == 1089, 'TODO: Write test for innings'
 
 
 # TODO Random stats to get for future/ general _expected
@@ -217,33 +41,14 @@ for t_stat in TEAM_STATS_DICT:
 from calculator.expected_game.split_expected import SplitExpectedGame
 split_expected_game_calculator = SplitExpectedGame()
 
-def calculate_all_team_expections():
-    for team in mlb:
-        split_expected_game_calculator.calculate_generic_expected_game(team, mlb, 7)
-        split_expected_game_calculator.calculate_lefty_expected_game(team, mlb, 7)
-        split_expected_game_calculator.calculate_righty_expected_game(team, mlb, 7)
-        split_expected_game_calculator.calculate_home_expected_game(team, mlb, 7)
-        split_expected_game_calculator.calculate_away_expected_game(team, mlb, 7)
-        log.debug('TODO: Write test for expected game all %f' % mlb[team].expected_game_no_split)
-        log.debug('TODO: Write test for expected splits lefty. %s %f' % (
-            team,
-            mlb[team].expected_game_lefty_split
-            )
-        )
-        log.debug('TODO: Write test for expected splits righty. %s %f' % (
-            team,
-            mlb[team].expected_game_righty_split
-            )
-        )
-        log.debug('TODO: Write test for expected splits home. %s %f' % (
-            team,
-            mlb[team].expected_game_home_split
-            )
-        )
-
-        log.debug('TODO: Write test for expected splits away. %s %f' % (
-            team,
-            mlb[team].expected_game_away_split
-            )
-        )
-    return mlb
+def calculate_all_team_expections(league=mlb):
+    '''Expected games for every split, returned as the league's LeagueFrame.'''
+    frame = league.frame if isinstance(league, League) else league
+    split_expected_game_calculator.calculate_all_expected_games(frame, 7)
+    return frame
+
+
+def sweep_team_expections(league=mlb, innings=(4, 5, 6, 7, 8), scoring_profiles=None):
+    '''teams x splits x innings (x profiles) expected games in one call.'''
+    frame = league.frame if isinstance(league, League) else league
+    return split_expected_game_calculator.expected_game_tensor(frame, innings, scoring_profiles)
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from calculator.scraper.response_cache import ResponseCache
+from calculator.settings.api import RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS
+from calculator.settings.api import RESPONSE_CACHE_DEFAULT_TTL
+from calculator.settings.logger import log
+
+
+class Fetcher(object):
+    '''
+    Fetch JSON from the MLB stats APIs over one pooled keep-alive session.
+
+    Requests get a per-request timeout and are retried with exponential
+    backoff on connection errors and 5xx responses. fetch_all issues a
+    batch of requests concurrently so startup costs the slowest request
+    instead of the sum of all of them.
+
+    With a ResponseCache, get_json serves fresh entries from disk,
+    revalidates stale ones with If-None-Match/If-Modified-Since and falls
+    back to the stale copy if the API cannot be reached.
+    '''
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, timeout=10, retries=3, backoff_factor=0.5, max_workers=6, cache=None):
+        log.debug('Instantiate Fetcher')
+        self.timeout = timeout
+        self.cache = cache
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers,
+            max_retries=retry
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, headers=None):
+        log.debug('FETCHING %s' % url)
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        if headers and response.status_code == requests.codes.not_modified:
+            return response
+        # An HTTPError is a RequestException, so callers and the stale
+        # cache fallback handle a 5xx that outlasted the retries
+        response.raise_for_status()
+        return response
+
+    def get_json(self, url):
+        return self.get_json_live(url)[0]
+
+    def get_json_live(self, url):
+        '''(payload, live) for url, see get_cached.'''
+        if self.cache is None:
+            return self.get(url).json(), True
+        body, live = self.get_cached(url)
+        return json.loads(body), live
+
+    def get_cached(self, url):
+        '''
+        (body, live) for url, going to the network only when needed. live
+        is True when the API sent the body or confirmed the cached copy
+        with a 304, and False when it came from the cache alone: a fresh
+        entry or the stale fallback.
+        '''
+        entry = self.cache.load(url)
+        if entry is None:
+            response = self.get(url)
+        else:
+            meta, body = entry
+            if self.cache.is_fresh(url, meta):
+                log.debug('CACHE HIT %s' % url)
+                return body, False
+            try:
+                response = self.get(url, headers=self.cache.conditional_headers(meta))
+            except requests.exceptions.RequestException as e:
+                log.warning('Serving stale cache for %s: %s' % (url, e))
+                return body, False
+            if response.status_code == requests.codes.not_modified:
+                log.debug('CACHE REVALIDATED %s' % url)
+                self.cache.touch(url, meta)
+                return body, True
+        self.cache.store(
+            url,
+            response.content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        return response.content, True
+
+    def fetch_all(self, urls):
+        '''Fetch a dict of name -> url concurrently, returning name -> json.'''
+        return self.fetch_all_live(urls)[0]
+
+    def fetch_all_live(self, urls):
+        '''fetch_all, plus whether every payload is live from the API.'''
+        names = list(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self.get_json_live, [urls[name] for name in names]))
+        payloads = dict((name, payload) for name, (payload, live) in zip(names, results))
+        return payloads, all(live for payload, live in results)
+
+
+def default_cache():
+    if not RESPONSE_CACHE_DIR:
+        return None
+    return ResponseCache(
+        RESPONSE_CACHE_DIR,
+        ttls=RESPONSE_CACHE_TTLS,
+        default_ttl=RESPONSE_CACHE_DEFAULT_TTL
+    )
+
+
+# Shared by the scrapers so every call reuses the same connection pool
+fetcher = Fetcher(cache=default_cache())
@@ -1,10 +1,116 @@
-from calculator.settings.team_object import Team
+from collections.abc import Mapping
+import requests
+import sys
+from calculator.scraper.fetcher import fetcher as default_fetcher
+from calculator.scraper.league_frame import LeagueFrame
+from calculator.scraper.team_hitting_stats import TEAM_STATS_URL
+from calculator.scraper.team_splits_stats import SplitsScraper
+from calculator.settings.api import TEAM_AWAY_URI, TEAM_AT_HOME_URI
+from calculator.settings.api import TEAM_VS_LEFTY_URI, TEAM_VS_RIGHTY_URI
+from calculator.settings.api import TEAM_STANDING_URL, DATE_FOR_STANDINGS
+from calculator.settings.logger import log
+
 
 def get_all_team_names(d):
-    mlb = {}
-    for t in d:
-        team = Team()
-        team.abbr = t
-        team.id = d[t]
-        mlb[team.abbr] = team
-    return mlb
+    '''An empty LeagueFrame, one team view per abbreviation in d.'''
+    return LeagueFrame(tuple(d))
+
+
+def fetch_league_data(fetcher=default_fetcher):
+    '''
+    (league_data, live) for the current season. live is False when any
+    payload was served from the response cache without reaching the API.
+    '''
+    log.debug('\n\n Fetching splits, team stats and standings concurrently')
+    split_scraper = SplitsScraper(fetcher)
+    try:
+        return fetcher.fetch_all_live({
+            'team_stats': TEAM_STATS_URL,
+            'home': split_scraper.get_splits_url(TEAM_AT_HOME_URI),
+            'away': split_scraper.get_splits_url(TEAM_AWAY_URI),
+            'lefty': split_scraper.get_splits_url(TEAM_VS_LEFTY_URI),
+            'righty': split_scraper.get_splits_url(TEAM_VS_RIGHTY_URI),
+            'standings': TEAM_STANDING_URL,
+        })
+    except requests.exceptions.RequestException as e:
+        print('Error fetching league data')
+        print(e)
+        sys.exit(1)
+
+
+class League(Mapping):
+    '''
+    Lazily loaded map of team abbreviation -> team view.
+
+    Nothing is fetched until a team is first accessed, so importing the
+    calculator costs no network I/O. Pass league_data (the same name ->
+    payload dict fetch_league_data returns) to run from fixtures offline.
+    The payloads are parsed once into a LeagueFrame and every team is a
+    TeamRow view into it. With a SnapshotStore, every fetch answered by
+    the API is also recorded as the as_of partition (DATE_FOR_STANDINGS by
+    default).
+    leaderboard_index holds the LeaderboardIndex built for the current
+    frame and is dropped whenever the frame is rebuilt.
+    '''
+
+    def __init__(self, fetcher=default_fetcher, league_data=None, snapshots=None, as_of=DATE_FOR_STANDINGS):
+        self.fetcher = fetcher
+        self.league_data = league_data
+        self.snapshots = snapshots
+        self.as_of = as_of
+        self._frame = None
+        self.leaderboard_index = None
+
+    @classmethod
+    def from_fixtures(cls, league_data):
+        return cls(league_data=league_data)
+
+    @classmethod
+    def from_snapshot(cls, store, as_of):
+        '''The league as it was on as_of, read from one stored partition.'''
+        return cls(league_data=store.load(as_of), as_of=store.resolve(as_of))
+
+    @property
+    def loaded(self):
+        return self._frame is not None
+
+    @property
+    def frame(self):
+        '''The league as a columnar LeagueFrame, built on first access.'''
+        if self._frame is None:
+            self.load()
+        return self._frame
+
+    @property
+    def teams(self):
+        return self.frame
+
+    def fetch(self):
+        if self.league_data is None:
+            self.league_data, live = fetch_league_data(self.fetcher)
+            # A cached body may be from an earlier day, so only live data
+            # becomes the as_of snapshot
+            if self.snapshots is not None and live:
+                self.snapshots.write(self.league_data, self.as_of)
+            elif self.snapshots is not None:
+                log.info('League data came from the response cache, not recording a snapshot')
+        return self.league_data
+
+    def load(self):
+        self._frame = LeagueFrame.from_league_data(self.fetch())
+        self.leaderboard_index = None
+        return self._frame
+
+    def refresh(self, league_data=None):
+        '''Re-fetch (or swap in new fixture data) and rebuild the frame.'''
+        self.league_data = league_data
+        return self.load()
+
+    def __getitem__(self, abbreviation):
+        return self.frame[abbreviation]
+
+    def __iter__(self):
+        return iter(self.frame)
+
+    def __len__(self):
+        return len(self.frame)
@@ -0,0 +1,182 @@
+from collections.abc import Mapping
+import numpy as np
+from calculator.scraper.standings_data import parse_standings, STANDING_SPLITS
+from static.team_map import TEAM_MAP
+
+# Fixed team ordinal for every column, taken from TEAM_MAP
+TEAMS = tuple(TEAM_MAP)
+
+# Per game rates for the home and away splits, keyed by split payload field
+PER_GAME_FIELDS = [('r', 'runs'), ('h', 'hits'), ('hr', 'homeRuns'), ('bb', 'baseOnBalls'), ('so', 'strikeOuts')]
+# Per plate appearance rates vs lefties and righties. The rl splits have no
+# runs, so rbi stands in for them like get_pitcher_rl_splits_per_dict does.
+PER_PA_FIELDS = [('r', 'rbi'), ('h', 'hits'), ('hr', 'homeRuns'), ('bb', 'baseOnBalls'), ('so', 'strikeOuts')]
+
+EXPECTED_GAME_COLUMNS = [
+    'expected_game_no_split',
+    'expected_game_lefty_split',
+    'expected_game_righty_split',
+    'expected_game_home_split',
+    'expected_game_away_split',
+]
+
+COLUMNS = (
+    ['home_%s_pg' % name for name, field in PER_GAME_FIELDS] +
+    ['away_%s_pg' % name for name, field in PER_GAME_FIELDS] +
+    ['vs_l_%s_per_pa' % name for name, field in PER_PA_FIELDS] +
+    ['vs_r_%s_per_pa' % name for name, field in PER_PA_FIELDS] +
+    [
+        'wins', 'losses', 'games', 'win_avg', 'loss_avg', 'run_avg',
+        'wins_avg_left', 'losses_avg_left', 'g_v_left',
+        'wins_avg_right', 'loss_avg_right', 'g_v_right',
+        'w_avg_home', 'l_avg_home', 'g_at_home',
+        'w_avg_road', 'l_avg_road', 'g_at_road',
+        'walks_per_game', 'hits_per_game', 'runs_per_game',
+        'homeruns_per_game', 'strikeouts_per_game',
+        'total_plate_appearances', 'plate_appearences_per_game',
+    ] +
+    EXPECTED_GAME_COLUMNS
+)
+
+
+class TeamRow(object):
+    '''
+    One team's view into a LeagueFrame.
+
+    Reads and writes go straight to the frame's columns, so code written
+    against the old Team attribute bags (league[team].home_r_pg) still works.
+    '''
+
+    __slots__ = ('frame', 'ordinal')
+
+    def __init__(self, frame, ordinal):
+        object.__setattr__(self, 'frame', frame)
+        object.__setattr__(self, 'ordinal', ordinal)
+
+    @property
+    def abbr(self):
+        return self.frame.teams[self.ordinal]
+
+    @property
+    def id(self):
+        return TEAM_MAP[self.abbr]
+
+    def __getattr__(self, name):
+        try:
+            column = self.frame.columns[name]
+        except KeyError:
+            raise AttributeError(name)
+        return float(column[self.ordinal])
+
+    def __setattr__(self, name, value):
+        self.frame.column(name)[self.ordinal] = value
+
+    def __repr__(self):
+        return '<TeamRow %s>' % self.abbr
+
+
+class LeagueFrame(Mapping):
+    '''
+    Columnar league data: one float64 array per stat, one slot per team.
+
+    Teams are indexed by their TEAM_MAP ordinal, so every column lines up
+    and the expected game and leaderboard code can work on whole columns.
+    Missing values are NaN.
+    '''
+
+    def __init__(self, teams=TEAMS, columns=None):
+        self.teams = tuple(teams)
+        self.index = dict((abbr, i) for i, abbr in enumerate(self.teams))
+        self.columns = {}
+        for name, values in (columns or {}).items():
+            self.columns[name] = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_league_data(cls, league_data, teams=TEAMS):
+        '''Build a frame straight from the payloads fetch_league_data returns.'''
+        frame = cls(teams)
+        frame.set_split_rates('home', league_data['home']['stats'], 'gamesPlayed', PER_GAME_FIELDS, '%s_%s_pg')
+        frame.set_split_rates('away', league_data['away']['stats'], 'gamesPlayed', PER_GAME_FIELDS, '%s_%s_pg')
+        frame.set_split_rates('vs_l', league_data['lefty']['stats'], 'plateAppearances', PER_PA_FIELDS, '%s_%s_per_pa')
+        frame.set_split_rates('vs_r', league_data['righty']['stats'], 'plateAppearances', PER_PA_FIELDS, '%s_%s_per_pa')
+        frame.set_standings(parse_standings(league_data['standings']))
+        frame.set_team_stats(league_data['team_stats']['stats'])
+        return frame
+
+    def copy(self):
+        '''Independent snapshot, e.g. to keep several dates resident.'''
+        return LeagueFrame(self.teams, dict((name, values.copy()) for name, values in self.columns.items()))
+
+    def column(self, name):
+        if name not in self.columns:
+            self.columns[name] = np.full(len(self.teams), np.nan)
+        return self.columns[name]
+
+    def ordinals(self, abbreviations):
+        return np.array([self.index[abbr] for abbr in abbreviations], dtype=np.intp)
+
+    def set_split_rates(self, prefix, rows, denominator, fields, pattern):
+        ordinals = self.ordinals([row['teamAbbrev'] for row in rows])
+        totals = np.array([int(row[denominator]) for row in rows], dtype=np.float64)
+        for name, field in fields:
+            counts = np.array([int(row[field]) for row in rows], dtype=np.float64)
+            self.column(pattern % (prefix, name))[ordinals] = counts / totals
+
+    def set_standings(self, team_records):
+        ordinals = self.ordinals([record['team']['abbreviation'] for record in team_records])
+        wins = np.array([int(record['wins']) for record in team_records], dtype=np.float64)
+        losses = np.array([int(record['losses']) for record in team_records], dtype=np.float64)
+        games = np.array([record['gamesPlayed'] for record in team_records], dtype=np.float64)
+        runs = np.array([int(record['runsScored']) for record in team_records], dtype=np.float64)
+        self.column('wins')[ordinals] = wins
+        self.column('losses')[ordinals] = losses
+        self.column('games')[ordinals] = games
+        self.column('win_avg')[ordinals] = wins / games
+        self.column('loss_avg')[ordinals] = losses / games
+        self.column('run_avg')[ordinals] = runs / games
+
+        split_columns = {
+            'left': ('wins_avg_left', 'losses_avg_left', 'g_v_left'),
+            'right': ('wins_avg_right', 'loss_avg_right', 'g_v_right'),
+            'home': ('w_avg_home', 'l_avg_home', 'g_at_home'),
+            'away': ('w_avg_road', 'l_avg_road', 'g_at_road'),
+        }
+        for split_type, position in STANDING_SPLITS.items():
+            splits = [record['records']['splitRecords'][position] for record in team_records]
+            assert all(split['type'] == split_type for split in splits), split_type
+            split_wins = np.array([split['wins'] for split in splits], dtype=np.float64)
+            split_losses = np.array([split['losses'] for split in splits], dtype=np.float64)
+            split_games = split_wins + split_losses
+            win_column, loss_column, games_column = split_columns[split_type]
+            self.column(win_column)[ordinals] = split_wins / split_games
+            self.column(loss_column)[ordinals] = split_losses / split_games
+            self.column(games_column)[ordinals] = split_games
+
+    def set_team_stats(self, rows):
+        ordinals = self.ordinals([row['teamAbbrev'] for row in rows])
+        games = np.array([int(row['gamesPlayed']) for row in rows], dtype=np.float64)
+        plate_appearances = np.array([int(row['plateAppearances']) for row in rows], dtype=np.float64)
+        for name, field in [
+            ('walks_per_game', 'baseOnBalls'),
+            ('hits_per_game', 'hits'),
+            ('runs_per_game', 'runs'),
+            ('homeruns_per_game', 'homeRuns'),
+            ('strikeouts_per_game', 'strikeOuts'),
+        ]:
+            counts = np.array([int(row[field]) for row in rows], dtype=np.float64)
+            self.column(name)[ordinals] = counts / games
+        self.column('total_plate_appearances')[ordinals] = plate_appearances
+        self.column('plate_appearences_per_game')[ordinals] = plate_appearances / games
+
+    def leaderboard(self, column):
+        '''(value, team) tuples for a column, best first.'''
+        return sorted(zip(self.columns[column].tolist(), self.teams), reverse=True)
+
+    def __getitem__(self, abbreviation):
+        return TeamRow(self, self.index[abbreviation])
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __len__(self):
+        return len(self.teams)
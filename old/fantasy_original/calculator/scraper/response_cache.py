@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from calculator.settings.logger import log
+
+
+class ResponseCache(object):
+    '''
+    Gzipped on-disk cache of API responses keyed by URL.
+
+    Each URL gets a <sha256>.json.gz body and a <sha256>.meta.json file
+    holding the ETag and Last-Modified validators and when the body was
+    last confirmed. Entries younger than the URL's TTL are served without
+    a request; older ones are revalidated with a conditional GET.
+    '''
+
+    def __init__(self, directory, ttls=None, default_ttl=3600):
+        self.directory = directory
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+
+    def key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def body_path(self, url):
+        return os.path.join(self.directory, self.key(url) + '.json.gz')
+
+    def meta_path(self, url):
+        return os.path.join(self.directory, self.key(url) + '.meta.json')
+
+    def ttl_for(self, url):
+        '''TTL of the longest configured URL prefix, else the default.'''
+        prefixes = [prefix for prefix in self.ttls if url.startswith(prefix)]
+        if not prefixes:
+            return self.default_ttl
+        return self.ttls[max(prefixes, key=len)]
+
+    def load(self, url):
+        '''Return (meta, body bytes) for url, or None if it is not cached.'''
+        try:
+            with open(self.meta_path(url)) as meta_file:
+                meta = json.load(meta_file)
+            with gzip.open(self.body_path(url), 'rb') as body_file:
+                body = body_file.read()
+        except (OSError, ValueError) as e:
+            log.debug('No usable cache entry for %s: %s' % (url, e))
+            return None
+        return meta, body
+
+    def is_fresh(self, url, meta, now=None):
+        now = time.time() if now is None else now
+        return now - meta['fetched_at'] < self.ttl_for(url)
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None):
+        # Body first, so a meta file never points at a missing body
+        self._write_atomic(self.body_path(url), gzip.compress(body))
+        self._write_meta(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+        })
+
+    def touch(self, url, meta):
+        '''Mark a revalidated (304) entry as fresh again.'''
+        meta = dict(meta, fetched_at=time.time())
+        self._write_meta(url, meta)
+        return meta
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.json.gz') or name.endswith('.meta.json'):
+                os.remove(os.path.join(self.directory, name))
+
+    def _write_meta(self, url, meta):
+        self._write_atomic(self.meta_path(url), json.dumps(meta).encode('utf-8'))
+
+    def _write_atomic(self, path, data):
+        # fetch_all writes from several threads; never leave a half written file
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
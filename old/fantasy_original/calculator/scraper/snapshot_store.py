@@ -0,0 +1,125 @@
+import bisect
+import gzip
+import json
+import os
+import tempfile
+from calculator.settings.api import SNAPSHOT_DIR
+from calculator.settings.logger import log
+
+# The payloads fetch_league_data returns. standings carries the win/loss
+# splitRecords StandingsData reads.
+PAYLOADS = ('team_stats', 'home', 'away', 'lefty', 'righty', 'standings')
+
+
+def as_of_key(as_of):
+    '''YYYY-MM-DD string for a date, datetime or date string.'''
+    return str(as_of)[:10]
+
+
+class SnapshotStore(object):
+    '''
+    Append only store of league scrapes, one dated partition per day.
+
+    Each partition is <season>/<YYYY-MM-DD>/<payload>.json.gz. index.json
+    keeps the sorted partition dates, so an as_of lookup is a bisect of the
+    index and only the matching partition is read from disk. Partitions
+    are never rewritten: the first scrape of a day is the one kept.
+    '''
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._dates = None
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.json')
+
+    def dates(self):
+        '''Sorted partition dates.'''
+        if self._dates is None:
+            try:
+                with open(self.index_path) as index_file:
+                    self._dates = sorted(json.load(index_file)['dates'])
+            except (OSError, ValueError):
+                self._dates = []
+        return self._dates
+
+    def partition_path(self, as_of):
+        key = as_of_key(as_of)
+        return os.path.join(self.directory, key[:4], key)
+
+    def payload_path(self, as_of, name):
+        return os.path.join(self.partition_path(as_of), name + '.json.gz')
+
+    def resolve(self, as_of):
+        '''Latest partition date on or before as_of, or None.'''
+        dates = self.dates()
+        i = bisect.bisect_right(dates, as_of_key(as_of))
+        return dates[i - 1] if i else None
+
+    def has(self, as_of):
+        key = as_of_key(as_of)
+        dates = self.dates()
+        i = bisect.bisect_left(dates, key)
+        return i < len(dates) and dates[i] == key
+
+    def write(self, league_data, as_of):
+        '''
+        Record a scrape as the as_of partition. Returns False, writing
+        nothing, if that day already has a partition.
+        '''
+        key = as_of_key(as_of)
+        # Another process may have added partitions since the index was read
+        self._dates = None
+        if self.has(key):
+            log.debug('Snapshot for %s already exists' % key)
+            return False
+        os.makedirs(self.partition_path(key), exist_ok=True)
+        for name in PAYLOADS:
+            body = json.dumps(league_data[name]).encode('utf-8')
+            self._write_atomic(self.payload_path(key, name), gzip.compress(body))
+        # Index last, so it never lists a partition that is not complete
+        dates = self.dates() + [key]
+        self._write_atomic(self.index_path, json.dumps({'dates': sorted(dates)}).encode('utf-8'))
+        self._dates = sorted(dates)
+        log.debug('Wrote league snapshot for %s' % key)
+        return True
+
+    def load(self, as_of, names=PAYLOADS):
+        '''
+        league_data for the partition in effect on as_of, in the same
+        name -> payload shape fetch_league_data returns.
+        '''
+        key = self.resolve(as_of)
+        if key is None:
+            raise KeyError('No league snapshot on or before %s' % as_of_key(as_of))
+        league_data = {}
+        for name in names:
+            with gzip.open(self.payload_path(key, name), 'rb') as payload_file:
+                league_data[name] = json.loads(payload_file.read().decode('utf-8'))
+        return league_data
+
+    def partitions(self, start=None, end=None, names=PAYLOADS):
+        '''Yield (date, league_data) one partition at a time, oldest first.'''
+        dates = self.dates()
+        lo = bisect.bisect_left(dates, as_of_key(start)) if start else 0
+        hi = bisect.bisect_right(dates, as_of_key(end)) if end else len(dates)
+        for key in dates[lo:hi]:
+            yield key, self.load(key, names)
+
+    def _write_atomic(self, path, data):
+        directory = os.path.dirname(path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def default_snapshot_store():
+    if not SNAPSHOT_DIR:
+        return None
+    return SnapshotStore(SNAPSHOT_DIR)
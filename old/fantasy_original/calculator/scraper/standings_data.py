@@ -1,11 +1,16 @@
 import json
 import re
 import requests
+import sys
 from datetime import datetime
 from calculator.settings.api import BASE_URL, TEAM_STANDING_URL
 from calculator.settings.logger import log
+from calculator.scraper.fetcher import fetcher
 # from calculator.settings.api import STATS_API, STANDINGS_URI
 
+# splitRecords positions in the standings payload
+STANDING_SPLITS = {'home': 0, 'away': 1, 'left': 2, 'right': 7}
+
 class StandingsData():
 
     def __init__(self):
@@ -30,7 +35,7 @@ class StandingsData():
     #     return self.first_number, self.second_number, self.total
 
     def get_vs_left(self, current_dict):
-        leftysplit = current_dict['records']['splitRecords'][2]
+        leftysplit = current_dict['records']['splitRecords'][STANDING_SPLITS['left']]
         log.debug('in get_vs_left leftysplit is \n%s\n' % leftysplit)
         assert(leftysplit['type'] == 'left')
         w_v_left = leftysplit['wins']
@@ -40,7 +45,7 @@ class StandingsData():
         return w_v_left, l_v_left, g_v_left
 
     def get_vs_right(self, current_dict):
-        rightysplit = current_dict['records']['splitRecords'][7]
+        rightysplit = current_dict['records']['splitRecords'][STANDING_SPLITS['right']]
         log.debug('in get_vs_right rightysplit is \n%s\n' % rightysplit)
         assert(rightysplit['type'] == 'right')
         w_v_right = rightysplit['wins']
@@ -49,7 +54,7 @@ class StandingsData():
         return w_v_right, l_v_right, g_v_right
 
     def get_at_home(self, current_dict):
-        homesplits = current_dict['records']['splitRecords'][0]
+        homesplits = current_dict['records']['splitRecords'][STANDING_SPLITS['home']]
         log.debug('in get_at_home homesplits is \n%s\n' % homesplits)
         assert(homesplits['type'] == 'home')
         w_at_home = homesplits['wins']
@@ -58,7 +63,7 @@ class StandingsData():
         return w_at_home, l_at_home, g_at_home
 
     def get_at_road(self, current_dict):
-        roadsplits = current_dict['records']['splitRecords'][1]
+        roadsplits = current_dict['records']['splitRecords'][STANDING_SPLITS['away']]
         log.debug('in get_at_road roadsplits is \n%s\n' % roadsplits)
         assert(roadsplits['type'] == 'away')
         w_on_road = roadsplits['wins']
@@ -93,22 +98,22 @@ class StandingsData():
 
 
 
-def get_standings():
+def parse_standings(json_standings):
+    # Standings are in two blocks al and NL. This combines them.
+    log.debug('use https://jsonpathfinder.com/ if they switch this again')
+    # Copy rather than extend records[0] so the payload can be parsed again
+    tsd = []
+    for record in json_standings['records'][:6]:
+        tsd.extend(record['teamRecords'])
+    return tsd
+
+
+def get_standings(fetcher=fetcher):
     log.debug('TEAM_STANDING_URL is %s' % TEAM_STANDING_URL)
     try:
-        TEAM_STANDING_RESPONSE = requests.get(TEAM_STANDING_URL)
+        json_standings = fetcher.get_json(TEAM_STANDING_URL)
     except requests.exceptions.RequestException as e:
         print(e)
         print('Error getting Standing')
         sys.exit(1)
-    STANDING_TEXT = TEAM_STANDING_RESPONSE.text
-    JSON_STANDINGS = json.loads(STANDING_TEXT)
-    # Standings are in two blocks al and NL. This combines them.
-    log.debug('use https://jsonpathfinder.com/ if they switch this again')
-    tsd = JSON_STANDINGS['records'][0]['teamRecords']
-    tsd.extend(JSON_STANDINGS['records'][1]['teamRecords'])
-    tsd.extend(JSON_STANDINGS['records'][2]['teamRecords'])
-    tsd.extend(JSON_STANDINGS['records'][3]['teamRecords'])
-    tsd.extend(JSON_STANDINGS['records'][4]['teamRecords'])
-    tsd.extend(JSON_STANDINGS['records'][5]['teamRecords'])
-    return tsd
+    return parse_standings(json_standings)
@@ -1,20 +1,56 @@
 import json
 import requests
+import sys
 from datetime import datetime
 from calculator.settings.logger import log
 from calculator.settings.api import BASE_URL, UPDATED_BASE_URL
 from calculator.settings.api import TEAM_STATS_URI, log
+from calculator.scraper.fetcher import fetcher
 
-def get_team_stats():
+TEAM_STATS_URL = UPDATED_BASE_URL + TEAM_STATS_URI
+
+
+def parse_team_stats(response_json):
+    return response_json['stats']
+
+
+def get_team_stats(fetcher=fetcher):
     log.debug("TODO WRITE TESTS, get_team_stats")
-    current_url = UPDATED_BASE_URL + TEAM_STATS_URI
-    log.debug('DATA SOURCE: %s' % current_url)
+    log.debug('DATA SOURCE: %s' % TEAM_STATS_URL)
     try:
-        response = requests.get(current_url)
+        response_json = fetcher.get_json(TEAM_STATS_URL)
     except requests.exceptions.RequestException as e:
         print('Error in get_team_stats')
         print(e)
         sys.exit(1)
-    team_stats_dict = response.json()['stats']
+    team_stats_dict = parse_team_stats(response_json)
     # team_stats_dict = json_stats['stats']
     return team_stats_dict
+
+
+class TeamStatsNoSplit(object):
+
+    def __init__(self):
+        """get necessary data from standings."""
+        pass
+
+    def get_walks_per_game(self, current_dict):
+        return int(current_dict['baseOnBalls']) / int(current_dict['gamesPlayed'])
+
+    def get_hits_per_game(self, current_dict):
+        return int(current_dict['hits']) / int(current_dict['gamesPlayed'])
+
+    def get_runs_per_game(self, current_dict):
+        return int(current_dict['runs']) / int(current_dict['gamesPlayed'])
+
+    def get_homeruns_per_game(self, current_dict):
+        return int(current_dict['homeRuns']) / int(current_dict['gamesPlayed'])
+
+    def get_strikeouts_per_game(self, current_dict):
+        return int(current_dict['strikeOuts']) / int(current_dict['gamesPlayed'])
+
+    def get_total_plate_appearance(self, current_dict):
+        return int(current_dict['plateAppearances'])
+
+    def get_plate_appearences_per_game(self, current_dict):
+        return int(current_dict['plateAppearances']) / int(current_dict['gamesPlayed'])
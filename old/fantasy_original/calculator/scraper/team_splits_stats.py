@@ -3,34 +3,34 @@ import requests
 import sys
 from calculator.settings.logger import log
 from calculator.settings.api import UPDATED_BASE_URL, TEAM_HITTING_JSON_BLOCK
+from calculator.scraper.fetcher import fetcher
 
 class SplitsScraper(object):
 
-    def __init__(self):
+    def __init__(self, fetcher=fetcher):
         log.debug('Instantiate SplitsScraper')
+        self.fetcher = fetcher
 
     def get_avg(self, number, total):
         return float(number) / float(total)
 
+    def get_splits_url(self, uri):
+        return UPDATED_BASE_URL + uri
+
+    def parse_splits(self, response_json):
+        return response_json['stats']
+
     def get_splits_by_uri(self, uri):
         log.debug("TODO WRITE TESTS, get splits from api")
-        current_url = UPDATED_BASE_URL + uri
+        current_url = self.get_splits_url(uri)
         log.debug("GETTING SPLIT FROM \n" + current_url)
         try:
-            response = requests.get(current_url)
+            response_json = self.fetcher.get_json(current_url)
         except requests.exceptions.RequestException as e:
             print('Error getting  splits by uri')
             print(e)
             sys.exit(1)
-        log.debug('get_splits_by_uri response:\n%s\n' % response.status_code)
-        assert response.status_code == requests.codes.ok, 'Get Splits by uri ' \
-            'got code %s\nFrom url %s' % (
-                response.status_code,
-                current_url
-            )
-        response_text = response.text
-        response_json = json.loads(response_text)
-        return response_json['stats']
+        return self.parse_splits(response_json)
 
     def get_runs(self, dic):
         return int(dic['runs'])
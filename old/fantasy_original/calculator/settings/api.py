@@ -51,3 +51,24 @@ log.debug(TEAM_STANDING_URL)
 # Updated URL for Above but would need to reformat for json resplonse
 STATS_API = 'https://statsapi.mlb.com/api/v1/'
 STANDINGS_URI = 'standings?leagueId=103,104&season=' + year + '&standingsTypes=regularSeason,springTraining,firstHalf,secondHalf&hydrate=division,conference,sport,league,team(nextSchedule(team,gameType=[R,F,D,L,W,C],inclusive=false),previousSchedule(team,gameType=[R,F,D,L,W,C],inclusive=true))'
+
+# On-disk response cache. Set RESPONSE_CACHE_DIR to an empty string to disable.
+RESPONSE_CACHE_DIR = os.getenv(
+    'RESPONSE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'fantasy_baseball')
+)
+# Seconds a cached response is served without revalidating, by URL prefix.
+# Splits and team stats change at most daily, standings a bit more often.
+RESPONSE_CACHE_TTLS = {
+    UPDATED_BASE_URL: int(os.getenv('SPLITS_CACHE_TTL', 6 * 60 * 60)),
+    STATS_API: int(os.getenv('STANDINGS_CACHE_TTL', 60 * 60)),
+}
+RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv('RESPONSE_CACHE_DEFAULT_TTL', 60 * 60))
+
+# Append only store of every live league scrape, one dated partition per
+# day, for as_of lookups and backtests. Set SNAPSHOT_DIR to an empty string
+# to disable.
+SNAPSHOT_DIR = os.getenv(
+    'SNAPSHOT_DIR',
+    os.path.join(os.path.expanduser('~'), '.local', 'share', 'fantasy_baseball', 'snapshots')
+)
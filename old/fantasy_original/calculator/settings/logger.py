@@ -18,6 +18,7 @@ parser.add_argument( '-league',
                      default='phb',
                      help='Provide league name. Example --league phb, default=igtbtk' )
 
-args = parser.parse_args()
+# Ignore arguments meant for the host program (behave, gunicorn, ...)
+args, _ = parser.parse_known_args()
 logging.basicConfig( level=args.loglevel.upper() )
 log = logging.getLogger("log")
@@ -1,14 +1,16 @@
 import json
 import re
 import requests
+import sys
 from datetime import datetime
+from functools import cached_property
 from calculator.settings.team_object import Team
 from calculator.settings.team_record_map import get_record_map
 from calculator.settings.api import BASE_URL,TEAM_STATS_URI, TEAM_AT_HOME_URI
 from calculator.settings.api import TEAM_AWAY_URI, TEAM_VS_LEFTY_URI, TEAM_VS_RIGHTY_URI
 from calculator.settings.api import log
 from calculator.stat_finder.team_standing_getter import get_standings
-from calculator.mlbdotcom_teamscape import get_splits_by_uri
+from calculator.stat_finder.team_hitting_getter import get_splits_by_uri
 
 
 def get_team_stats():
@@ -38,12 +40,33 @@ def get_all_team_names(passed_json):
 
 
 class Standings(object):
+    '''Each dict is fetched on first access instead of at import.'''
 
-    TEAM_STATS_DICT = get_team_stats()
-    ALL_TEAM_SHORT_NAMES = get_all_team_names(TEAM_STATS_DICT)
-    TEAM_STANDING_DICT = get_standings()
-    TEAM_AT_HOME_DICT = get_splits_by_uri(TEAM_AT_HOME_URI)
-    TEAM_AWAY_DICT = get_splits_by_uri(TEAM_AWAY_URI)
-    TEAM_VS_LEFTY_DICT = get_splits_by_uri(TEAM_VS_LEFTY_URI)
-    TEAM_VS_RIGHTY_DICT = get_splits_by_uri(TEAM_VS_RIGHTY_URI)
+    @cached_property
+    def TEAM_STATS_DICT(self):
+        return get_team_stats()
+
+    @cached_property
+    def ALL_TEAM_SHORT_NAMES(self):
+        return get_all_team_names(self.TEAM_STATS_DICT)
+
+    @cached_property
+    def TEAM_STANDING_DICT(self):
+        return get_standings()
+
+    @cached_property
+    def TEAM_AT_HOME_DICT(self):
+        return get_splits_by_uri(TEAM_AT_HOME_URI)
+
+    @cached_property
+    def TEAM_AWAY_DICT(self):
+        return get_splits_by_uri(TEAM_AWAY_URI)
+
+    @cached_property
+    def TEAM_VS_LEFTY_DICT(self):
+        return get_splits_by_uri(TEAM_VS_LEFTY_URI)
+
+    @cached_property
+    def TEAM_VS_RIGHTY_DICT(self):
+        return get_splits_by_uri(TEAM_VS_RIGHTY_URI)
     # From settings
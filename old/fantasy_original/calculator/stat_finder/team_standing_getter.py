@@ -2,8 +2,10 @@ import os
 import re
 import json
 import requests
+import sys
 from calculator.settings.api import BASE_URL, TEAM_STANDING_URL
 from calculator.settings.api import STATS_API, STANDINGS_URI
+from calculator.settings.logger import log
 
 def get_relevant_part_of_standings_dict(feed_me_json):
     TEAM_STANDING_DICT = feed_me_json['standings_schedule_date']['standings_all_date_rptr']['standings_all_date'][0]['queryResults']['row']
@@ -72,7 +74,7 @@ def return_wins_losses(feed_me_json):
 
 
 def get_standings():
-    log.debug('in get_standings, TEAM_STANDING_URL is %s' TEAM_STANDING_URL)
+    log.debug('in get_standings, TEAM_STANDING_URL is %s' % TEAM_STANDING_URL)
     try:
         TEAM_STANDING_RESPONSE = requests.get(TEAM_STANDING_URL)
     except requests.exceptions.RequestException as e:
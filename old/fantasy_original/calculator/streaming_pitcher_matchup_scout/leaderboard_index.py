@@ -0,0 +1,71 @@
+import heapq
+from calculator.settings.logger import log
+
+SPLIT_COLUMNS = {
+    'generic': 'expected_game_no_split',
+    'lefty': 'expected_game_lefty_split',
+    'righty': 'expected_game_righty_split',
+    'home': 'expected_game_home_split',
+    'road': 'expected_game_away_split',
+}
+
+
+class LeaderboardIndex(object):
+    '''
+    Expected game leaderboards for one league refresh.
+
+    Built once from a LeagueFrame with expected games calculated. Looking
+    up a team's value is a dict lookup. top(k) pulls the k best off a heap
+    without sorting the league, and full leaderboards are sorted once per
+    split and kept, after which top(k) is a slice. A split
+    can be a single name from SPLIT_COLUMNS or a tuple of names, which
+    averages them like the 'lefty at' (lefty, home) CSV columns.
+    '''
+
+    def __init__(self, frame):
+        log.debug('Building leaderboard index')
+        self.teams = tuple(frame.teams)
+        self.values = {}
+        self.rankings = {}
+        for split, column in SPLIT_COLUMNS.items():
+            self.values[split] = dict(zip(self.teams, frame.columns[column].tolist()))
+
+    def split_values(self, split):
+        '''team -> value for a split or split combination, cached.'''
+        if isinstance(split, str):
+            return self.values[split]
+        split = tuple(split)
+        if split not in self.values:
+            columns = [self.split_values(name) for name in split]
+            self.values[split] = dict(
+                (team, sum(column[team] for column in columns) / len(columns))
+                for team in self.teams
+            )
+        return self.values[split]
+
+    def value(self, team, split):
+        return self.split_values(split)[team]
+
+    def key(self, split):
+        return split if isinstance(split, str) else tuple(split)
+
+    def ranking(self, split):
+        key = self.key(split)
+        if key not in self.rankings:
+            values = self.split_values(key)
+            self.rankings[key] = sorted(
+                ((value, team) for team, value in values.items()),
+                reverse=True
+            )
+        return self.rankings[key]
+
+    def top(self, k, split):
+        '''The k best (value, team) tuples, best first.'''
+        key = self.key(split)
+        if key in self.rankings:
+            return self.rankings[key][:k]
+        values = self.split_values(key)
+        return heapq.nlargest(k, ((value, team) for team, value in values.items()))
+
+    def leaderboard(self, split):
+        return list(self.ranking(split))
@@ -12,7 +12,6 @@ HOME_AVG_GAME = {}
 AWAY_AVG_GAME = {}
 
 Standings = Standings()
-TEAM_RECORD_MAP = get_record_map(Standings.ALL_TEAM_SHORT_NAMES, Standings.TEAM_STANDING_DICT)
 
 # for team in Standings.TEAM_STATS_DICT:
 #     team_name = team['team_full']
@@ -87,10 +86,12 @@ def get_expected_game_by_dict(SPLITS_DICT, ADD_TO_DICT, type):
 
 
 
-# get_expected_game_by_dict(Standings.TEAM_AT_HOME_DICT, HOME_AVG_GAME, 'home')
-# get_expected_game_by_dict(Standings.TEAM_AWAY_DICT, AWAY_AVG_GAME, 'away')
-# get_expected_game_by_dict(Standings.TEAM_VS_LEFTY_DICT, LEFTY_AVG_GAME, 'lefty')
-get_expected_game_by_dict(Standings.TEAM_VS_RIGHTY_DICT, RIGHTY_AVG_GAME, 'righty')
+if __name__ == '__main__':
+    TEAM_RECORD_MAP = get_record_map(Standings.ALL_TEAM_SHORT_NAMES, Standings.TEAM_STANDING_DICT)
+    # get_expected_game_by_dict(Standings.TEAM_AT_HOME_DICT, HOME_AVG_GAME, 'home')
+    # get_expected_game_by_dict(Standings.TEAM_AWAY_DICT, AWAY_AVG_GAME, 'away')
+    # get_expected_game_by_dict(Standings.TEAM_VS_LEFTY_DICT, LEFTY_AVG_GAME, 'lefty')
+    get_expected_game_by_dict(Standings.TEAM_VS_RIGHTY_DICT, RIGHTY_AVG_GAME, 'righty')
 
 
 # sorted_x = sorted(TEAM_AVG_GAME.items(), key=operator.itemgetter(1))
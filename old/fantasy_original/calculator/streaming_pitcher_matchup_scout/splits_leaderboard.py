@@ -1,67 +1,18 @@
 import csv
 import datetime
-import main
 from calculator.settings.logger import log
-from calculator.mlbdotcom_teamscraper import calculate_all_team_expections
+from calculator.mlbdotcom_teamscraper import calculate_all_team_expections, mlb
+from calculator.streaming_pitcher_matchup_scout.leaderboard_index import LeaderboardIndex
 from static.team_map import TEAM_MAP
 
 
-mlb = calculate_all_team_expections()
-
-
-def get_left_leaderboard(league):
-    list = []
-    for team in league:
-        list.append((
-            league[team].expected_game_lefty_split,
-            team
-        ))
-    list.sort(reverse=True)
-    return list
-
-
-def get_righty_leaderboard(league):
-    list = []
-    for team in league:
-        list.append((
-            league[team].expected_game_righty_split,
-            team
-        ))
-    list.sort(reverse=True)
-    return list
-
-
-def get_home_leaderboard(league):
-    list = []
-    for team in league:
-        list.append((
-            league[team].expected_game_home_split,
-            team
-        ))
-    list.sort(reverse=True)
-    return list
-
-
-def get_away_leaderboard(league):
-    list = []
-    for team in league:
-        list.append((
-            league[team].expected_game_away_split,
-            team
-        ))
-    list.sort(reverse=True)
-    return list
-
-
-def get_generic_leaderboard(league):
-    list = []
-    for team in league:
-        list.append((
-            league[team].expected_game_no_split,
-            team
-        ))
-    list.sort(reverse=True)
-    return list
+def get_leaderboard_index(league=mlb):
+    '''LeaderboardIndex kept on the league, rebuilt only after a refresh.'''
+    frame = league.frame
+    if league.leaderboard_index is None:
+        calculate_all_team_expections(league)
+        league.leaderboard_index = LeaderboardIndex(frame)
+    return league.leaderboard_index
 
 
 def print_leaderboard(leaderboard):
@@ -70,41 +21,31 @@ def print_leaderboard(leaderboard):
 
 
 def print_generic_leaderboard():
-    generic_expected_games = get_generic_leaderboard(mlb)
-    print_leaderboard(generic_expected_games)
+    print_leaderboard(get_leaderboard_index().leaderboard('generic'))
 
 
 def print_lefty_leaderboard():
-    all_lefty_expected_games = get_left_leaderboard(mlb)
-    print_leaderboard(all_lefty_expected_games)
+    print_leaderboard(get_leaderboard_index().leaderboard('lefty'))
 
 
 def print_righty_leaderboard():
-    all_righty_expected_games = get_righty_leaderboard(mlb)
-    print_leaderboard(all_righty_expected_games)
+    print_leaderboard(get_leaderboard_index().leaderboard('righty'))
 
 
 def print_home_leaderboard():
-    all_home_expected_games = get_home_leaderboard(mlb)
-    print_leaderboard(all_home_expected_games)
+    print_leaderboard(get_leaderboard_index().leaderboard('home'))
 
 
 def print_road_leaderboard():
-    all_road_expected_games = get_away_leaderboard(mlb)
-    print_leaderboard(all_road_expected_games)
+    print_leaderboard(get_leaderboard_index().leaderboard('road'))
 
 def get_where(team, tuple_list):
     for t in tuple_list:
         if team == t[1]:
             return t[0]
 
-def write_to_csv():
-    all_lefty_expected_games = get_left_leaderboard(mlb)
-    all_righty_expected_games = get_righty_leaderboard(mlb)
-    all_home_expected_games = get_home_leaderboard(mlb)
-    all_road_expected_games = get_away_leaderboard(mlb)
-
-    sheet_path = 'calculator/data/splits_leaderboard.csv'    
+def write_to_csv(league=mlb, sheet_path='calculator/data/splits_leaderboard.csv'):
+    index = get_leaderboard_index(league)
 
     column_titles = ['Team', 'righty', 'lefty', 'home', 'road', 'lefty at', 'lefty vs', 'righty at', 'righty vs']
     
@@ -113,14 +54,14 @@ def write_to_csv():
         writer = csv.DictWriter(csvFile, fieldnames=column_titles)
         writer.writeheader()
         for team in TEAM_MAP:
-            lefty = get_where(team, all_lefty_expected_games)
-            righty = get_where(team, all_righty_expected_games)
-            home = get_where(team, all_home_expected_games)
-            road = get_where(team, all_road_expected_games)
-            lefty_home = (lefty + home)/2
-            lefty_road = (lefty + road)/2
-            righty_home = (righty + home)/2
-            righty_road = (righty + road)/2
+            lefty = index.value(team, 'lefty')
+            righty = index.value(team, 'righty')
+            home = index.value(team, 'home')
+            road = index.value(team, 'road')
+            lefty_home = index.value(team, ('lefty', 'home'))
+            lefty_road = index.value(team, ('lefty', 'road'))
+            righty_home = index.value(team, ('righty', 'home'))
+            righty_road = index.value(team, ('righty', 'road'))
             writer.writerow(
                 {
                     'Team': team,
@@ -164,6 +105,8 @@ def leaderboard_controller():
     elif leaderboard_resp_1 == 'exit' or leaderboard_resp_1 == '0':
         exit()
     elif leaderboard_resp_1 == 'main' or leaderboard_resp_1 == '8':
+        # main imports the controller, which imports this module
+        import main
         main.main()
     else:
         print('Unrecognized option.\n')
@@ -3,6 +3,7 @@ from calculator.full_season_forecaster.batter_forecaster import BatterExtrapolat
 from calculator.mlbdotcom_teamscraper import calculate_all_team_expections
 from calculator.streaming_pitcher_matchup_scout.compare_week_matchup import print_expected_matchups
 from calculator.streaming_pitcher_matchup_scout.compare_week_matchup import print_expected_matchups_detailed
+from calculator.streaming_pitcher_matchup_scout.compare_week_matchup import print_ranked_matchups
 from calculator.streaming_pitcher_matchup_scout.splits_leaderboard import leaderboard_controller
 
 
@@ -14,7 +15,8 @@ def start():
         '\t3. Compare SP matchups\n' \
         '\t4. Compare SP detailed\n' \
         '\t5. Pitcher extrapolator\n' \
-        '\t6. Batter extrapolator\n'
+        '\t6. Batter extrapolator\n' \
+        '\t7. Rank SP matchups from CSV\n'
     )
     input_response_1 = str(input_response_1).lower()
     if input_response_1 == '1' or 'Leaderboard' in input_response_1:
@@ -35,6 +37,8 @@ def start():
     elif input_response_1 == '6' or 'batter extrapolator' in input_response_1:
         batter_extrapolator = BatterExtrapolator()
         batter_extrapolator.run()
+    elif input_response_1 == '7' or 'rank sp' in input_response_1:
+        print_ranked_matchups()
     elif 'exit' in input_response_1 or input_response_1 == 'e':
         exit()
     else:
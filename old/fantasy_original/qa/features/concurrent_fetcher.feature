@@ -0,0 +1,32 @@
+Feature: We can fetch MLB API data concurrently
+
+  Scenario: Fetching six endpoints takes the slowest request not the sum
+    Given a stub stats server where every endpoint takes "0.3" seconds
+      And we create a Fetcher with a "5" second timeout and "0" retries
+    When we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
+      And the fetch should take less than "1.0" seconds
+
+
+  Scenario: Failed requests are retried
+    Given a stub stats server where every endpoint takes "0" seconds
+      And the stub server fails the first "2" requests to "standings"
+      And we create a Fetcher with a "5" second timeout and "3" retries
+    When we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
+      And the stub server should have received "3" requests to "standings"
+
+
+  Scenario: Slow requests time out
+    Given a stub stats server where every endpoint takes "0.5" seconds
+      And we create a Fetcher with a "0.1" second timeout and "0" retries
+    When we fetch all six league endpoints from the stub server
+    Then the fetch should have failed with a request error
+
+
+  Scenario: Server errors that outlast the retries raise a request error
+    Given a stub stats server where every endpoint takes "0" seconds
+      And the stub server fails the first "5" requests to "standings"
+      And we create a Fetcher with a "5" second timeout and "1" retries
+    When we fetch all six league endpoints from the stub server
+    Then the fetch should have failed with a request error
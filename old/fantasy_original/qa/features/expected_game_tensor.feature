@@ -0,0 +1,17 @@
+Feature: Expected games are calculated for all teams, splits and innings at once
+
+  Scenario: The tensor matches the per team calculation for every innings count
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+      And we calculate the expected game tensor for innings "4,5,6,7,8"
+    Then the tensor should have shape "30,5,5"
+      And the tensor should match the per team calculation for every innings count
+
+
+  Scenario: Scoring profiles add a trailing axis
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+      And we calculate the expected game tensor for innings "6,7" with a default and a strikeouts only profile
+    Then the tensor should have shape "30,5,2,2"
+      And the default profile should match the tensor without profiles
+      And the strikeouts only profile should score one point per expected strikeout
@@ -0,0 +1,36 @@
+Feature: The league is loaded lazily
+
+  Scenario: Importing the calculator does not fetch anything
+    When we import the calculator modules
+    Then the shared league should not be loaded
+
+
+  Scenario: A league built from fixtures fetches nothing
+    Given a league built from stubbed league data
+    Then the league should not be loaded
+    When we look up "HOU" in the league
+    Then the league should be loaded
+      And the league should have "30" teams
+      And "HOU" should have "0.075" "vs_r_bb_per_pa" to "3" places
+      And "HOU" should have "2.04" "walks_per_game" to "2" places
+
+
+  Scenario: A lazy league fetches on first access only
+    Given a league with a counting fetcher
+    When we look up "HOU" in the league
+      And we look up "NYY" in the league
+    Then the fetcher should have been called "1" times
+
+
+  Scenario: Refreshing the league rebuilds every team
+    Given a league built from stubbed league data
+    When we look up "HOU" in the league
+      And we refresh the league with the same stubbed league data
+    Then the league should have "30" teams
+      And "HOU" should have "100" "games" to "0" places
+
+
+  Scenario: Expected games can be calculated for a fixture league
+    Given a league built from stubbed league data
+    When we calculate all team expectations for the league
+    Then every team should have an expected game for each split
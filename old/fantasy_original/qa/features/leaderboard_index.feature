@@ -0,0 +1,43 @@
+Feature: Leaderboards are served from an index built once per refresh
+
+  Scenario Outline: Top K matches the full <split> leaderboard
+    Given a leaderboard index for stubbed league data
+    Then the top "5" for "<split>" should be the first "5" of the sorted leaderboard
+      And the full "<split>" leaderboard should match sorting the LeagueFrame column
+
+   Examples: Splits
+     | split   |
+     | generic |
+     | lefty   |
+     | righty  |
+     | home    |
+     | road    |
+
+
+  Scenario: Split combinations average their splits
+    Given a leaderboard index for stubbed league data
+    Then the "lefty,home" value for "HOU" should be the average of its "lefty" and "home" values
+      And the top "3" for "lefty,home" should be the first "3" of the sorted leaderboard
+
+
+  Scenario: The CLI index is only rebuilt after a refresh
+    Given a league built from stubbed league data
+    When we get the leaderboard index for the league twice
+    Then the same leaderboard index should be returned
+    When we refresh the league with the same stubbed league data
+    Then a new leaderboard index should be built
+
+
+  Scenario: Switching between leagues keeps each league's index
+    Given a league built from stubbed league data
+      And a second league built from stubbed league data
+    When we get the leaderboard index for the league twice
+      And we get the leaderboard index for the second league
+    Then the league should still have its first leaderboard index
+
+
+  Scenario: The CSV is written from the index
+    Given a league built from stubbed league data
+    When we write the splits leaderboard CSV for the league
+    Then the CSV should have a row for every team
+      And the CSV "lefty at" for "HOU" should be the average of its "lefty" and "home"
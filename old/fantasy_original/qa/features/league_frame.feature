@@ -0,0 +1,29 @@
+Feature: League data is stored in columns
+
+  Scenario: A LeagueFrame holds the same stats as the league team views
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+    Then every LeagueFrame column should match the league team views
+
+
+  Scenario: Columns are indexed by TEAM_MAP ordinal
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+    Then the LeagueFrame teams should be in TEAM_MAP order
+      And every LeagueFrame column should have one float per team
+
+
+  Scenario: Vectorized expected games match the per team calculation
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+      And we calculate expected games for the LeagueFrame
+      And we calculate expected games team by team
+    Then the LeagueFrame expected games should match the team by team values
+
+
+  Scenario: Snapshots are independent copies
+    Given a league built from stubbed league data
+    When we build a LeagueFrame from the league data
+      And we snapshot the LeagueFrame
+      And we set "HOU" "wins" to "0" in the LeagueFrame
+    Then the snapshot should still have "55" "wins" for "HOU"
@@ -0,0 +1,53 @@
+Feature: MLB API responses are cached on disk
+
+  Scenario: Fresh cached responses are served without a request
+    Given a stub stats server where every endpoint takes "0" seconds
+      And we create a Fetcher with a response cache with a "3600" second ttl
+    When we fetch all six league endpoints from the stub server
+      And we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
+      And the payloads should be from the cache alone
+      And the stub server should have received "1" requests to "standings"
+      And the cache directory should hold a gzipped body for every league endpoint
+
+
+  Scenario: Stale cached responses are revalidated with their ETag
+    Given a stub stats server where every endpoint takes "0" seconds
+      And we create a Fetcher with a response cache with a "0" second ttl
+    When we fetch all six league endpoints from the stub server
+      And we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
+      And the payloads should be live from the API
+      And the stub server should have received "2" requests to "standings"
+      And the stub server should have received "1" conditional requests to "standings"
+
+
+  Scenario: Changed responses replace the cached copy
+    Given a stub stats server where every endpoint takes "0" seconds
+      And we create a Fetcher with a response cache with a "0" second ttl
+    When we fetch all six league endpoints from the stub server
+      And the stub server publishes a new version of "standings"
+      And we fetch all six league endpoints from the stub server
+    Then "standings" should have version "2"
+      And the payloads should be live from the API
+      And "home" should have version "1"
+      And the stub server should have received "0" conditional requests to "standings"
+
+
+  Scenario: Stale responses are served when the API is down
+    Given a stub stats server where every endpoint takes "0" seconds
+      And we create a Fetcher with a response cache with a "0" second ttl
+    When we fetch all six league endpoints from the stub server
+      And the stub server goes down
+      And we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
+      And the payloads should be from the cache alone
+
+
+  Scenario: Stale responses are served when the API returns server errors
+    Given a stub stats server where every endpoint takes "0" seconds
+      And we create a Fetcher with a response cache with a "0" second ttl
+    When we fetch all six league endpoints from the stub server
+      And the stub server fails the first "5" requests to "standings"
+      And we fetch all six league endpoints from the stub server
+    Then every league endpoint payload should be returned
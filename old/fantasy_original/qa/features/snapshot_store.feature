@@ -0,0 +1,45 @@
+Feature: League scrapes are kept as dated snapshots
+
+  Scenario: An as_of date resolves to the latest snapshot on or before it
+    Given a snapshot store with stubbed league data on "2025-06-01" and "2025-06-08"
+    Then the snapshot for "2025-06-05" should be "2025-06-01"
+      And the snapshot for "2025-06-08" should be "2025-06-08"
+      And the snapshot for "2025-07-01" should be "2025-06-08"
+      And there should be no snapshot for "2025-05-31"
+
+
+  Scenario: A league as of a date is built from that day's snapshot
+    Given a snapshot store with stubbed league data on "2025-06-01" and "2025-06-08"
+    When we load the league as of "2025-06-05"
+    Then "HOU" should have "100" "games" to "0" places
+    When we load the league as of "2025-06-09"
+    Then "HOU" should have "110" "games" to "0" places
+
+
+  Scenario: Snapshots are append only
+    Given a snapshot store with stubbed league data on "2025-06-01" and "2025-06-08"
+    When we write changed league data as of "2025-06-01"
+    Then the snapshot store should have "2" partitions
+    When we load the league as of "2025-06-01"
+    Then "HOU" should have "100" "games" to "0" places
+
+
+  Scenario: Partitions stream one day at a time
+    Given a snapshot store with stubbed league data on "2025-06-01" and "2025-06-08"
+    Then streaming snapshots from "2025-06-02" should yield "2025-06-08"
+      And streaming every snapshot should yield "2025-06-01,2025-06-08"
+
+
+  Scenario: A live fetch is recorded as a snapshot
+    Given an empty snapshot store
+      And a league with a counting fetcher recording snapshots as of "2025-06-03"
+    When we look up "HOU" in the league
+    Then the snapshot for "2025-06-04" should be "2025-06-03"
+
+
+  Scenario: A fetch served from the response cache is not recorded
+    Given an empty snapshot store
+      And a league with a cached fetcher recording snapshots as of "2025-06-03"
+    When we look up "HOU" in the league
+    Then the league should be loaded
+      And the snapshot store should have "0" partitions
@@ -0,0 +1,61 @@
+import math
+import numpy as np
+from behave import given, when, then, step
+from calculator.expected_game.split_expected import SplitExpectedGame
+from calculator.full_season_forecaster.pitcher_calculator import ssp
+
+
+@step('we calculate the expected game tensor for innings "{innings}"')
+def step_impl(context, innings):
+    context.innings = [int(i) for i in innings.split(',')]
+    context.tensor = SplitExpectedGame().expected_game_tensor(context.frame, context.innings)
+
+
+@step('we calculate the expected game tensor for innings "{innings}" with a default and a strikeouts only profile')
+def step_impl(context, innings):
+    context.innings = [int(i) for i in innings.split(',')]
+    context.tensor = SplitExpectedGame().expected_game_tensor(
+        context.frame,
+        context.innings,
+        scoring_profiles=[ssp, {'K': 1.0}]
+    )
+
+
+@step('the tensor should have shape "{shape}"')
+def step_impl(context, shape):
+    expected = tuple(int(n) for n in shape.split(','))
+    assert context.tensor.shape == expected, context.tensor.shape
+
+
+@step('the tensor should match the per team calculation for every innings count')
+def step_impl(context):
+    calculator = SplitExpectedGame()
+    for k, innings in enumerate(context.innings):
+        for team in context.league:
+            calculator.calculate_generic_expected_game(team, context.league, innings)
+            calculator.calculate_lefty_expected_game(team, context.league, innings)
+            calculator.calculate_righty_expected_game(team, context.league, innings)
+            calculator.calculate_home_expected_game(team, context.league, innings)
+            calculator.calculate_away_expected_game(team, context.league, innings)
+        for t, abbr in enumerate(context.frame.teams):
+            for s, split in enumerate(SplitExpectedGame.SPLITS):
+                expected = getattr(context.league[abbr], 'expected_game_%s_split' % split)
+                actual = context.tensor[t, s, k]
+                assert math.isclose(actual, expected, abs_tol=0.05), \
+                    '%s %s %d innings: %s != %s' % (abbr, split, innings, actual, expected)
+
+
+@step('the default profile should match the tensor without profiles')
+def step_impl(context):
+    default = SplitExpectedGame().expected_game_tensor(context.frame, context.innings)
+    assert np.array_equal(context.tensor[..., 0], default)
+
+
+@step('the strikeouts only profile should score one point per expected strikeout')
+def step_impl(context):
+    lefty = SplitExpectedGame.SPLITS.index('lefty')
+    hou = context.frame.index['HOU']
+    for k, innings in enumerate(context.innings):
+        expected_pa = innings / 9.0 * context.frame['HOU'].plate_appearences_per_game
+        expected = round(context.frame['HOU'].vs_l_so_per_pa * expected_pa, 1)
+        assert math.isclose(context.tensor[hou, lefty, k, 1], expected), context.tensor[hou, lefty, k, 1]
@@ -0,0 +1,181 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import requests
+from behave import given, when, then, step
+from calculator.scraper.fetcher import Fetcher
+from calculator.scraper.response_cache import ResponseCache
+
+LEAGUE_ENDPOINTS = ['team_stats', 'home', 'away', 'lefty', 'righty', 'standings']
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Timed out clients hang up mid-response; that is expected here
+        pass
+
+
+def make_stub_handler(delay, failures, requests_seen, versions=None, not_modified=None):
+    versions = {} if versions is None else versions
+    not_modified = {} if not_modified is None else not_modified
+
+    class StubHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            name = self.path.strip('/')
+            requests_seen[name] = requests_seen.get(name, 0) + 1
+            time.sleep(delay)
+            if failures.get(name, 0) > 0:
+                failures[name] -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+            version = versions.get(name, 1)
+            etag = '"%s-%d"' % (name, version)
+            if self.headers.get('If-None-Match') == etag:
+                not_modified[name] = not_modified.get(name, 0) + 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps({'stats': [{'endpoint': name, 'version': version}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+@step('a stub stats server where every endpoint takes "{delay:g}" seconds')
+def step_impl(context, delay):
+    context.stub_failures = {}
+    context.stub_requests = {}
+    context.stub_versions = {}
+    context.stub_not_modified = {}
+    handler = make_stub_handler(
+        delay,
+        context.stub_failures,
+        context.stub_requests,
+        context.stub_versions,
+        context.stub_not_modified
+    )
+    context.stub_server = StubServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=context.stub_server.serve_forever, daemon=True)
+    thread.start()
+    context.add_cleanup(context.stub_server.server_close)
+    context.add_cleanup(context.stub_server.shutdown)
+
+
+@step('the stub server fails the first "{count:d}" requests to "{endpoint}"')
+def step_impl(context, count, endpoint):
+    context.stub_failures[endpoint] = count
+
+
+@step('we create a Fetcher with a "{timeout:g}" second timeout and "{retries:d}" retries')
+def step_impl(context, timeout, retries):
+    context.fetcher = Fetcher(timeout=timeout, retries=retries, backoff_factor=0)
+
+
+@step('we create a Fetcher with a response cache with a "{ttl:g}" second ttl')
+def step_impl(context, ttl):
+    context.cache_dir = tempfile.mkdtemp()
+    context.add_cleanup(shutil.rmtree, context.cache_dir, True)
+    context.cache = ResponseCache(context.cache_dir, default_ttl=ttl)
+    context.fetcher = Fetcher(timeout=5, retries=0, backoff_factor=0, cache=context.cache)
+
+
+@step('the stub server publishes a new version of "{endpoint}"')
+def step_impl(context, endpoint):
+    context.stub_versions[endpoint] = context.stub_versions.get(endpoint, 1) + 1
+
+
+@step('the stub server goes down')
+def step_impl(context):
+    context.stub_server.shutdown()
+    context.stub_server.server_close()
+
+
+@step('we fetch all six league endpoints from the stub server')
+def step_impl(context):
+    host, port = context.stub_server.server_address
+    urls = {
+        name: 'http://%s:%d/%s' % (host, port, name) for name in LEAGUE_ENDPOINTS
+    }
+    context.fetch_error = None
+    start = time.monotonic()
+    try:
+        context.payloads, context.live = context.fetcher.fetch_all_live(urls)
+    except requests.exceptions.RequestException as e:
+        context.fetch_error = e
+    context.fetch_seconds = time.monotonic() - start
+
+
+@step('every league endpoint payload should be returned')
+def step_impl(context):
+    assert context.fetch_error is None, context.fetch_error
+    for name in LEAGUE_ENDPOINTS:
+        assert context.payloads[name]['stats'][0]['endpoint'] == name, \
+            'Wrong payload for %s' % name
+
+
+@step('the payloads should be live from the API')
+def step_impl(context):
+    assert context.live is True, context.live
+
+
+@step('the payloads should be from the cache alone')
+def step_impl(context):
+    assert context.live is False, context.live
+
+
+@step('the fetch should take less than "{seconds:g}" seconds')
+def step_impl(context, seconds):
+    assert context.fetch_seconds < seconds, 'Fetch took %f seconds' % \
+        context.fetch_seconds
+
+
+@step('the stub server should have received "{count:d}" requests to "{endpoint}"')
+def step_impl(context, count, endpoint):
+    assert context.stub_requests[endpoint] == count, 'Got %d requests' % \
+        context.stub_requests[endpoint]
+
+
+@step('the fetch should have failed with a request error')
+def step_impl(context):
+    assert isinstance(context.fetch_error, requests.exceptions.RequestException), \
+        'Expected a request error, got %r' % context.fetch_error
+
+
+@step('the stub server should have received "{count:d}" conditional requests to "{endpoint}"')
+def step_impl(context, count, endpoint):
+    actual = context.stub_not_modified.get(endpoint, 0)
+    assert actual == count, 'Got %d conditional requests' % actual
+
+
+@step('"{endpoint}" should have version "{version:d}"')
+def step_impl(context, endpoint, version):
+    assert context.fetch_error is None, context.fetch_error
+    actual = context.payloads[endpoint]['stats'][0]['version']
+    assert actual == version, 'Got version %d' % actual
+
+
+@step('the cache directory should hold a gzipped body for every league endpoint')
+def step_impl(context):
+    host, port = context.stub_server.server_address
+    for name in LEAGUE_ENDPOINTS:
+        url = 'http://%s:%d/%s' % (host, port, name)
+        with gzip.open(context.cache.body_path(url), 'rb') as body_file:
+            assert json.loads(body_file.read())['stats'][0]['endpoint'] == name
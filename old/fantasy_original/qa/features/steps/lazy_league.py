@@ -0,0 +1,84 @@
+import importlib
+import math
+import sys
+from behave import given, when, then, step
+from calculator.scraper.league import League
+from qa.stubbed_data.league_data import build_league_data, CountingFetcher
+
+
+@step('we import the calculator modules')
+def step_impl(context):
+    for module in [
+        'main',
+        'calculator.mlbdotcom_teamscraper',
+        'calculator.streaming_pitcher_matchup_scout.splits_leaderboard',
+        'calculator.streaming_pitcher_matchup_scout.compare_week_matchup',
+        'calculator.settings.standings',
+    ]:
+        importlib.import_module(module)
+    context.league = sys.modules['calculator.mlbdotcom_teamscraper'].mlb
+
+
+@step('the shared league should not be loaded')
+def step_impl(context):
+    assert not context.league.loaded, 'Importing fetched the league'
+
+
+@step('a league built from stubbed league data')
+def step_impl(context):
+    context.league = League.from_fixtures(build_league_data())
+
+
+@step('a league with a counting fetcher')
+def step_impl(context):
+    context.fetcher = CountingFetcher(build_league_data())
+    context.league = League(fetcher=context.fetcher)
+
+
+@step('the league should not be loaded')
+def step_impl(context):
+    assert not context.league.loaded
+
+
+@step('the league should be loaded')
+def step_impl(context):
+    assert context.league.loaded
+
+
+@step('we look up "{team_abbrev}" in the league')
+def step_impl(context, team_abbrev):
+    context.team = context.league[team_abbrev]
+
+
+@step('we refresh the league with the same stubbed league data')
+def step_impl(context):
+    context.league.refresh(context.league.league_data)
+
+
+@step('the league should have "{count}" teams')
+def step_impl(context, count):
+    assert len(context.league) == int(count), len(context.league)
+
+
+@step('"{team_abbrev}" should have "{expected}" "{attribute}" to "{places}" places')
+def step_impl(context, team_abbrev, expected, attribute, places):
+    actual = getattr(context.league[team_abbrev], attribute)
+    assert round(actual, int(places)) == float(expected), actual
+
+
+@step('the fetcher should have been called "{count}" times')
+def step_impl(context, count):
+    assert context.fetcher.calls == int(count), context.fetcher.calls
+
+
+@step('we calculate all team expectations for the league')
+def step_impl(context):
+    from calculator.mlbdotcom_teamscraper import calculate_all_team_expections
+    context.expected_league = calculate_all_team_expections(context.league)
+
+
+@step('every team should have an expected game for each split')
+def step_impl(context):
+    for team in context.expected_league.values():
+        for split in ['no_split', 'lefty_split', 'righty_split', 'home_split', 'away_split']:
+            assert not math.isnan(getattr(team, 'expected_game_%s' % split)), (team.abbr, split)
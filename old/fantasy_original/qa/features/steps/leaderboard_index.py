@@ -0,0 +1,100 @@
+import csv
+import math
+import os
+import shutil
+import tempfile
+from behave import given, when, then, step
+from calculator.mlbdotcom_teamscraper import calculate_all_team_expections
+from calculator.scraper.league import League
+from calculator.streaming_pitcher_matchup_scout.leaderboard_index import LeaderboardIndex, SPLIT_COLUMNS
+from calculator.streaming_pitcher_matchup_scout.splits_leaderboard import get_leaderboard_index, write_to_csv
+from qa.stubbed_data.league_data import build_league_data
+from static.team_map import TEAM_MAP
+
+
+def parse_split(split):
+    names = split.split(',')
+    return names[0] if len(names) == 1 else tuple(names)
+
+
+@step('a leaderboard index for stubbed league data')
+def step_impl(context):
+    context.league = League.from_fixtures(build_league_data())
+    context.frame = calculate_all_team_expections(context.league)
+    context.index = LeaderboardIndex(context.frame)
+
+
+@step('the top "{k:d}" for "{split}" should be the first "{n:d}" of the sorted leaderboard')
+def step_impl(context, k, split, n):
+    split = parse_split(split)
+    values = context.index.split_values(split)
+    expected = sorted(((value, team) for team, value in values.items()), reverse=True)[:n]
+    assert context.index.top(k, split) == expected, context.index.top(k, split)
+    context.index.leaderboard(split)
+    assert context.index.top(k, split) == expected, 'Cached ranking differs'
+
+
+@step('the full "{split}" leaderboard should match sorting the LeagueFrame column')
+def step_impl(context, split):
+    expected = context.frame.leaderboard(SPLIT_COLUMNS[split])
+    assert context.index.leaderboard(split) == expected
+
+
+@step('the "{combination}" value for "{team}" should be the average of its "{first}" and "{second}" values')
+def step_impl(context, combination, team, first, second):
+    expected = (context.index.value(team, first) + context.index.value(team, second)) / 2
+    assert math.isclose(context.index.value(team, parse_split(combination)), expected)
+
+
+@step('we get the leaderboard index for the league twice')
+def step_impl(context):
+    context.first_index = get_leaderboard_index(context.league)
+    context.second_index = get_leaderboard_index(context.league)
+
+
+@step('the same leaderboard index should be returned')
+def step_impl(context):
+    assert context.first_index is context.second_index
+
+
+@step('a new leaderboard index should be built')
+def step_impl(context):
+    assert get_leaderboard_index(context.league) is not context.first_index
+
+
+@step('a second league built from stubbed league data')
+def step_impl(context):
+    context.second_league = League.from_fixtures(build_league_data())
+
+
+@step('we get the leaderboard index for the second league')
+def step_impl(context):
+    context.second_league_index = get_leaderboard_index(context.second_league)
+
+
+@step('the league should still have its first leaderboard index')
+def step_impl(context):
+    assert context.second_league_index is not context.first_index
+    assert get_leaderboard_index(context.league) is context.first_index
+
+
+@step('we write the splits leaderboard CSV for the league')
+def step_impl(context):
+    directory = tempfile.mkdtemp()
+    context.add_cleanup(shutil.rmtree, directory, True)
+    context.csv_path = os.path.join(directory, 'splits_leaderboard.csv')
+    write_to_csv(context.league, context.csv_path)
+    with open(context.csv_path) as csv_file:
+        context.csv_rows = dict((row['Team'], row) for row in csv.DictReader(csv_file))
+
+
+@step('the CSV should have a row for every team')
+def step_impl(context):
+    assert list(context.csv_rows) == list(TEAM_MAP), list(context.csv_rows)
+
+
+@step('the CSV "{column}" for "{team}" should be the average of its "{first}" and "{second}"')
+def step_impl(context, column, team, first, second):
+    row = context.csv_rows[team]
+    expected = (float(row[first]) + float(row[second])) / 2
+    assert math.isclose(float(row[column]), expected), row
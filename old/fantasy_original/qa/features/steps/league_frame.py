@@ -0,0 +1,77 @@
+import math
+import numpy as np
+from behave import given, when, then, step
+from calculator.expected_game.split_expected import SplitExpectedGame
+from calculator.scraper.league_frame import COLUMNS, EXPECTED_GAME_COLUMNS, LeagueFrame
+from static.team_map import TEAM_MAP
+
+
+@step('we build a LeagueFrame from the league data')
+def step_impl(context):
+    context.frame = LeagueFrame.from_league_data(context.league.fetch())
+
+
+@step('every LeagueFrame column should match the league team views')
+def step_impl(context):
+    for name in COLUMNS:
+        if name in EXPECTED_GAME_COLUMNS:
+            continue
+        for abbr, team in context.league.items():
+            expected = getattr(team, name)
+            actual = getattr(context.frame[abbr], name)
+            assert math.isclose(actual, expected), '%s %s: %s != %s' % (abbr, name, actual, expected)
+
+
+@step('the LeagueFrame teams should be in TEAM_MAP order')
+def step_impl(context):
+    assert list(context.frame.teams) == list(TEAM_MAP), context.frame.teams
+    assert list(context.frame) == list(TEAM_MAP)
+
+
+@step('every LeagueFrame column should have one float per team')
+def step_impl(context):
+    for name, values in context.frame.columns.items():
+        assert values.shape == (len(TEAM_MAP),), (name, values.shape)
+        assert values.dtype == np.float64, (name, values.dtype)
+        assert not np.isnan(values).any(), name
+
+
+@step('we calculate expected games for the LeagueFrame')
+def step_impl(context):
+    SplitExpectedGame().calculate_all_expected_games(context.frame, 7)
+
+
+@step('we calculate expected games team by team')
+def step_impl(context):
+    calculator = SplitExpectedGame()
+    for team in context.league:
+        calculator.calculate_generic_expected_game(team, context.league, 7)
+        calculator.calculate_lefty_expected_game(team, context.league, 7)
+        calculator.calculate_righty_expected_game(team, context.league, 7)
+        calculator.calculate_home_expected_game(team, context.league, 7)
+        calculator.calculate_away_expected_game(team, context.league, 7)
+
+
+@step('the LeagueFrame expected games should match the team by team values')
+def step_impl(context):
+    for name in EXPECTED_GAME_COLUMNS:
+        for abbr, team in context.league.items():
+            expected = getattr(team, name)
+            actual = getattr(context.frame[abbr], name)
+            assert math.isclose(actual, expected, abs_tol=0.05), '%s %s: %s != %s' % (abbr, name, actual, expected)
+
+
+@step('we snapshot the LeagueFrame')
+def step_impl(context):
+    context.snapshot = context.frame.copy()
+
+
+@step('we set "{team_abbrev}" "{column}" to "{value:g}" in the LeagueFrame')
+def step_impl(context, team_abbrev, column, value):
+    setattr(context.frame[team_abbrev], column, value)
+    assert getattr(context.frame[team_abbrev], column) == value
+
+
+@step('the snapshot should still have "{value:g}" "{column}" for "{team_abbrev}"')
+def step_impl(context, value, column, team_abbrev):
+    assert getattr(context.snapshot[team_abbrev], column) == value
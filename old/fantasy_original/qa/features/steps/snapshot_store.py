@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+from behave import given, when, then, step
+from calculator.scraper.league import League
+from calculator.scraper.snapshot_store import SnapshotStore
+from qa.stubbed_data.league_data import build_league_data, CountingFetcher
+
+
+def later_league_data():
+    '''League data a week on: every team has played ten more games.'''
+    league_data = build_league_data()
+    for division in league_data['standings']['records']:
+        for record in division['teamRecords']:
+            record['wins'] += 6
+            record['losses'] += 4
+            record['gamesPlayed'] += 10
+    return league_data
+
+
+@step('an empty snapshot store')
+def step_impl(context):
+    directory = tempfile.mkdtemp()
+    context.add_cleanup(shutil.rmtree, directory, True)
+    context.store = SnapshotStore(directory)
+
+
+@step('a snapshot store with stubbed league data on "{first}" and "{second}"')
+def step_impl(context, first, second):
+    context.execute_steps('Given an empty snapshot store')
+    assert context.store.write(build_league_data(), first)
+    assert context.store.write(later_league_data(), second)
+
+
+@step('a league with a counting fetcher recording snapshots as of "{as_of}"')
+def step_impl(context, as_of):
+    context.fetcher = CountingFetcher(build_league_data())
+    context.league = League(fetcher=context.fetcher, snapshots=context.store, as_of=as_of)
+
+
+@step('a league with a cached fetcher recording snapshots as of "{as_of}"')
+def step_impl(context, as_of):
+    context.fetcher = CountingFetcher(build_league_data(), live=False)
+    context.league = League(fetcher=context.fetcher, snapshots=context.store, as_of=as_of)
+
+
+@step('the snapshot for "{as_of}" should be "{expected}"')
+def step_impl(context, as_of, expected):
+    # A fresh store reads the index back from disk
+    assert SnapshotStore(context.store.directory).resolve(as_of) == expected
+
+
+@step('there should be no snapshot for "{as_of}"')
+def step_impl(context, as_of):
+    assert context.store.resolve(as_of) is None
+    try:
+        context.store.load(as_of)
+    except KeyError:
+        return
+    assert False, 'Loaded a snapshot from before the first one'
+
+
+@step('we load the league as of "{as_of}"')
+def step_impl(context, as_of):
+    context.league = League.from_snapshot(context.store, as_of)
+
+
+@step('we write changed league data as of "{as_of}"')
+def step_impl(context, as_of):
+    assert not context.store.write(later_league_data(), as_of)
+
+
+@step('the snapshot store should have "{count:d}" partitions')
+def step_impl(context, count):
+    assert len(context.store.dates()) == count, context.store.dates()
+
+
+@step('streaming snapshots from "{start}" should yield "{expected}"')
+def step_impl(context, start, expected):
+    dates = [as_of for as_of, league_data in context.store.partitions(start=start)]
+    assert dates == expected.split(','), dates
+
+
+@step('streaming every snapshot should yield "{expected}"')
+def step_impl(context, expected):
+    partitions = context.store.partitions()
+    assert not isinstance(partitions, list), 'Partitions should be read lazily'
+    dates = [as_of for as_of, league_data in partitions]
+    assert dates == expected.split(','), dates
@@ -0,0 +1,115 @@
+import csv
+import math
+import os
+import shutil
+import tempfile
+from behave import given, when, then, step
+from calculator.mlbdotcom_teamscraper import split_expected_game_calculator
+from calculator.streaming_pitcher_matchup_scout.compare_week_matchup import (
+    get_expected_league,
+    get_expected_week_outcomes_generic,
+    get_expected_week_outcomes_split,
+    rank_week_matchups,
+    read_candidates_csv,
+)
+from static.team_map import TEAM_MAP
+
+
+def build_candidates(count, opponents):
+    teams = list(TEAM_MAP)
+    candidates = []
+    for i in range(count):
+        # Past the first two, vary the second start so totals differ
+        week = opponents.split(',') if i < 2 else [opponents.split(',')[0], teams[i % len(teams)]]
+        candidates.append({
+            'name': 'Pitcher %i' % i,
+            'arm_side': 'lefty' if i % 2 else 'R',
+            'opponents': week,
+        })
+    return candidates
+
+
+@step('a batch of "{count:d}" candidate pitchers facing "{opponents}"')
+def step_impl(context, count, opponents):
+    context.candidates = build_candidates(count, opponents)
+
+
+@step('a batch of "{count:d}" candidate pitchers facing "{opponents}" in a CSV')
+def step_impl(context, count, opponents):
+    directory = tempfile.mkdtemp()
+    context.add_cleanup(shutil.rmtree, directory, True)
+    path = os.path.join(directory, 'candidates.csv')
+    with open(path, 'w') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=['name', 'arm_side', 'opponents'])
+        writer.writeheader()
+        for candidate in build_candidates(count, opponents):
+            writer.writerow(dict(candidate, opponents=','.join(candidate['opponents'])))
+    context.candidates = read_candidates_csv(path)
+
+
+@step('we rank the candidates in process')
+def step_impl(context):
+    context.ranked = rank_week_matchups(context.candidates, context.league, processes=1)
+
+
+@step('we rank the candidates with a pool of "{processes:d}" processes')
+def step_impl(context, processes):
+    context.pooled = rank_week_matchups(context.candidates, context.league, processes=processes, chunksize=100)
+
+
+@step('each split total should match the two pitcher comparison')
+def step_impl(context):
+    frame = get_expected_league(context.league)
+    for row in context.ranked:
+        expected = get_expected_week_outcomes_split(row['opponents'], row['arm_side'], frame)
+        assert math.isclose(row['split_total'], expected), row
+
+
+@step('each generic total should match the two pitcher comparison')
+def step_impl(context):
+    frame = get_expected_league(context.league)
+    for row in context.ranked:
+        expected = get_expected_week_outcomes_generic(row['opponents'], frame)
+        assert math.isclose(row['generic_total'], expected), row
+
+
+@step('the candidates should be ranked by split total')
+def step_impl(context):
+    totals = [row['split_total'] for row in context.ranked]
+    assert totals == sorted(totals, reverse=True), totals
+
+
+@step('both rankings should be the same')
+def step_impl(context):
+    assert len(context.pooled) == len(context.candidates)
+    assert context.pooled == context.ranked
+
+
+@step('we rank a batch of "{count:d}" candidate pitchers twice')
+def step_impl(context, count):
+    calculate = split_expected_game_calculator.calculate_all_expected_games
+    context.calculations = 0
+
+    def counting_calculate(*args, **kwargs):
+        context.calculations += 1
+        return calculate(*args, **kwargs)
+
+    split_expected_game_calculator.calculate_all_expected_games = counting_calculate
+    context.add_cleanup(setattr, split_expected_game_calculator, 'calculate_all_expected_games', calculate)
+    for attempt in range(2):
+        rank_week_matchups(build_candidates(count, 'HOU,SEA'), context.league, processes=1)
+
+
+@step('expected games should have been calculated "{count:d}" times')
+def step_impl(context, count):
+    assert context.calculations == count, context.calculations
+
+
+@step('ranking a "{arm_side}" pitcher facing "{opponents}" should raise a ValueError')
+def step_impl(context, arm_side, opponents):
+    candidate = {'name': 'Pitcher', 'arm_side': arm_side, 'opponents': opponents}
+    try:
+        rank_week_matchups([candidate], context.league, processes=1)
+    except ValueError:
+        return
+    assert False, 'No ValueError for %s' % candidate
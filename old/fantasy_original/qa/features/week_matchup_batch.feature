@@ -0,0 +1,40 @@
+Feature: Weekly pitcher matchups are ranked in batches
+
+  Scenario: A batch matches the two pitcher comparison
+    Given a league built from stubbed league data
+      And a batch of "2" candidate pitchers facing "HOU,SEA"
+    When we rank the candidates in process
+    Then each split total should match the two pitcher comparison
+      And each generic total should match the two pitcher comparison
+      And the candidates should be ranked by split total
+
+
+  Scenario: A process pool ranks the same as scoring in process
+    Given a league built from stubbed league data
+      And a batch of "600" candidate pitchers facing "HOU,SEA"
+    When we rank the candidates in process
+      And we rank the candidates with a pool of "2" processes
+    Then both rankings should be the same
+
+
+  Scenario: Candidates can be read from a CSV
+    Given a league built from stubbed league data
+      And a batch of "2" candidate pitchers facing "HOU,SEA" in a CSV
+    When we rank the candidates in process
+    Then each split total should match the two pitcher comparison
+
+
+  Scenario: Expected games are calculated once per refresh
+    Given a league built from stubbed league data
+    When we rank a batch of "2" candidate pitchers twice
+    Then expected games should have been calculated "1" times
+
+
+  Scenario Outline: Bad candidates are rejected
+    Given a league built from stubbed league data
+    Then ranking a "<arm_side>" pitcher facing "<opponents>" should raise a ValueError
+
+   Examples: Candidates
+     | arm_side | opponents |
+     | lefty    | HOU,XXX   |
+     | sidearm  | HOU       |
@@ -0,0 +1,67 @@
+from static.team_map import TEAM_MAP
+
+SPLIT_TYPES = ['home', 'away', 'left', 'winners', 'lastTen', 'extraInning', 'oneRun', 'right']
+
+
+def split_stats(abbreviation, games=100, plate_appearances=3800, runs=450, hits=850):
+    return {
+        'teamAbbrev': abbreviation,
+        'gamesPlayed': games,
+        'runs': runs,
+        'rbi': runs - 20,
+        'hits': hits,
+        'homeRuns': 120,
+        'baseOnBalls': 330,
+        'strikeOuts': 870,
+        'plateAppearances': plate_appearances,
+    }
+
+
+def standings_record(abbreviation, wins=55, losses=45):
+    split_records = [
+        {'type': split_type, 'wins': wins // 2, 'losses': losses // 2}
+        for split_type in SPLIT_TYPES
+    ]
+    return {
+        'team': {'abbreviation': abbreviation},
+        'wins': wins,
+        'losses': losses,
+        'gamesPlayed': wins + losses,
+        'runsScored': 450,
+        'records': {'splitRecords': split_records},
+    }
+
+
+class CountingFetcher(object):
+    '''Stand in for Fetcher that serves league data and counts fetches.'''
+
+    def __init__(self, league_data, live=True):
+        self.league_data = league_data
+        self.live = live
+        self.calls = 0
+
+    def fetch_all(self, urls):
+        return self.fetch_all_live(urls)[0]
+
+    def fetch_all_live(self, urls):
+        self.calls += 1
+        return dict((name, self.league_data[name]) for name in urls), self.live
+
+
+def build_league_data(teams=TEAM_MAP):
+    '''Offline stand in for fetch_league_data, one row per team.'''
+    abbreviations = list(teams)
+    # Vary runs and hits by team so rankings are not all ties
+    offsets = dict((a, i) for i, a in enumerate(abbreviations))
+    team_records = [standings_record(abbreviation) for abbreviation in abbreviations]
+    return {
+        'team_stats': {'stats': [split_stats(a, games=162, plate_appearances=6100, runs=720 + offsets[a], hits=1400 + 3 * offsets[a]) for a in abbreviations]},
+        'home': {'stats': [split_stats(a, games=81, plate_appearances=3050, runs=370 + offsets[a], hits=700 + 2 * offsets[a]) for a in abbreviations]},
+        'away': {'stats': [split_stats(a, games=81, plate_appearances=3050, runs=350 + 2 * offsets[a], hits=700 - offsets[a]) for a in abbreviations]},
+        'lefty': {'stats': [split_stats(a, plate_appearances=1700, runs=200 + offsets[a], hits=400 + 2 * offsets[a]) for a in abbreviations]},
+        'righty': {'stats': [split_stats(a, plate_appearances=4400, runs=500 - offsets[a], hits=1000 + offsets[a]) for a in abbreviations]},
+        # Six division blocks of five teams, like the live standings
+        'standings': {'records': [
+            {'teamRecords': team_records[i * 5:(i + 1) * 5]} for i in range(6)
+        ]},
+    }